@@ -0,0 +1,429 @@
+"""Benchmarks for Chepy.
+
+Measures the time to import chepy in a new interpreter, the cost of
+creating a Chepy object, and the throughput of common operations over a
+range of input sizes. Results are written as JSON, and two result files
+can be compared to find regressions between releases.
+
+    python benchmarks/run.py -o before.json
+    python benchmarks/run.py -o after.json --compare before.json
+"""
+import argparse
+import gzip
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# plugins are set up per user and would make runs incomparable
+os.environ.setdefault("CHEPY_NO_PLUGINS", "1")
+
+from chepy import Chepy  # noqa: E402
+from chepy.__version__ import __version__  # noqa: E402
+
+#: Format of the result files
+SCHEMA = 1
+
+#: Input sizes that are run by default
+SIZES = ["16", "1K", "64K", "1M"]
+
+#: Input sizes that are run with --full
+FULL_SIZES = ["16", "1K", "64K", "1M", "16M", "64M"]
+
+#: Results that are slower than the baseline by more than this ratio are
+#: reported as regressions by --compare
+THRESHOLD = 1.1
+
+_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+_WORDS = (
+    "the quick brown fox jumps over lazy dog chepy recipe state buffer "
+    "decode encode hash cipher magic flag key value stream"
+).split()
+
+
+def parse_size(size: str) -> int:
+    """Parse a size like 16, 64K or 1M
+
+    Args:
+        size (str): The size
+
+    Returns:
+        int: Number of bytes
+    """
+    size = size.strip().upper().rstrip("B")
+    unit = size[-1:] if size[-1:] in _UNITS else ""
+    return int(size[: len(size) - len(unit)]) * _UNITS[unit]
+
+
+def corpus(size: int, seed: int = 1) -> bytes:
+    """Deterministic ascii text with a url every few lines
+
+    Args:
+        size (int): Number of bytes
+        seed (int, optional): Random seed. Defaults to 1.
+
+    Returns:
+        bytes: The text
+    """
+    rand = random.Random(seed)
+    lines = []
+    length = 0
+    # larger inputs repeat a 1M block so that making them stays cheap
+    while length < min(size, 1 << 20):
+        line = " ".join(rand.choice(_WORDS) for _ in range(rand.randint(4, 12)))
+        if rand.random() < 0.2:
+            line += " https://example.com/{}?id={}".format(
+                rand.choice(_WORDS), rand.randint(0, 9999)
+            )
+        lines.append(line)
+        length += len(line) + 1
+    block = "\n".join(lines).encode()
+    return (block * (size // len(block) + 1))[:size]
+
+
+def with_binary(data: bytes, seed: int = 1) -> bytes:
+    """Replace every 32nd to 64th byte with a random byte, so that the data
+    is strings between binary
+
+    Args:
+        data (bytes): The text
+        seed (int, optional): Random seed. Defaults to 1.
+
+    Returns:
+        bytes: The data
+    """
+    rand = random.Random(seed)
+    out = bytearray(data)
+    i = rand.randint(32, 64)
+    while i < len(out):
+        out[i] = rand.randint(0, 31)
+        i += rand.randint(32, 64)
+    return bytes(out)
+
+
+def _op(name: str, call: Callable[[Chepy], Any], prepare: Callable = None) -> dict:
+    return {"name": name, "call": call, "prepare": prepare}
+
+
+def _encoded(method: str) -> Callable[[bytes], Any]:
+    return lambda data: getattr(Chepy(data), method)().o
+
+
+#: The operations whose throughput is measured. `prepare` turns the text
+#: into the input of the operation, like hex for from_hex.
+OPERATIONS = [
+    _op("to_hex", lambda c: c.to_hex()),
+    _op("from_hex", lambda c: c.from_hex(), lambda d: d.hex().encode()),
+    _op("base64_encode", lambda c: c.base64_encode()),
+    _op("base64_decode", lambda c: c.base64_decode(), _encoded("base64_encode")),
+    _op("base32_encode", lambda c: c.base32_encode()),
+    _op("base32_decode", lambda c: c.base32_decode(), _encoded("base32_encode")),
+    _op("base85_encode", lambda c: c.base85_encode()),
+    _op("base85_decode", lambda c: c.base85_decode(), _encoded("base85_encode")),
+    _op("base91_encode", lambda c: c.base91_encode()),
+    _op("base91_decode", lambda c: c.base91_decode(), _encoded("base91_encode")),
+    _op("url_encode", lambda c: c.url_encode()),
+    _op("url_decode", lambda c: c.url_decode(), _encoded("url_encode")),
+    _op("to_binary", lambda c: c.to_binary()),
+    _op("from_binary", lambda c: c.from_binary(), _encoded("to_binary")),
+    _op("to_charcode", lambda c: c.to_charcode()),
+    _op("from_charcode", lambda c: c.from_charcode(), _encoded("to_charcode")),
+    _op("rot_13", lambda c: c.rot_13()),
+    _op("xor", lambda c: c.xor("41424344")),
+    _op("reverse", lambda c: c.reverse()),
+    _op("to_upper_case", lambda c: c.to_upper_case()),
+    _op("md5", lambda c: c.md5()),
+    _op("sha2_256", lambda c: c.sha2_256()),
+    _op("crc32_checksum", lambda c: c.crc32_checksum()),
+    _op("gzip_compress", lambda c: c.gzip_compress()),
+    _op("gzip_decompress", lambda c: c.gzip_decompress(), gzip.compress),
+    _op("zlib_compress", lambda c: c.zlib_compress()),
+    _op("zlib_decompress", lambda c: c.zlib_decompress(), zlib.compress),
+    _op("find_replace", lambda c: c.find_replace("fox", "cat")),
+    _op("extract_strings", lambda c: c.extract_strings(), with_binary),
+    _op("extract_urls", lambda c: c.extract_urls()),
+]
+
+
+def measure(
+    make: Callable[[], Any],
+    call: Callable[[Any], Any],
+    repeat: int = 5,
+    min_time: float = 0.1,
+) -> List[float]:
+    """Time `call` on objects from `make`, which are made outside of the
+    timed part. Fast calls are run in loops of growing length until a loop
+    takes `min_time`, and the time of one call is reported.
+
+    Args:
+        make (Callable[[], Any]): Makes a fresh object for each call
+        call (Callable[[Any], Any]): The code to time
+        repeat (int, optional): Number of loops to time. Defaults to 5.
+        min_time (float, optional): Min seconds per loop. Defaults to 0.1.
+
+    Returns:
+        List[float]: Seconds per call of each loop
+    """
+    number = 1
+    while True:
+        objects = [make() for _ in range(number)]
+        start = time.perf_counter()
+        for obj in objects:
+            call(obj)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= max(2, min(10, int(min_time / max(elapsed, 1e-9))))
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        objects = [make() for _ in range(number)]
+        start = time.perf_counter()
+        for obj in objects:
+            call(obj)
+        times.append((time.perf_counter() - start) / number)
+    return times
+
+
+def _result(suite: str, name: str, times: List[float], size: int = None) -> dict:
+    result = {
+        "suite": suite,
+        "name": name,
+        "size": size,
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+    }
+    if size:
+        result["mb_per_s"] = size / result["min"] / (1 << 20)
+    return result
+
+
+def bench_import(repeat: int) -> List[dict]:
+    """Time `import chepy` in a new interpreter, with and without plugins,
+    and the interpreter startup that is part of it
+
+    Args:
+        repeat (int): Number of runs
+
+    Returns:
+        List[dict]: The results
+    """
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    # installed packages import from bytecode caches, so time that case
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    with_plugins = dict(env)
+    with_plugins.pop("CHEPY_NO_PLUGINS", None)
+    cases = [
+        ("python", "pass", env),
+        ("chepy", "import chepy", with_plugins),
+        ("chepy_no_plugins", "import chepy", env),
+    ]
+    results = []
+    for name, code, case_env in cases:
+        command = [sys.executable, "-c", code]
+        # the first run writes the bytecode caches
+        subprocess.run(command, env=case_env, check=True)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(command, env=case_env, check=True)
+            times.append(time.perf_counter() - start)
+        results.append(_result("import", name, times))
+    return results
+
+
+def bench_construct(repeat: int) -> List[dict]:
+    """Time the creation of Chepy objects
+
+    Args:
+        repeat (int): Number of loops
+
+    Returns:
+        List[dict]: The results
+    """
+    data = corpus(1 << 10)
+    cases = [
+        ("one_state", lambda _: Chepy(data)),
+        ("ten_states", lambda _: Chepy(*[data] * 10)),
+        ("no_record", lambda _: Chepy(data, record=False)),
+        ("construct_and_out", lambda _: Chepy(data).o),
+    ]
+    return [
+        _result("construct", name, measure(lambda: None, call, repeat))
+        for name, call in cases
+    ]
+
+
+def bench_operations(
+    sizes: List[str], repeat: int, select: List[str] = None
+) -> List[dict]:
+    """Time each operation over each input size
+
+    Args:
+        sizes (List[str]): Input sizes like 64K
+        repeat (int): Number of loops
+        select (List[str], optional): Only run these operations. Defaults to None.
+
+    Returns:
+        List[dict]: The results
+    """
+    results = []
+    for label in sizes:
+        size = parse_size(label)
+        data = corpus(size)
+        for op in OPERATIONS:
+            if select and op["name"] not in select:
+                continue
+            prepared = op["prepare"](data) if op["prepare"] else data
+            call = op["call"]
+            # large inputs are slow enough to time one call at a time
+            times = measure(
+                lambda: Chepy(prepared),
+                call,
+                repeat=repeat if size < 1 << 24 else min(repeat, 3),
+                min_time=0.1 if size < 1 << 20 else 0,
+            )
+            results.append(_result("operations", op["name"], times, size))
+            print(
+                "{:<18} {:>6} {:>10.1f} MB/s".format(
+                    op["name"], label, results[-1]["mb_per_s"]
+                ),
+                file=sys.stderr,
+            )
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=str(ROOT),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def metadata() -> Dict[str, Any]:
+    """Where and when the benchmarks ran
+
+    Returns:
+        Dict[str, Any]: The metadata
+    """
+    return {
+        "schema": SCHEMA,
+        "chepy": __version__,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "date": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = THRESHOLD) -> List[str]:
+    """Compare two result files by the best time of each benchmark
+
+    Args:
+        baseline (dict): The older results
+        current (dict): The newer results
+        threshold (float, optional): Ratio that counts as a regression. Defaults to THRESHOLD.
+
+    Returns:
+        List[str]: Lines of the report. Regressions start with `!`.
+    """
+    key = lambda r: (r["suite"], r["name"], r["size"])
+    old = {key(r): r for r in baseline["results"]}
+    lines = []
+    for result in current["results"]:
+        before = old.get(key(result))
+        if before is None:
+            continue
+        ratio = result["min"] / before["min"]
+        lines.append(
+            "{} {:<11} {:<18} {:>10} {:>8.2f}x".format(
+                "!" if ratio > threshold else " ",
+                result["suite"],
+                result["name"],
+                "" if result["size"] is None else result["size"],
+                ratio,
+            )
+        )
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=["import", "construct", "operations"],
+        help="Suites to run. Defaults to all.",
+    )
+    parser.add_argument(
+        "--sizes",
+        help="Comma separated input sizes. Defaults to {}".format(",".join(SIZES)),
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Run input sizes up to {}".format(FULL_SIZES[-1]),
+    )
+    parser.add_argument(
+        "--op", action="append", help="Only run this operation. Can be repeated."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Loops per benchmark")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="Slowdown ratio that counts as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    suites = args.suite or ["import", "construct", "operations"]
+    sizes = args.sizes.split(",") if args.sizes else FULL_SIZES if args.full else SIZES
+    results = []
+    if "import" in suites:
+        results += bench_import(args.repeat)
+    if "construct" in suites:
+        results += bench_construct(args.repeat)
+    if "operations" in suites:
+        results += bench_operations(sizes, args.repeat, args.op)
+
+    report = {"metadata": metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            lines = compare(json.load(f), report, args.threshold)
+        print("\n".join(lines), file=sys.stderr)
+        if any(line.startswith("!") for line in lines):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,6 @@
-from docstring_parser import parse as _doc_parse
+import lazy_import
+
+_docstring_parser = lazy_import.lazy_module("docstring_parser")
 
 from .modules.aritmeticlogic import AritmeticLogic
 from .modules.codetidy import CodeTidy
@@ -17,9 +19,9 @@ from .modules.search import Search
 from .modules.utils import Utils
 from .modules.internal.colors import cyan
 
-from .config import ChepyConfig
+from .config import startup_plugins
 
-_plugins = ChepyConfig().load_plugins()
+_plugins = startup_plugins()
 
 
 class Chepy(
@@ -40,8 +42,18 @@ class Chepy(
     Utils,
     *_plugins
 ):
-    """Chepy class that exposes all functionality of Chepy and its plugins."""
-    pass
+    """Chepy class that exposes all functionality of Chepy and its plugins.
+
+    Args:
+        \*data (tuple): Each arg is considered a state.
+        record (bool, optional): Record the called methods in the stack. Set to
+            False to skip the recording overhead in batch jobs that do not need
+            `recipe` or `save_recipe`. Defaults to True.
+    """
+
+    def __init__(self, *data, record: bool = True):
+        super().__init__(*data)
+        self._record = record
 
 
 def search_chepy_methods(search: str) -> None:  # pragma: no cover
@@ -53,5 +65,5 @@ def search_chepy_methods(search: str) -> None:  # pragma: no cover
     methods = dir(Chepy)
     for method in methods:
         if search in method and not method.startswith("_"):
-            docs = _doc_parse(getattr(Chepy, method).__doc__).short_description
+            docs = _docstring_parser.parse(getattr(Chepy, method).__doc__).short_description
             print(cyan(method), docs)
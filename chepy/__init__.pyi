@@ -1,3 +1,5 @@
+from typing import Any
+
 from .modules.aritmeticlogic import AritmeticLogic
 from .modules.codetidy import CodeTidy
 from .modules.compression import Compression
@@ -15,6 +17,7 @@ from .modules.publickey import Publickey
 from .modules.search import Search
 from .modules.utils import Utils
 
-class Chepy(AritmeticLogic, CodeTidy, Compression, DataFormat, DateTime, EncryptionEncoding, Extractors, Hashing, Language, Links, Multimedia, Networking, Other, Publickey, Search, Utils): ...
+class Chepy(AritmeticLogic, CodeTidy, Compression, DataFormat, DateTime, EncryptionEncoding, Extractors, Hashing, Language, Links, Multimedia, Networking, Other, Publickey, Search, Utils):
+    def __init__(self, *data: Any, record: bool = ...) -> None: ...
 
 def search_chepy_methods(search: str) -> None: ...
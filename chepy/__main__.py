@@ -3,9 +3,10 @@ import inspect
 import fire
 import regex as re
 import argparse
+import json
 import subprocess
+import lazy_import
 from pathlib import Path
-from docstring_parser import parse as _parse_doc
 from prompt_toolkit.completion import (
     Completer,
     Completion,
@@ -21,14 +22,19 @@ from prompt_toolkit import PromptSession
 from chepy import Chepy
 from chepy.__version__ import __version__
 import chepy.modules.internal.cli as chepy_cli
+from chepy.modules.internal import batch, completion
 from chepy.modules.internal.colors import red, yellow, cyan, magenta, green
 from chepy.config import ChepyConfig
 
+server = lazy_import.lazy_module("chepy.modules.internal.server")
+
 config = ChepyConfig()
 options = []
 chepy = dir(Chepy)
 fire_obj = None
 errors = []
+#: Completion options of every method, loaded on first use
+method_options = None
 
 prompt_colors = config.prompt_colors.split()
 
@@ -56,41 +62,13 @@ def get_style():
 
 
 def get_options():
-    global errors
-    options = dict()
-    for method in chepy:
-        try:
-            attributes = getattr(Chepy, method)
-            if not method.startswith("_") and not isinstance(attributes, property):
-                args = inspect.getfullargspec(attributes).args
-                parsed_doc = _parse_doc(attributes.__doc__)
-                if len(args) == 1:
-                    options[method] = {
-                        "options": list(
-                            map(lambda d: {"flag": d, "meta": ""}, args[1:])
-                        ),
-                        "meta": parsed_doc.short_description,
-                        "returns": parsed_doc.returns.type_name,
-                    }
-                else:
-                    options[method] = {
-                        "options": list(
-                            map(
-                                lambda d: {
-                                    "flag": d[1],
-                                    "meta": parsed_doc.params[d[0]].description,
-                                },
-                                enumerate(args[1:]),
-                            )
-                        ),
-                        "meta": parsed_doc.short_description,
-                        "returns": parsed_doc.returns.type_name,
-                    }
-        except:
-            e_type, e_msg, e_traceback = sys.exc_info()
-            errors.append((e_type.__name__, "Error parsing options in:", method))
-            continue
-    return options
+    global errors, method_options
+    if method_options is None:
+        method_options, index_errors = completion.load_options(
+            Chepy, config.chepy_dir / completion.INDEX_NAME
+        )
+        errors += [tuple(e) for e in index_errors]
+    return method_options
 
 
 def prompt_message(fire_obj):
@@ -155,7 +133,7 @@ class CustomValidator(Validator):
                 if (
                     not re.search(r"\"|'", text[-1])
                     and not text[-1].startswith("--")
-                    and text[-1] not in list(get_options().keys())
+                    and text[-1] not in get_options()
                 ):
                     raise ValidationError(
                         cursor_position=1,
@@ -222,7 +200,53 @@ def get_current_type(obj):
         return None
 
 
+def rollback(snapshot, history):
+    """Go back to the fire object from before a command that failed. When
+    its checkpoint is gone, the object is kept as the command left it, and
+    the history is cleared as it can no longer be gone back through.
+    """
+    try:
+        return chepy_cli.restore_snapshot(snapshot)
+    except IndexError:
+        history.clear()
+        print(yellow("Could not go back to the state before the command"))
+        return snapshot
+
+
+def parse_serve_args(args):
+    parse = argparse.ArgumentParser(
+        prog="chepy serve",
+        description="Run recipes for other processes on a pool of warm workers",
+    )
+    parse.add_argument("--socket", required=True, help="Unix socket to listen on")
+    parse.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes. Defaults to one per cpu",
+    )
+    parse.add_argument(
+        "-r",
+        "--recipe",
+        dest="recipes",
+        action="append",
+        default=[],
+        help="Recipe file that workers compile when they start. Can be repeated",
+    )
+    parse.add_argument(
+        "--max-size",
+        type=int,
+        default=server.MAX_FRAME,
+        help="Max size of a request in bytes",
+    )
+    parse.set_defaults(command="serve")
+    return parse.parse_args(args)
+
+
 def parse_args(args):
+    if args[:1] == ["serve"]:
+        return parse_serve_args(args[1:])
     parse = argparse.ArgumentParser()
     parse.add_argument(
         "-v", "--version", action="version", version="%(prog)s " + __version__
@@ -230,21 +254,71 @@ def parse_args(args):
     parse.add_argument(
         "-r", "--recipe", dest="recipe", help="Run a Chepy recipe and exit"
     )
-    parse.add_argument("data", nargs="+")
-    return parse.parse_args(args)
+    formats = parse.add_mutually_exclusive_group()
+    formats.add_argument(
+        "--lines",
+        dest="batch",
+        action="store_const",
+        const="lines",
+        help="Run the recipe on each line of stdin",
+    )
+    formats.add_argument(
+        "--ndjson",
+        dest="batch",
+        action="store_const",
+        const="ndjson",
+        help="Run the recipe on each JSON value of stdin, one per line",
+    )
+    formats.add_argument(
+        "--null",
+        dest="batch",
+        action="store_const",
+        const="null",
+        help="Run the recipe on each null separated record of stdin",
+    )
+    parse.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for --lines, --ndjson or --null. 0 uses all cpus",
+    )
+    parse.add_argument("data", nargs="*")
+    parse.set_defaults(command=None)
+    parsed = parse.parse_args(args)
+    if parsed.batch and not parsed.recipe:
+        parse.error("--{} needs a recipe".format(parsed.batch))
+    if not parsed.batch and not parsed.data:
+        parse.error("the following arguments are required: data")
+    return parsed
 
 
 def main():
     global fire_obj
-    last_command = []
+    # (command, checkpointed fire object from before the command) of every
+    # command that ran, so that cli_go_back does not replay the session
+    history = []
 
     args = parse_args(sys.argv[1:])
-    args_data = args.data
 
-    if args.recipe:
+    if args.command == "serve":
+        chepy_server = server.Server(args.jobs, args.recipes, args.max_size)
+        message = "Serving on {} with {} workers".format(
+            args.socket, chepy_server.workers
+        )
+        print(green(message), file=sys.stderr)
+        chepy_server.serve(args.socket)
+        sys.exit()
+
+    args_data = args.data
+    if args.batch:
+        recipes = json.loads(Path(args.recipe).expanduser().read_text())
+        sys.exit(batch.run(recipes, args.batch, args.jobs))
+    elif args.recipe:
         print(Chepy(*args_data).load_recipe(args.recipe).o)
     else:
-        args_data.append("-")
+        # parse the data the way fire parses positional args
+        fire_obj = Chepy(*map(fire.parser.DefaultParseValue, args_data))
 
         history_file = config.history_path
         session = PromptSession(
@@ -253,15 +327,28 @@ def main():
             wrap_lines=True,
             auto_suggest=AutoSuggestFromHistory(),
         )
+        completer = FuzzyCompleter(
+            merge_completers([CustomCompleter(), chepy_cli.CliCompleter()])
+        )
+        validator = CustomValidator()
+        for method in chepy:
+            # classmethods like compile_recipe are bound methods,
+            # which do not take attributes
+            if not method.startswith("_") and inspect.isfunction(
+                getattr(Chepy, method)
+            ):
+                fire.decorators._SetMetadata(
+                    getattr(Chepy, method),
+                    fire.decorators.ACCEPTS_POSITIONAL_ARGS,
+                    False,
+                )
         try:
             while True:
                 prompt = session.prompt(
                     prompt_message(fire_obj=fire_obj),
                     bottom_toolbar=bottom_toolbar(fire_obj),
-                    completer=FuzzyCompleter(
-                        merge_completers([CustomCompleter(), chepy_cli.CliCompleter()])
-                    ),
-                    validator=CustomValidator(),
+                    completer=completer,
+                    validator=validator,
                     rprompt=get_current_type(fire_obj),
                 )
 
@@ -287,16 +374,25 @@ def main():
                         getattr(chepy_cli, "cli_plugin_path")(config)
                     # Edit the current state
                     elif cli_method == "cli_edit_state":
+                        snapshot = chepy_cli.take_snapshot(fire_obj)
                         try:
-                            getattr(chepy_cli, "cli_edit_state")(fire_obj, args_data)
-                            args_data = args_data[0 : args_data.index("-")] + ["-"]
+                            getattr(chepy_cli, "cli_edit_state")(fire_obj)
+                            history.append((["cli_edit_state"], snapshot))
                         except:
+                            fire_obj = rollback(snapshot, history)
                             e_type, e_msg, e_traceback = sys.exc_info()
                             print(red(e_type.__name__), yellow("Could not edit state"))
                     # Go back one step
                     elif cli_method == "cli_go_back":
-                        args_data = args_data[: -len(last_command + ["-"])]
-                        print(cyan("Go back: {}".format(last_command)))
+                        if history:
+                            last_command, snapshot = history.pop()
+                            try:
+                                fire_obj = chepy_cli.restore_snapshot(snapshot)
+                                print(cyan("Go back: {}".format(last_command)))
+                            except IndexError:
+                                # older snapshots were dropped by the memory cap
+                                history.clear()
+                                print(yellow("Can not go back any further"))
                     # Delete the cli history file
                     elif cli_method == "cli_delete_history":
                         Path(config.history_path).unlink()
@@ -308,33 +404,25 @@ def main():
                         getattr(chepy_cli, cli_method)(fire_obj)
 
                 else:
-                    for method in chepy:
-                        if not method.startswith("_") and not isinstance(
-                            getattr(Chepy, method), property
-                        ):
-                            fire.decorators._SetMetadata(
-                                getattr(Chepy, method),
-                                fire.decorators.ACCEPTS_POSITIONAL_ARGS,
-                                False,
-                            )
-                    args_data += prompt.split()
-                    if args_data[-1] != "-":
-                        args_data.append("-")
+                    # only the new command runs, on the live object
+                    last_command = prompt.split()
+                    snapshot = chepy_cli.take_snapshot(fire_obj)
                     try:
-                        last_command = prompt.split() + ["-"]
-                        fire_obj = fire.Fire(Chepy, command=args_data)
+                        fire_obj = fire.Fire(fire_obj, command=last_command + ["-"])
+                        history.append((last_command, snapshot))
                     # handle required args for methods
                     except fire.core.FireExit:
-                        args_data = args_data[: -len(last_command)]
+                        fire_obj = rollback(snapshot, history)
                     except TypeError as e:
-                        print(red(e.message))
+                        fire_obj = rollback(snapshot, history)
+                        print(red(str(e)))
                     except SystemExit:
                         sys.exit()
                     except:
-                        # go back to last working arg
+                        # go back to the state before the command
                         e_type, e_msg, e_traceback = sys.exc_info()
                         print(red(e_type.__name__), yellow(e_msg.__str__()))
-                        args_data = args_data[: -len(last_command)]
+                        fire_obj = rollback(snapshot, history)
                         continue
         except KeyboardInterrupt:
             print(green("\nOKBye"))
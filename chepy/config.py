@@ -1,3 +1,4 @@
+import os
 import sys
 import logging
 import importlib
@@ -6,16 +7,125 @@ import pkgutil
 import json
 from pathlib import Path
 from configparser import ConfigParser
+from typing import List
+
+#: Environment variable that stops plugins from being loaded when set to
+#: anything but an empty string or 0
+NO_PLUGINS_ENV = "CHEPY_NO_PLUGINS"
+
+#: File in the chepy dir that caches the names of the plugin modules
+PLUGIN_INDEX = "plugins.json"
+
+
+def _chepy_dir() -> Path:
+    return (
+        Path(".chepy").resolve()
+        if Path(".chepy").exists()
+        else Path(Path.home() / ".chepy")
+    )
+
+
+def plugins_disabled() -> bool:
+    """Check if the `CHEPY_NO_PLUGINS` environment variable turns plugins off
+
+    Returns:
+        bool: True if plugins should not be loaded
+    """
+    return os.environ.get(NO_PLUGINS_ENV, "") not in ("", "0")
+
+
+def plugin_modules(plugin_path: Path, index_path: Path) -> List[str]:
+    """Names of the plugin modules in the plugin dir. The names are kept in
+    an index file along with the mtime of the dir, so the dir is only listed
+    again once a plugin has been added, removed or renamed.
+
+    Args:
+        plugin_path (Path): The plugin dir
+        index_path (Path): The index file
+
+    Returns:
+        List[str]: Names of the plugin modules
+    """
+    try:
+        mtime = plugin_path.stat().st_mtime_ns
+    except OSError:
+        return []
+    try:
+        with open(str(index_path)) as f:
+            index = json.load(f)
+        if index["path"] == str(plugin_path) and index["mtime"] == mtime:
+            return index["modules"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    modules = [
+        name
+        for finder, name, ispkg in pkgutil.iter_modules([str(plugin_path)])
+        if (name.startswith("chepy_") and name != "chepy_plugins")
+    ]
+    try:
+        with open(str(index_path), "w") as f:
+            json.dump({"path": str(plugin_path), "mtime": mtime, "modules": modules}, f)
+    except OSError:  # pragma: no cover
+        pass
+    return modules
+
+
+def import_plugins(plugin_path: Path, index_path: Path) -> list:  # pragma: no cover
+    """Import the plugin modules in the plugin dir
+
+    Args:
+        plugin_path (Path): The plugin dir
+        index_path (Path): The plugin index file
+
+    Returns:
+        list: The plugin classes
+    """
+    plugins = []
+    if str(plugin_path) not in sys.path:
+        sys.path.append(str(plugin_path))
+
+    my_plugins = [
+        importlib.import_module(name)
+        for name in plugin_modules(plugin_path, index_path)
+    ]
+
+    for plugin in my_plugins:
+        try:
+            klass, mod = inspect.getmembers(plugin, inspect.isclass)[0]
+            loaded = getattr(plugin, klass)
+            plugins.append(loaded)
+        except:
+            logging.warning("Error loading {}".format(plugin.__name__))
+    return plugins
+
+
+def startup_plugins() -> list:
+    """The plugin classes that `import chepy` adds to Chepy. Only the Plugins
+    section of chepy.conf is read, and the conf file is not created when
+    it is missing, as plugins are off by default.
+
+    Returns:
+        list: The plugin classes
+    """
+    if plugins_disabled():
+        return []
+    chepy_dir = _chepy_dir()
+    config = ConfigParser()
+    config.read(str(chepy_dir / "chepy.conf"))
+    if not config.has_section("Plugins"):
+        return []
+    plugins = config["Plugins"]
+    plugin_path = plugins.get("PluginPath", "None")
+    if not json.loads(plugins.get("EnablePlugins", "false")) or plugin_path == "None":
+        return []
+    return import_plugins(  # pragma: no cover
+        Path(plugin_path).expanduser().resolve(), chepy_dir / PLUGIN_INDEX
+    )
 
 
 class ChepyConfig(object):
     def __init__(self):
-        home = Path.home()
-        self.chepy_dir = (
-            Path(".chepy").resolve()
-            if Path(".chepy").exists()
-            else Path(home / ".chepy")
-        )
+        self.chepy_dir = _chepy_dir()
         self.chepy_conf = Path(self.chepy_dir / "chepy.conf")
 
         if not self.chepy_conf.exists():  # pragma: no cover
@@ -119,21 +229,6 @@ class ChepyConfig(object):
             return default
 
     def load_plugins(self):  # pragma: no cover
-        plugins = []
-        if self.plugin_path.stem != "None":
-            sys.path.append(str(self.plugin_path))
-
-            my_plugins = [
-                importlib.import_module(name)
-                for finder, name, ispkg in pkgutil.iter_modules()
-                if (name.startswith("chepy_") and name != "chepy_plugins")
-            ]
-
-            for plugin in my_plugins:
-                try:
-                    klass, mod = inspect.getmembers(plugin, inspect.isclass)[0]
-                    loaded = getattr(plugin, klass)
-                    plugins.append(loaded)
-                except:
-                    logging.warning("Error loading {}".format(plugin.__name__))
-        return plugins
+        if plugins_disabled() or self.plugin_path.stem == "None":
+            return []
+        return import_plugins(self.plugin_path, self.chepy_dir / PLUGIN_INDEX)
@@ -1,4 +1,13 @@
-from typing import Any
+from pathlib import Path
+from typing import Any, List
+
+NO_PLUGINS_ENV: str
+PLUGIN_INDEX: str
+
+def plugins_disabled() -> bool: ...
+def plugin_modules(plugin_path: Path, index_path: Path) -> List[str]: ...
+def import_plugins(plugin_path: Path, index_path: Path) -> list: ...
+def startup_plugins() -> list: ...
 
 class ChepyConfig:
     chepy_dir: Any = ...
@@ -4,51 +4,244 @@ import inspect
 import io
 import itertools
 import logging
+import mmap
+import os
 from pathlib import Path
 import subprocess
 import sys
-import struct
+import weakref
 import webbrowser
 from configparser import ConfigParser
 from importlib.machinery import SourceFileLoader
 from pprint import pformat
-from typing import Any, Dict, List, Mapping, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Tuple, Union
 from urllib.parse import urljoin
 
 import lazy_import
-import pyperclip
 import json
 
 jsonpickle = lazy_import.lazy_module("jsonpickle")
+pyperclip = lazy_import.lazy_module("pyperclip")
 import regex as re
-from decorator import decorator
+from decorator import decorate
 
+from .modules.internal import convert, patterns
 from .modules.internal.colors import blue, cyan, green, magenta, red, yellow
+from .modules.internal.stream import ChepyStream
+from .modules.internal.parallel import ordered_map
+from .modules.internal.snapshots import (
+    SNAPSHOT_LIMIT,
+    SNAPSHOT_MEMORY,
+    Snapshot,
+    SnapshotStore,
+)
+
+
+class _StackSignature(object):
+    """Signature metadata of a method decorated with `call_stack`. It is
+    computed once, on the first call that records the stack, so recording
+    does not need to bind the signature on every call.
+    """
+
+    __slots__ = ("signature", "names", "defaults", "simple")
+
+    def __init__(self, func):
+        self.signature = inspect.signature(func)
+        params = list(self.signature.parameters.values())[1:]
+        self.names = tuple(p.name for p in params)
+        self.defaults = {p.name: p.default for p in params if p.default is not p.empty}
+        self.simple = all(p.kind is p.POSITIONAL_OR_KEYWORD for p in params)
+
+    def arguments(self, args: tuple, kwargs: dict) -> Dict[str, Any]:
+        """Map the call args to the argument dict recorded in the stack.
+        Falls back to binding the signature for calls that are not a
+        simple mix of positional and keyword arguments.
+        """
+        names = self.names
+        if self.simple and len(args) <= len(names) + 1:
+            values = dict(zip(names, args[1:]))
+            if not kwargs or (
+                kwargs.keys() <= set(names) and values.keys().isdisjoint(kwargs)
+            ):
+                values.update(kwargs)
+                defaults = self.defaults
+                try:
+                    return {
+                        name: values[name] if name in values else defaults[name]
+                        for name in names
+                    }
+                except KeyError:
+                    pass
+        bound_args = self.signature.bind(*args, **kwargs)
+        bound_args.apply_defaults()
+        func_arguments = dict(bound_args.arguments)
+        del func_arguments[next(iter(func_arguments))]
+        return func_arguments
+
+
+#: Cache of signature metadata. Weak keys so that the entries of plugin
+#: methods that are reloaded go away with the old functions.
+_stack_signatures = weakref.WeakKeyDictionary()
+
+
+def _stack_signature(func) -> _StackSignature:
+    stack_signature = _stack_signatures.get(func)
+    if stack_signature is None:
+        stack_signature = _stack_signatures[func] = _StackSignature(func)
+    return stack_signature
 
 
 class ChepyDecorators(object):
     """A class to house all the decorators for Chepy"""
 
     @staticmethod
-    @decorator
-    def call_stack(func, *args, **kwargs):
+    def call_stack(func):
         """This decorator is used to get the method name and
         arguments and save it to self.stack. The data from
         self.stack is predominantly used to save recepies.
         """
-        func_sig = dict()
-        func_self = args[0]
-        func_sig["function"] = func.__name__
+        # worked out on the first recorded call, as most methods are never
+        # called in a given run and importing chepy decorates all of them
+        stack_signature = None
+
+        def _call_stack(func, *args, **kwargs):
+            nonlocal stack_signature
+            func_self = args[0]
+            if func_self._record:
+                if stack_signature is None:
+                    stack_signature = _stack_signature(func)
+                func_self._stack.append(
+                    {
+                        "function": func.__name__,
+                        "args": stack_signature.arguments(args, kwargs),
+                    }
+                )
+            return func(*args, **kwargs)  # lgtm [py/call-to-non-callable]
+
+        wrapper = decorate(func, _call_stack, kwsyntax=True)
+        #: Marks the method as recorded so compiled recipes can call
+        #: the undecorated function and record the stack themselves
+        wrapper._chepy_call_stack = True
+        return wrapper
+
+
+class CompiledRecipe(object):
+    """A recipe that has been resolved against a Chepy class once, and can
+    then be run over any number of inputs. Created by `compile_recipe`.
+
+    Each step is looked up, and its arguments are bound and defaulted
+    when the recipe is compiled, so running the recipe does not need to
+    introspect the methods again. The stack recorded on the Chepy object
+    is the same as when the methods are chained by hand, so `save_recipe`
+    works as usual.
+
+    Args:
+        klass (type): The Chepy class to resolve the methods against.
+        recipes (List[Mapping[str, Union[str, Mapping[str, Any]]]]): An array of recipes.
+            Recipes are in the format {'function': 'function_name', 'args': {'arg_name': 'arg_val'}}
+
+    Raises:
+        TypeError: If the args of a step do not match the method signature
+    """
 
-        bound_args = inspect.signature(func).bind(*args, **kwargs)
+    def __init__(
+        self, klass, recipes: List[Mapping[str, Union[str, Mapping[str, Any]]]]
+    ):
+        self.klass = klass
+        #: Compiled steps as (function name, function, args, kwargs, recorded args)
+        self.steps = []
+        for recipe in recipes:
+            self.steps.append(self._compile_step(recipe["function"], recipe["args"]))
+
+    def _compile_step(self, function: str, args: Mapping[str, Any]):
+        method = getattr(self.klass, function, None)
+        if not getattr(method, "_chepy_call_stack", False):
+            # undecorated methods and instance aliases like `write` are not
+            # recorded in the stack, so they are dispatched as is.
+            return (function, None, (), dict(args), None)
+
+        func = method.__wrapped__
+        bound_args = _stack_signature(func).signature.bind(None, **args)
         bound_args.apply_defaults()
+        recorded = dict(bound_args.arguments)
+        del recorded[next(iter(recorded))]
+        return (function, func, bound_args.args[1:], bound_args.kwargs, recorded)
 
-        func_arguments = dict(bound_args.arguments)
-        del func_arguments["self"]
-        func_sig["args"] = func_arguments
-        func_self._stack.append(func_sig)
+    @property
+    def recipe(self) -> List[Dict[str, Union[str, Dict[str, Any]]]]:
+        """Returns the compiled recipe in the same format as `ChepyCore.recipe`
+
+        Returns:
+            List[Dict[str, Union[str, Dict[str, Any]]]]: The recipe.
+        """
+        return [
+            {"function": name, "args": dict(kwargs if recorded is None else recorded)}
+            for name, _, _, kwargs, recorded in self.steps
+        ]
+
+    def apply(self, chepy):
+        """Run the recipe on the current state of an existing Chepy object
+
+        Args:
+            chepy (Chepy): The Chepy object
+
+        Returns:
+            Chepy: The Chepy object.
+        """
+        stack = chepy._stack
+        record = chepy._record
+        for name, func, args, kwargs, recorded in self.steps:
+            if func is None:
+                getattr(chepy, name)(**kwargs)
+            else:
+                if record:
+                    stack.append({"function": name, "args": dict(recorded)})
+                func(chepy, *args, **kwargs)
+        return chepy
+
+    def run(self, *data):
+        """Run the recipe on a new Chepy object created from data
 
-        return func(*args, **kwargs)  # lgtm [py/call-to-non-callable]
+        Returns:
+            Chepy: The Chepy object.
+
+        Examples:
+            >>> recipe = Chepy.compile_recipe([{"function": "to_hex", "args": {}}])
+            >>> recipe.run("A").o
+            b"41"
+        """
+        return self.apply(self.klass(*data))
+
+    def __call__(self, data: Any) -> Any:
+        chepy = self.klass(data)
+        chepy._record = False
+        return self.apply(chepy).o
+
+
+#: The compiled recipe of a `map_recipe` worker process
+_worker_recipe = None
+
+
+def _init_recipe_worker(klass, recipes) -> None:
+    global _worker_recipe
+    _worker_recipe = klass.compile_recipe(recipes)
+
+
+def _run_recipe_worker(data: Any) -> Any:
+    return _worker_recipe(data)
+
+
+def _method_name(method: Union[str, object]) -> str:
+    # the methods of fork, for_each and subsection are names or bound methods
+    if inspect.ismethod(method):
+        return method.__name__
+    if isinstance(method, str):
+        return method
+    raise TypeError(
+        "Expected a method name or a bound method, got {}".format(
+            type(method).__name__
+        )
+    )
 
 
 class ChepyCore(object):
@@ -66,6 +259,9 @@ class ChepyCore(object):
         buffers (dict): Contains all the current buffers if a buffer is saved.
         state (Any): The data in the current state. The state changes each time a
             Chepy method is called.
+        snapshot_limit (int): Max number of snapshots kept by `checkpoint`.
+        snapshot_memory (int): Max bytes held by the snapshots of `checkpoint`.
+            The oldest snapshots are dropped first.
 
     Returns:
         Chepy: The Chepy object.
@@ -88,6 +284,16 @@ class ChepyCore(object):
         self.read_file = self.load_file
         #: Holds all the methods that are called/chanined and their args
         self._stack = list()
+        #: Record the called methods in the stack
+        self._record = True
+        #: Cached conversions of the current state
+        self._conversions = dict()
+        #: Snapshots for `undo` and `redo`, made on the first checkpoint
+        self._snapshots = None
+        #: Max number of snapshots
+        self.snapshot_limit = SNAPSHOT_LIMIT
+        #: Max bytes held by the snapshots
+        self.snapshot_memory = SNAPSHOT_MEMORY
 
         #: Log level
         self.log_level = logging.INFO
@@ -113,11 +319,12 @@ class ChepyCore(object):
     @state.setter
     def state(self, val):
         self.states[self._current_index] = val
+        self._conversions.clear()
 
     def __str__(self):
         try:
-            if isinstance(self.state, bytearray):
-                return re.sub(rb"[^\x00-\x7f]", b".", self.state).decode()
+            if isinstance(self.state, (bytearray, mmap.mmap, memoryview)):
+                return patterns.get("non_ascii").sub(b".", self.state).decode()
             else:
                 return self._convert_to_str()
         except UnicodeDecodeError:  # pragma: no cover
@@ -229,10 +436,7 @@ class ChepyCore(object):
             self.state = matched.group(group)
             new_state += old_state[start:end]
             for method in methods:
-                if type(method[0]).__name__ == "method":
-                    method_name = method[0].__name__  # type: ignore
-                elif isinstance(method[0], str):
-                    method_name = method[0]
+                method_name = _method_name(method[0])
                 if len(method) > 1:
                     getattr(self, method_name)(**method[1]).o
                 else:
@@ -245,7 +449,12 @@ class ChepyCore(object):
         self.state = new_state
         return self
 
-    def fork(self, methods: List[Tuple[Union[str, object], dict]]):
+    def fork(
+        self,
+        methods: List[Tuple[Union[str, object], dict]],
+        parallel: bool = False,
+        workers: int = None,
+    ):
         """Run multiple methods on all available states
 
         Method names in a list of tuples. If using in the cli,
@@ -253,6 +462,11 @@ class ChepyCore(object):
 
         Args:
             methods (List[Tuple[Union[str, object], dict]]): Required. List of tuples
+            parallel (bool, optional): Run the states in a pool of worker processes. Defaults to False.
+            workers (int, optional): Number of workers if parallel. Defaults to the cpu count.
+
+        Raises:
+            TypeError: If a method is neither a name nor a bound method
 
         Returns:
             Chepy: The Chepy object.
@@ -273,13 +487,25 @@ class ChepyCore(object):
             >>> print(c.states)
             {0: 'e46dfcf050c0a0d135b73856ab8e3298f9cc4105', 1: '1863d1542629590e3838543cbe3bf6a4f7c706ff'}
         """
+        if parallel:
+            recipes = []
+            for method in methods:
+                method_name = _method_name(method[0])
+                recipes.append(
+                    {"function": method_name, "args": method[1] if len(method) > 1 else {}}
+                )
+            indexes = list(self.states)
+            outputs = self.map_recipe(
+                [self.states[i] for i in indexes], recipes, workers=workers
+            )
+            for i, output in zip(indexes, outputs):
+                self.states[i] = output
+            return self
+
         for i in self.states:
             self.change_state(i)
             for method in methods:
-                if type(method[0]).__name__ == "method":
-                    method_name = method[0].__name__  # type: ignore
-                elif isinstance(method[0], str):
-                    method_name = method[0]
+                method_name = _method_name(method[0])
                 if len(method) > 1:
                     self.states[i] = getattr(self, method_name)(**method[1]).o
                 else:
@@ -296,6 +522,9 @@ class ChepyCore(object):
             methods (List[Tuple[Union[str, object], dict]]): Required.
                 List of tuples
 
+        Raises:
+            TypeError: If a method is neither a name nor a bound method
+
         Returns:
             Chepy: The Chepy object.
 
@@ -320,10 +549,7 @@ class ChepyCore(object):
         for i, val in enumerate(hold):
             self.state = val
             for method in methods:
-                if type(method[0]).__name__ == "method":
-                    method_name = method[0].__name__  # pragma: no cover
-                elif isinstance(method[0], str):
-                    method_name = method[0]
+                method_name = _method_name(method[0])
                 if len(method) > 1:
                     hold[i] = getattr(self, method_name)(
                         **method[1]
@@ -533,6 +759,27 @@ class ChepyCore(object):
         self.state = re.search(pattern, self._convert_to_str()).group(group)
         return self
 
+    def _convert(self, converter: Callable[[Any], Any]) -> Any:
+        """Convert the state with one of the converters in
+        `chepy.modules.internal.convert`. The result is cached until the
+        state is replaced, so converting the same state again is free.
+        Only states that cannot change in place are cached.
+
+        Args:
+            converter (Callable[[Any], Any]): The converter
+
+        Returns:
+            Any: The converted state
+        """
+        state = self.state
+        cached = self._conversions.get(converter)
+        if cached is not None and cached[0] is state:
+            return cached[1]
+        value = converter(state)
+        if isinstance(state, convert.CACHEABLE):
+            self._conversions[converter] = (state, value)
+        return value
+
     def _convert_to_bytes(self) -> bytes:
         """This method is used to coerce the curret object in
         the state variable into a string. The method should be
@@ -542,26 +789,24 @@ class ChepyCore(object):
         Raises:
             NotImplementedError: If type coercian isnt available
                 for the current state type.
+            StateIsStream: If the state is a streamed file.
+        """
+        return self._convert(convert.to_bytes)
+
+    def _convert_to_buffer(self) -> Union[bytes, bytearray, mmap.mmap, memoryview]:
+        """Returns the state as a bytes like object without copying it
+        when it already is one. Use this instead of `_convert_to_bytes` in
+        methods that only read the state, so that a memory mapped file is
+        never copied into memory.
+
+        Raises:
+            NotImplementedError: If type coercian isnt available
+                for the current state type.
+            StateIsStream: If the state is a streamed file.
         """
-        if isinstance(self.state, bytes):
+        if isinstance(self.state, (bytes, bytearray, mmap.mmap, memoryview)):
             return self.state
-        elif isinstance(self.state, str):
-            return self.state.encode()
-        elif isinstance(self.state, int):
-            return str(self.state).encode()
-        elif isinstance(self.state, dict):
-            return str(self.state).encode()
-        elif isinstance(self.state, list):
-            return str(self.state).encode()
-        elif isinstance(self.state, bool):  # pragma: no cover
-            return str(self.state).encode()
-        elif isinstance(self.state, bytearray):
-            return bytes(self.state)
-        elif isinstance(self.state, float):
-            return bytearray(struct.pack("f", self.state))
-        else:  # pragma: no cover
-            # todo check more types here
-            raise NotImplementedError
+        return self._convert_to_bytes()
 
     def _convert_to_bytearray(self) -> bytearray:
         """Attempts to coerce the current state into a
@@ -578,26 +823,9 @@ class ChepyCore(object):
         Raises:
             NotImplementedError: If type coercian isnt available
                 for the current state type.
+            StateIsStream: If the state is a streamed file.
         """
-        if isinstance(self.state, bytes):
-            return self.state.decode()
-        elif isinstance(self.state, str):
-            return self.state
-        elif isinstance(self.state, int):
-            return str(self.state)
-        elif isinstance(self.state, dict):
-            return str(self.state)
-        elif isinstance(self.state, list):
-            return str(self.state)
-        elif isinstance(self.state, bool):  # pragma: no cover
-            return str(self.state)
-        elif isinstance(self.state, bytearray):
-            return bytearray(self.state).decode()
-        elif isinstance(self.state, float):  # pragma: no cover
-            return format(self.state, "f")
-        else:  # pragma: no cover
-            # todo check more types here
-            raise NotImplementedError
+        return self._convert(convert.to_str)
 
     def _convert_to_int(self) -> int:
         """This method is used to coerce the curret object in
@@ -609,12 +837,7 @@ class ChepyCore(object):
             NotImplementedError: If type coercian isnt available
                 for the current state type.
         """
-        if isinstance(self.state, int):
-            return self.state
-        elif isinstance(self.state, str) or isinstance(self.state, bytes):
-            return int(self.state)
-        else:  # pragma: no cover
-            raise NotImplementedError
+        return self._convert(convert.to_int)
 
     @property
     def o(self):
@@ -657,7 +880,7 @@ class ChepyCore(object):
         Returns:
             Chepy: The Chepy object.
         """
-        if isinstance(self.state, dict):
+        if isinstance(self.state, Mapping):
             self.state = self.state.get(key)
             return self
         else:  # pragma: no cover
@@ -880,11 +1103,18 @@ class ChepyCore(object):
         return self
 
     @ChepyDecorators.call_stack
-    def load_file(self, binary_mode: bool = False):
+    def load_file(self, binary_mode: bool = False, memory_map: bool = False):
         """If a path is provided, load the file
 
+        With `memory_map`, the file is not read into memory. The state is a
+        read only memory map of the file instead, and methods that only read
+        the state work on it directly. `select` and `slice` return a
+        memoryview of the mapped file. Methods that change the state work on
+        a copy as usual.
+
         Args:
             binary_mode (bool, optional): Force load in binary mode.
+            memory_map (bool, optional): Memory map the file. Implies binary mode. Defaults to False.
 
         Returns:
             Chepy: The Chepy object.
@@ -893,9 +1123,19 @@ class ChepyCore(object):
             >>> c = Chepy("/path/to/file")
             >>> # at the moment, the state only contains the string "/path/to/file"
             >>> c.load_file() # this will load the file content into the state
+            >>> Chepy("/path/to/disk.img").load_file(memory_map=True).extract_strings()
         """
         path = Path(str(self.state)).expanduser().absolute()
-        if binary_mode:
+        if memory_map:
+            with open(path, "rb") as f:
+                try:
+                    # the map stays valid after the file is closed
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # empty files cannot be mapped
+                    data = bytearray()
+            self.states[self._current_index] = data
+        elif binary_mode:
             with open(path, "rb") as f:
                 self.states[self._current_index] = bytearray(f.read())
         else:
@@ -907,6 +1147,33 @@ class ChepyCore(object):
                     self.states[self._current_index] = bytearray(f.read())
         return self
 
+    @ChepyDecorators.call_stack
+    def stream_file(self, chunk_size: int = 1048576):
+        """Stream the file at the path in the state instead of loading it
+
+        The state becomes a stream that is read `chunk_size` bytes at a time,
+        so memory use does not grow with the size of the file. Only chunk
+        safe methods can be used on a stream; they are `xor`, `to_hex`,
+        `from_hex`, `base91_encode`, `base91_decode`, `rotate`,
+        `remove_nullbytes`, `extract_strings`, `extract_strings_with_offsets`,
+        `gzip_compress`, `gzip_decompress`, `zlib_compress`, `zlib_decompress`
+        and the hash methods. Any other
+        method raises `StateIsStream`. Use `write_binary` to write the stream
+        out, or a hash method to hash it.
+
+        Args:
+            chunk_size (int, optional): Bytes to read at a time. Defaults to 1MB.
+
+        Returns:
+            Chepy: The Chepy object.
+
+        Examples:
+            >>> c = Chepy("/path/to/memory.dmp").stream_file()
+            >>> c.xor("41").zlib_compress().write_binary("/path/to/out")
+        """
+        self.state = ChepyStream(self._abs_path(str(self.state)), int(chunk_size))
+        return self
+
     def write_to_file(self, path: str) -> None:
         """Save the state to disk. Return None.
 
@@ -941,10 +1208,87 @@ class ChepyCore(object):
         if isinstance(path, bytes):  # pragma: no cover
             path = path.decode()
         with open(str(self._abs_path(path)), "wb+") as f:
-            f.write(self.state)
+            if isinstance(self.state, ChepyStream):
+                for chunk in self.state:
+                    f.write(chunk)
+            else:
+                f.write(self.state)
         self._info_logger("File written to {}".format(self._abs_path(path)))
         return None
 
+    @classmethod
+    def compile_recipe(
+        cls, recipes: Union[str, List[Mapping[str, Union[str, Mapping[str, Any]]]]]
+    ) -> CompiledRecipe:
+        """Compile a recipe once so that it can be run over many inputs.
+        The methods in the recipe are resolved, and their arguments are bound
+        only once, instead of for every input.
+
+        Args:
+            recipes (Union[str, List[Mapping[str, Union[str, Mapping[str, Any]]]]]): An array
+                of recipes, or the path to a saved recipe file.
+
+        Returns:
+            CompiledRecipe: The compiled recipe.
+
+        Examples:
+            >>> recipe = Chepy.compile_recipe([{"function": "base64_decode", "args": {}}])
+            >>> recipe.run("bG9s").o
+            b"lol"
+            >>> [recipe(x) for x in ["bG9s", "aGk="]]
+            [b"lol", b"hi"]
+        """
+        if isinstance(recipes, str):
+            recipes = json.loads(Path(recipes).expanduser().absolute().read_text())
+        return CompiledRecipe(cls, recipes)
+
+    @classmethod
+    def map_recipe(
+        cls,
+        inputs: Iterable[Any],
+        recipes: Union[str, List[Mapping[str, Union[str, Mapping[str, Any]]]]],
+        workers: int = None,
+        chunksize: int = 1,
+    ) -> Iterator[Any]:
+        """Run one recipe over many inputs with a pool of worker processes.
+
+        The recipe is sent to each worker once and compiled there. Inputs are
+        sent to the workers in batches of `chunksize`, and the outputs are
+        returned in input order as they complete. For many small inputs, a
+        larger `chunksize` cuts down the cost of talking to the workers.
+
+        Args:
+            inputs (Iterable[Any]): The data to run the recipe on. Each input is a new state.
+            recipes (Union[str, List[Mapping[str, Union[str, Mapping[str, Any]]]]]): An array
+                of recipes, or the path to a saved recipe file.
+            workers (int, optional): Number of worker processes. Defaults to the cpu count.
+            chunksize (int, optional): Number of inputs sent to a worker at a time. Defaults to 1.
+
+        Returns:
+            Iterator[Any]: A generator of the outputs, in input order.
+
+        Examples:
+            >>> recipe = [{"function": "from_hex", "args": {}}]
+            >>> list(Chepy.map_recipe(["41", "42"], recipe, workers=2))
+            [b"A", b"B"]
+        """
+        if isinstance(recipes, str):
+            recipes = json.loads(Path(recipes).expanduser().absolute().read_text())
+        elif isinstance(recipes, CompiledRecipe):
+            recipes = recipes.recipe
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            return map(cls.compile_recipe(recipes), inputs)
+        return ordered_map(
+            _run_recipe_worker,
+            inputs,
+            workers=workers,
+            chunksize=chunksize,
+            initializer=_init_recipe_worker,
+            initargs=(cls, recipes),
+        )
+
     def run_recipe(self, recipes: List[Mapping[str, Union[str, Mapping[str, Any]]]]):
         """Run a recipe on the state. All arguments including optional needs to
         be specified for a recipe.
@@ -961,14 +1305,7 @@ class ChepyCore(object):
             >>> lol
             In this example, we are calling the base64 decode method on the state.
         """
-        for recipe in recipes:
-            function = recipe["function"]
-            args = recipe["args"]
-            if len(args) > 0:
-                getattr(self, function)(**args)
-            else:
-                getattr(self, function)()
-        return self
+        return self.compile_recipe(recipes).apply(self)
 
     def save_recipe(self, path: str):
         """Save the current recipe
@@ -1006,16 +1343,7 @@ class ChepyCore(object):
             >>> c = Chepy("some data").load_recipe("/path/to/recipe").out
             NzM2ZjZkNjUyMDY0NjE3NDYx
         """
-        with self._abs_path(path) as f:
-            recipes = json.loads(f.read_text())
-            for recipe in recipes:
-                function = recipe["function"]
-                args = recipe["args"]
-                if len(args) > 0:
-                    getattr(self, function)(**args)
-                else:
-                    getattr(self, function)()
-        return self
+        return self.compile_recipe(str(self._abs_path(path))).apply(self)
 
     # @ChepyDecorators.call_stack
     def run_script(self, path: str, save_state: bool = False):
@@ -1069,13 +1397,15 @@ class ChepyCore(object):
             itertools.dropwhile(
                 lambda x: self._stack[x]["function"] != "loop",
                 reversed(range(len(self._stack))),
-            )
+            ),
+            None,
         )
 
         for _ in range(int(iterations)):
             getattr(self, callback)(**args)
 
-        self._stack = self._stack[: stack_loop_index + 1]
+        if stack_loop_index is not None:
+            self._stack = self._stack[: stack_loop_index + 1]
         return self
 
     @ChepyDecorators.call_stack
@@ -1106,7 +1436,8 @@ class ChepyCore(object):
             itertools.dropwhile(
                 lambda x: self._stack[x]["function"] != "loop_list",
                 reversed(range(len(self._stack))),
-            )
+            ),
+            None,
         )
         if isinstance(args, str):  # pragma: no cover
             args = json.loads(args)
@@ -1117,7 +1448,8 @@ class ChepyCore(object):
                     hold.append(getattr(self, callback)(**args).o)
                 else:
                     hold.append(getattr(self, callback)().o)
-            self._stack = self._stack[: stack_loop_index + 1]
+            if stack_loop_index is not None:
+                self._stack = self._stack[: stack_loop_index + 1]
             self.state = hold
             return self
         except:  # pragma: no cover
@@ -1162,7 +1494,8 @@ class ChepyCore(object):
             itertools.dropwhile(
                 lambda x: self._stack[x]["function"] != "loop_dict",
                 reversed(range(len(self._stack))),
-            )
+            ),
+            None,
         )
 
         if isinstance(keys, str):  # pragma: no cover
@@ -1181,7 +1514,8 @@ class ChepyCore(object):
                         hold[key] = getattr(self, callback)().o
             for unmatched_key in list(set(dict_keys) - set(keys)):
                 hold[unmatched_key] = current_state[unmatched_key]
-            self._stack = self._stack[: stack_loop_index + 1]
+            if stack_loop_index is not None:
+                self._stack = self._stack[: stack_loop_index + 1]
             self.state = hold
             return self
         except:  # pragma: no cover
@@ -1216,6 +1550,92 @@ class ChepyCore(object):
             print(magenta("Buffers:"), self.buffers)
         return self
 
+    def checkpoint(self):
+        """Save the states and buffers so that `undo` can go back to them.
+
+        Values that cannot change, like bytes and str, are shared with the
+        snapshot instead of copied. Lists and dicts are copied shallowly.
+        At most `snapshot_limit` snapshots holding `snapshot_memory` bytes
+        are kept, and the oldest are dropped first.
+
+        Returns:
+            Chepy: The Chepy object.
+
+        Examples:
+            >>> c = Chepy("A").checkpoint().to_hex()
+            >>> c.undo().o
+            b"A"
+        """
+        if self._snapshots is None:
+            self._snapshots = SnapshotStore(self.snapshot_limit, self.snapshot_memory)
+        self._snapshots.limit = self.snapshot_limit
+        self._snapshots.max_bytes = self.snapshot_memory
+        self._snapshots.push(
+            Snapshot(self.states, self.buffers, self._current_index, len(self._stack))
+        )
+        return self
+
+    def undo(self, n: int = 1):
+        """Go back to the state of the `n` th last checkpoint. The recipe
+        steps after that checkpoint are undone too.
+
+        Args:
+            n (int, optional): Number of checkpoints to go back. Defaults to 1.
+
+        Raises:
+            IndexError: If there are fewer than `n` checkpoints to go back to
+
+        Returns:
+            Chepy: The Chepy object.
+
+        Examples:
+            >>> c = Chepy("A").checkpoint().to_hex().checkpoint().to_hex()
+            >>> c.undo(2).o
+            b"A"
+        """
+        store = self._snapshots
+        if store is None or not 0 < n <= len(store.undo_stack):
+            raise IndexError("Nothing to undo")
+        for _ in range(n):
+            # the memory cap can drop old snapshots while undoing
+            if not store.undo_stack:  # pragma: no cover
+                break
+            base = store.undo_stack[-1].stack_len
+            current = Snapshot(
+                self.states,
+                self.buffers,
+                self._current_index,
+                len(self._stack),
+                tuple(self._stack[base:]),
+                copy=False,
+            )
+            store.undo(current).restore(self)
+        return self
+
+    def redo(self):
+        """Go forward again after an `undo`. A new checkpoint forgets what
+        could be redone.
+
+        Raises:
+            IndexError: If there is nothing to redo
+
+        Returns:
+            Chepy: The Chepy object.
+
+        Examples:
+            >>> c = Chepy("A").checkpoint().to_hex().undo()
+            >>> c.redo().o
+            b"41"
+        """
+        store = self._snapshots
+        if store is None or not store.redo_stack:
+            raise IndexError("Nothing to redo")
+        current = Snapshot(
+            self.states, self.buffers, self._current_index, len(self._stack), copy=False
+        )
+        store.redo(current).restore(self)
+        return self
+
     @ChepyDecorators.call_stack
     def reset(self):
         """Reset states back to their initial values
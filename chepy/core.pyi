@@ -1,12 +1,30 @@
-from typing import Any, List, Mapping, Tuple, Union, TypeVar, Literal
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple, Union, TypeVar, Literal
 
 jsonpickle: Any
 
 ChepyCoreT = TypeVar('ChepyCoreT', bound='ChepyCore')
 
+class _StackSignature:
+    signature: Any = ...
+    names: Tuple[str, ...] = ...
+    defaults: Dict[str, Any] = ...
+    simple: bool = ...
+    def __init__(self, func: Any) -> None: ...
+    def arguments(self, args: tuple, kwargs: dict) -> Dict[str, Any]: ...
+
 class ChepyDecorators:
     @staticmethod
-    def call_stack(func: Any, *args: Any, **kwargs: Any): ...
+    def call_stack(func: Any) -> Any: ...
+
+class CompiledRecipe:
+    klass: Any = ...
+    steps: List[Tuple[str, Any, tuple, Dict[str, Any], Union[Dict[str, Any], None]]] = ...
+    def __init__(self, klass: Any, recipes: List[Mapping[str, Union[str, Mapping[str, Any]]]]) -> None: ...
+    @property
+    def recipe(self) -> List[Dict[str, Union[str, Dict[str, Any]]]]: ...
+    def apply(self, chepy: ChepyCoreT) -> ChepyCoreT: ...
+    def run(self, *data: Any) -> Any: ...
+    def __call__(self, data: Any) -> Any: ...
 
 class ChepyCore:
     states: Any = ...
@@ -15,6 +33,8 @@ class ChepyCore:
     bake: Any = ...
     cyberchef: Any = ...
     read_file: Any = ...
+    snapshot_limit: int = ...
+    snapshot_memory: int = ...
     log_level: Any = ...
     log_format: str = ...
     def __init__(self, *data: Any) -> None: ...
@@ -22,7 +42,7 @@ class ChepyCore:
     def state(self): ...
     @state.setter
     def state(self: ChepyCoreT, val: Any) -> None: ...
-    def fork(self: ChepyCoreT, methods: List[Tuple[Union[str, object], dict]]) -> ChepyCoreT: ...
+    def fork(self: ChepyCoreT, methods: List[Tuple[Union[str, object], dict]], parallel: bool=..., workers: int=...) -> ChepyCoreT: ...
     def for_each(self: ChepyCoreT, methods: List[Tuple[Union[str, object], dict]]) -> ChepyCoreT: ...
     def set_state(self: ChepyCoreT, data: Any) -> ChepyCoreT: ...
     def create_state(self: ChepyCoreT): ...
@@ -49,9 +69,14 @@ class ChepyCore:
     def http_request(self: ChepyCoreT, method: str=..., params: dict=..., json: dict=..., headers: dict=..., cookies: dict=...) -> ChepyCoreT: ...
     def load_from_url(self: ChepyCoreT, method: str=..., params: dict=..., json: dict=..., headers: dict=..., cookies: dict=...) -> ChepyCoreT: ...
     def load_dir(self: ChepyCoreT, pattern: str=...) -> ChepyCoreT: ...
-    def load_file(self: ChepyCoreT, binary_mode: bool=...) -> ChepyCoreT: ...
+    def load_file(self: ChepyCoreT, binary_mode: bool=..., memory_map: bool=...) -> ChepyCoreT: ...
+    def stream_file(self: ChepyCoreT, chunk_size: int=...) -> ChepyCoreT: ...
     def write_to_file(self: ChepyCoreT, path: str) -> None: ...
     def write_binary(self: ChepyCoreT, path: str) -> None: ...
+    @classmethod
+    def compile_recipe(cls, recipes: Union[str, List[Mapping[str, Union[str, Mapping[str, Any]]]]]) -> CompiledRecipe: ...
+    @classmethod
+    def map_recipe(cls, inputs: Iterable[Any], recipes: Union[str, List[Mapping[str, Union[str, Mapping[str, Any]]]]], workers: int=..., chunksize: int=...) -> Iterator[Any]: ...
     def run_recipe(self: ChepyCoreT, recipes: List[Mapping[str, Union[str, Mapping[str, Any]]]]) -> ChepyCoreT: ...
     def save_recipe(self: ChepyCoreT, path: str) -> ChepyCoreT: ...
     def load_recipe(self: ChepyCoreT, path: str) -> ChepyCoreT: ...
@@ -60,6 +85,9 @@ class ChepyCore:
     def loop_list(self: ChepyCoreT, callback: str, args: dict=...) -> ChepyCoreT: ...
     def loop_dict(self: ChepyCoreT, keys: list, callback: str, args: dict=...) -> ChepyCoreT: ...
     def debug(self: ChepyCoreT, verbose: bool=...) -> ChepyCoreT: ...
+    def checkpoint(self: ChepyCoreT) -> ChepyCoreT: ...
+    def undo(self: ChepyCoreT, n: int=...) -> ChepyCoreT: ...
+    def redo(self: ChepyCoreT) -> ChepyCoreT: ...
     def reset(self: ChepyCoreT): ...
     def load_command(self: ChepyCoreT): ...
     def pretty(self: ChepyCoreT, indent: int=...) -> ChepyCoreT: ...
@@ -1,19 +1,41 @@
-import zipfile
 from pathlib import Path
 
+from ..modules.internal.wordlist import crack
+from ..modules.internal.zipcrypto import ZipPasswordCheck
+
 
 def _expand_path(path):
     return str(Path(path).expanduser().absolute())
 
 
-def zip_password_bruteforce(path: str, wordlist: str) -> str:
-    z = zipfile.ZipFile(_expand_path(path))
-    with open(_expand_path(wordlist)) as f:
-        for password in f:
-            password = password.strip().encode()
-            try:
-                z.setpassword(password)
-                z.testzip()
-                return password
-            except RuntimeError:  # pragma: no cover
-                continue
+def zip_password_bruteforce(
+    path: str,
+    wordlist: str,
+    workers: int = 1,
+    offset: int = 0,
+    progress: bool = False,
+) -> bytes:
+    """Bruteforce the password of a zip file encrypted with ZipCrypto
+
+    Each password is first checked against the encryption headers of the
+    encrypted files, and only the ones that pass are used to decrypt a file.
+    The wordlist can be split across `workers` processes. With `progress`,
+    the byte offset reached in the wordlist is logged, which can be passed
+    as `offset` to resume.
+
+    Args:
+        path (str): Path to the zip file
+        wordlist (str): Path to the wordlist
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        offset (int, optional): Byte offset in the wordlist to start from. Defaults to 0.
+        progress (bool, optional): Log progress. Defaults to False.
+
+    Returns:
+        bytes: The password, or None if it was not found
+    """
+    with open(_expand_path(path), "rb") as f:
+        check = ZipPasswordCheck(f.read())
+    password, _ = crack(
+        check, _expand_path(wordlist), workers=workers, offset=offset, progress=progress
+    )
+    return password
@@ -1 +1 @@
-def zip_password_bruteforce(path: str, wordlist: str) -> str: ...
+def zip_password_bruteforce(path: str, wordlist: str, workers: int=..., offset: int=..., progress: bool=...) -> bytes: ...
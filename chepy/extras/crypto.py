@@ -6,6 +6,7 @@ from urllib.request import urlopen
 from Crypto.PublicKey import RSA
 
 from .combinatons import generate_combo, hex_chars
+from ..modules.internal.xor import solve_repeating_key, xor_bytes
 from chepy import Chepy
 
 
@@ -52,6 +53,8 @@ def xor_bruteforce_multi(
 ) -> Iterator[Dict[str, str]]:
     """Bruteforce multibyte xor encryption. For faster results, use pypy3.
     It is important to set the min and max values if the key size is known.
+    To recover the key of english text, use `xor_repeating_key_bruteforce`
+    instead.
 
     Args:
         data (str): XORed data
@@ -107,6 +110,41 @@ def xor_repeating_key(
             return o
 
 
+def xor_repeating_key_bruteforce(
+    data: bytes,
+    min_length: int = 1,
+    max_length: int = 40,
+    candidates: int = 5,
+    workers: int = 1,
+) -> List[Dict[str, Union[str, bytes, float]]]:
+    """Recover the key of repeating key xor encrypted english text. The key
+    length is guessed from hamming distances, and each byte of the key is
+    solved by english letter frequency. Key lengths are solved in parallel
+    with `workers` processes.
+
+    Args:
+        data (bytes): XORed data
+        min_length (int, optional): Shortest key length. Defaults to 1.
+        max_length (int, optional): Longest key length. Defaults to 40.
+        candidates (int, optional): Number of key lengths to try. Defaults to 5.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+
+    Returns:
+        List[Dict[str, Union[str, bytes, float]]]: Dictionaries with the keys `key` as hex,
+            `score` and `out`, most likely key first.
+
+    Example:
+        >>> xor_repeating_key_bruteforce(ciphertext)[0]["key"]
+        '494345'
+    """
+    return [
+        {"key": key.hex(), "score": score, "out": xor_bytes(data, key)}
+        for key, score in solve_repeating_key(
+            data, min_length, max_length, candidates, workers
+        )
+    ]
+
+
 def xor(data: bytes, key: bytes) -> bytes:  # pragma: no cover
     """XOR data with a hex key
 
@@ -1,6 +1,7 @@
-from typing import Dict, Iterator, Union
+from typing import Dict, Iterator, List, Union
 
 def factordb(n: int) -> dict: ...
 def construct_private_key(n: int, e: int, d: int, format: str=..., passphrase: str=...) -> str: ...
 def xor_bruteforce_multi(data: str, min: int=..., max: int=..., errors: str=...) -> Iterator[Dict[str, str]]: ...
+def xor_repeating_key_bruteforce(data: bytes, min_length: int=..., max_length: int=..., candidates: int=..., workers: int=...) -> List[Dict[str, Union[str, bytes, float]]]: ...
 def xor_repeating_key(data1:bytes, data2: bytes, min: int =..., max: int = ...) -> Union[bytes, None]: ...
@@ -2,9 +2,11 @@ from typing import TypeVar
 
 import json
 
-import pydash
-import regex as re
+import lazy_import
+
+pydash = lazy_import.lazy_module("pydash")
 from ..core import ChepyCore, ChepyDecorators
+from .internal import patterns
 
 CodeTidyT = TypeVar("CodeTidyT", bound="CodeTidy")
 
@@ -115,8 +117,8 @@ class CodeTidy(ChepyCore):
             >>> Chepy("helloWorld").to_snake_case().o
             "hello_world"
         """
-        s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", self._convert_to_str())
-        self.state = re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+        s1 = patterns.get("capitalized_word").sub(r"\1_\2", self._convert_to_str())
+        self.state = patterns.get("case_boundary").sub(r"\1_\2", s1).lower()
         return self
 
     @ChepyDecorators.call_stack
@@ -141,9 +143,9 @@ class CodeTidy(ChepyCore):
             "some DataTest"
         """
         if ignore_space:
-            r = re.compile(r"_.|\-.")
+            r = patterns.get("word_boundary_no_space")
         else:
-            r = re.compile(r"_.|\-.|\s.")
+            r = patterns.get("word_boundary")
         self.state = r.sub(lambda x: x.group()[1].upper(), self._convert_to_str())
         return self
 
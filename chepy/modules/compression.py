@@ -6,9 +6,14 @@ import lzma
 import tarfile
 import zipfile
 import zlib
+from pathlib import Path
 from typing import TypeVar
 
 from ..core import ChepyCore, ChepyDecorators
+from .internal import stream
+from .internal.stream import ChepyStream
+from .internal.wordlist import crack
+from .internal.zipcrypto import ZipPasswordCheck
 
 CompressionT = TypeVar("CompressionT", bound="Compression")
 
@@ -123,6 +128,49 @@ class Compression(ChepyCore):
         z.close()
         return self
 
+    @ChepyDecorators.call_stack
+    def zip_password_bruteforce(
+        self,
+        wordlist: str,
+        workers: int = 1,
+        offset: int = 0,
+        progress: bool = False,
+    ) -> CompressionT:
+        """Bruteforce the password of a ZipCrypto encrypted zip file in the state
+
+        Each password is first checked against the encryption headers of the
+        encrypted files, and only the ones that pass are used to decrypt a file.
+        The wordlist can be split across `workers` processes. With `progress`,
+        the byte offset reached in the wordlist is logged, which can be passed
+        as `offset` to resume. If the password is not found, the state is not
+        changed.
+
+        Args:
+            wordlist (str): Required. Path to a wordlist
+            workers (int, optional): Number of worker processes. Defaults to 1.
+            offset (int, optional): Byte offset in the wordlist to start from. Defaults to 0.
+            progress (bool, optional): Log progress. Defaults to False.
+
+        Returns:
+            Chepy: The Chepy object.
+
+        Examples:
+            >>> c = Chepy("/path/to/zip.zip").load_file()
+            >>> c.zip_password_bruteforce("/path/to/wordlist.txt").o
+            b"password"
+        """
+        check = ZipPasswordCheck(self._convert_to_bytes())
+        password, _ = crack(
+            check,
+            str(Path(wordlist).expanduser().absolute()),
+            workers=workers,
+            offset=offset,
+            progress=progress,
+        )
+        if password is not None:
+            self.state = password
+        return self
+
     @ChepyDecorators.call_stack
     def create_zip_file(self, file_name: str) -> CompressionT:
         """Create a zip archive with data from state
@@ -242,6 +290,9 @@ class Compression(ChepyCore):
             >>> c = Chepy("some data").gzip_compress()
             >>> c.write("/some/path/file.zip", as_binary=True)
         """
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(stream.GzipCompress, file_name)
+            return self
         mf = io.BytesIO()
         g = gzip.GzipFile(filename=file_name, mode="w", fileobj=mf)
         g.write(self._convert_to_bytes())
@@ -256,6 +307,9 @@ class Compression(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(stream.GzipDecompress)
+            return self
         self.state = gzip.decompress(self._convert_to_bytes())
         return self
 
@@ -304,6 +358,9 @@ class Compression(ChepyCore):
             >>> Chepy("some text").zlib_compress().to_hex().o
             b"78da2bcecf4d552849ad28010011e8039a"
         """
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(stream.ZlibCompress, level)
+            return self
         self.state = zlib.compress(self._convert_to_bytes(), level=level)
         return self
 
@@ -321,6 +378,9 @@ class Compression(ChepyCore):
             >>> c.out
             b"some text"
         """
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(stream.ZlibDecompress)
+            return self
         self.state = zlib.decompress(self._convert_to_bytes())
         return self
 
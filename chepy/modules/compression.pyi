@@ -11,6 +11,7 @@ class Compression(ChepyCore):
     def zip_list_files(self: CompressionT) -> CompressionT: ...
     def unzip_one(self: CompressionT, file: str, password: str=...) -> CompressionT: ...
     def unzip_all(self: CompressionT, password: str=...) -> CompressionT: ...
+    def zip_password_bruteforce(self: CompressionT, wordlist: str, workers: int=..., offset: int=..., progress: bool=...) -> CompressionT: ...
     def create_zip_file(self: CompressionT, file_name: str) -> CompressionT: ...
     def tar_list_files(self: CompressionT, mode: Literal["gz", "bz2", "xz", ""]=...) -> CompressionT: ...
     def tar_extract_one(self: CompressionT, filename: str, mode: Literal["gz", "bz2", "xz", ""]=...) -> CompressionT: ...
@@ -1,22 +1,26 @@
 import lazy_import
 import binascii
 import base64
-import codecs
 import html
-import base58
 import json
+import mmap
 import struct
 from random import randint
 
 yaml = lazy_import.lazy_module("yaml")
+base58 = lazy_import.lazy_module("base58")
+hexdump = lazy_import.lazy_module("hexdump")
 import regex as re
-import hexdump
 from ast import literal_eval
-from typing import TypeVar, Union
+from typing import Callable, TypeVar, Union
 from urllib.parse import quote_plus as _urllib_quote_plus
 from urllib.parse import unquote_plus as _urllib_unquote_plus
 
 from ..core import ChepyCore, ChepyDecorators
+from .internal import base91, patterns, stream
+from .internal import codec as _codec
+from .internal import magic as _magic
+from .internal.stream import ChepyStream
 from chepy.modules.internal.constants import Encoding
 
 DataFormatT = TypeVar("DataFormatT", bound="DataFormat")
@@ -83,7 +87,9 @@ class DataFormat(ChepyCore):
             >>> Chepy("[1,2,'lol', true]").str_list_to_list().o
             [1, 2, "lol", True]
         """
-        self.state = json.loads(re.sub(r"'", '"', self._convert_to_str()))
+        self.state = json.loads(
+            patterns.get("single_quote").sub('"', self._convert_to_str())
+        )
         return self
 
     @ChepyDecorators.call_stack
@@ -332,74 +338,41 @@ class DataFormat(ChepyCore):
         return self
 
     @ChepyDecorators.call_stack
-    def base91_encode(self) -> DataFormatT:  # pragma: no cover
+    def base91_encode(self) -> DataFormatT:
         """Base91 encode
         Reference: https://github.com/aberaud/base91-python/blob/master/base91.py#L69
 
         Returns:
             Chepy: The Chepy object.
+
+        Examples:
+            >>> Chepy("flag{some_flag}").base91_encode().o
+            "@iH<,{_{W$OsuxXi%]D"
         """
-        bindata = self._convert_to_bytes()
-        b = 0
-        n = 0
-        out = ""
-        for count in range(len(bindata)):
-            byte = bindata[count : count + 1]
-            b |= struct.unpack("B", byte)[0] << n
-            n += 8
-            if n > 13:
-                v = b & 8191
-                if v > 88:
-                    b >>= 13
-                    n -= 13
-                else:
-                    v = b & 16383
-                    b >>= 14
-                    n -= 14
-                out += (
-                    Encoding.BASE91_ALPHABET[v % 91] + Encoding.BASE91_ALPHABET[v // 91]
-                )
-        if n:
-            out += Encoding.BASE91_ALPHABET[b % 91]
-            if n > 7 or b > 90:
-                out += Encoding.BASE91_ALPHABET[b // 91]
-        self.state = out
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(base91.Base91Encoder)
+        else:
+            self.state = base91.encode(self._convert_to_bytes()).decode()
         return self
 
     @ChepyDecorators.call_stack
-    def base91_decode(self) -> DataFormatT:  # pragma: no cover
+    def base91_decode(self) -> DataFormatT:
         """Decode as Base91
         Reference: https://github.com/aberaud/base91-python/blob/master/base91.py#L42
 
+        Characters that are not in the Base91 alphabet are skipped.
+
         Returns:
             Chepy: The Chepy object.
+
+        Examples:
+            >>> Chepy("@iH<,{_{W$OsuxXi%]D").base91_decode().o
+            b"flag{some_flag}"
         """
-        encoded_str = self._convert_to_str()
-        decode_table = dict((v, k) for k, v in enumerate(Encoding.BASE91_ALPHABET))
-        v = -1
-        b = 0
-        n = 0
-        out = bytearray()
-        for strletter in encoded_str:
-            if not strletter in decode_table:
-                continue
-            c = decode_table[strletter]
-            if v < 0:
-                v = c
-            else:
-                v += c * 91
-                b |= v << n
-                n += 13 if (v & 8191) > 88 else 14
-                while True:
-                    out += struct.pack("B", b & 255)
-                    b >>= 8
-                    n -= 8
-                    if not n > 7:
-                        break
-                v = -1
-        if v + 1:
-            out += struct.pack("B", (b | v << n) & 255)
-        self.state = out
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(base91.Base91Decoder)
+        else:
+            self.state = bytearray(base91.decode(self._convert_to_bytes()))
         return self
 
     @ChepyDecorators.call_stack
@@ -543,7 +516,9 @@ class DataFormat(ChepyCore):
             >>> Chepy("AAA").to_hex().out.decode()
             "414141"
         """
-        if delimiter == "":
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(stream.Hexlify, delimiter)
+        elif delimiter == "":
             self.state = binascii.hexlify(self._convert_to_bytes())
         else:
             self.state = binascii.hexlify(self._convert_to_bytes(), sep=delimiter)
@@ -564,7 +539,9 @@ class DataFormat(ChepyCore):
             >>> Chepy("414141").from_hex().out
             b"AAA"
         """
-        if delimiter is not None:
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(stream.Unhexlify, delimiter, join_by)
+        elif delimiter is not None:
             self.state = join_by.encode().join(
                 list(
                     binascii.unhexlify(x)
@@ -719,7 +696,9 @@ class DataFormat(ChepyCore):
             Chepy: The Chepy object.
         """
         # TODO make new line aware \n \r\n \0a etc
-        self.state = "".join(re.findall(r"\|(.+)\|", self._convert_to_str()))
+        self.state = "".join(
+            patterns.get("hexdump_text").findall(self._convert_to_str())
+        )
         return self
 
     @ChepyDecorators.call_stack
@@ -729,7 +708,7 @@ class DataFormat(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = hexdump.hexdump(self._convert_to_bytes(), result="return")
+        self.state = hexdump.hexdump(self._convert_to_buffer(), result="return")
         return self
 
     @ChepyDecorators.call_stack
@@ -1054,13 +1033,31 @@ class DataFormat(ChepyCore):
         return self
 
     @ChepyDecorators.call_stack
-    def encode_bruteforce(self) -> DataFormatT:
+    def encode_bruteforce(
+        self,
+        lazy: bool = False,
+        filter: Union[float, Callable[[bytes], bool]] = None,
+        workers: int = 1,
+        threads: bool = False,
+    ) -> DataFormatT:
         """Bruteforce the various encoding for a string
 
         Enumerates all supported text encodings for the input,
         allowing you to quickly spot the correct one.
         `Reference <https://docs.python.org/2.4/lib/standard-encodings.html>`__
 
+        The output of every encoding is kept in memory, which adds up to many
+        times the size of the input. With `lazy`, the state is a mapping that
+        only encodes the input when an encoding is read, and `filter` drops
+        junk outputs as soon as they are made.
+
+        Args:
+            lazy (bool, optional): Only encode when an encoding is read. Defaults to False.
+            filter (Union[float, Callable[[bytes], bool]], optional): Keep only the outputs
+                this returns True for. A number is the min share of printable bytes. Defaults to None.
+            workers (int, optional): Number of workers to encode with. Defaults to 1.
+            threads (bool, optional): Use threads instead of processes as workers. Defaults to False.
+
         Returns:
             Chepy: The Chepy object.
 
@@ -1073,37 +1070,45 @@ class DataFormat(ChepyCore):
                 'big5hkscs': b'm\\x88\\xa2nchen\\ud55c',
                 ...
             }
-        """
-        data = self._convert_to_str()
-        final = dict()
-        for enc in Encoding.py_encodings:
-            final[enc] = data.encode(enc, errors="backslashreplace")
-
-        for text_enc in Encoding.py_text_encodings:
-            try:
-                final[text_enc] = codecs.encode(data, text_enc)
-            except TypeError:
-                final[text_enc] = codecs.encode(data.encode(), text_enc)
-            except UnicodeEncodeError:
-                try:
-                    final[text_enc] = codecs.encode(
-                        data, text_enc, errors="backslashreplace"
-                    )
-                except TypeError:  # pragma: no cover
-                    final[text_enc] = codecs.encode(
-                        data.encode(), text_enc, errors="backslashreplace"
-                    )
-        self.state = final
-        return self
-
-    @ChepyDecorators.call_stack
-    def decode_bruteforce(self) -> DataFormatT:
+            >>> Chepy("münchen한").encode_bruteforce(lazy=True).get_by_key("utf_8").o
+            b'm\\xc3\\xbcnchen\\xed\\x95\\x9c'
+        """
+        self.state = _codec.results(
+            _codec.encode,
+            self._convert_to_str(),
+            lazy=lazy,
+            keep=filter,
+            workers=workers,
+            threads=threads,
+        )
+        return self
+
+    @ChepyDecorators.call_stack
+    def decode_bruteforce(
+        self,
+        lazy: bool = False,
+        filter: Union[float, Callable[[str], bool]] = None,
+        workers: int = 1,
+        threads: bool = False,
+    ) -> DataFormatT:
         """Bruteforce the various decoding for a string
 
         Enumerates all supported text encodings for the input,
         allowing you to quickly spot the correct one.
         `Reference <https://docs.python.org/2.4/lib/standard-encodings.html>`__
 
+        The output of every encoding is kept in memory, which adds up to many
+        times the size of the input. With `lazy`, the state is a mapping that
+        only decodes the input when an encoding is read, and `filter` drops
+        junk outputs as soon as they are made.
+
+        Args:
+            lazy (bool, optional): Only decode when an encoding is read. Defaults to False.
+            filter (Union[float, Callable[[str], bool]], optional): Keep only the outputs
+                this returns True for. A number is the min share of printable characters. Defaults to None.
+            workers (int, optional): Number of workers to decode with. Defaults to 1.
+            threads (bool, optional): Use threads instead of processes as workers. Defaults to False.
+
         Returns:
             Chepy: The Chepy object.
 
@@ -1116,31 +1121,73 @@ class DataFormat(ChepyCore):
                 'utf_16_be': '浜硦据捨敮屵搵㕣',
                 ...
             }
-        """
-        data = self._convert_to_bytes()
-        final = dict()
-        for enc in Encoding.py_encodings:
-            final[enc] = data.decode(enc, errors="backslashreplace")
-
-        for text_enc in Encoding.py_text_encodings:
-            try:
-                final[text_enc] = codecs.decode(
-                    data, text_enc, errors="backslashreplace"
-                )
-            except UnicodeDecodeError:  # pragma: no cover
-                final[text_enc] = codecs.decode(
-                    data.decode(), text_enc, errors="backslashreplace"
-                )
-            except AssertionError:
-                final[text_enc] = ""
-                continue
-            except UnicodeError:
-                final[text_enc] = ""
-                continue
-            except TypeError:
-                final[text_enc] = ""
-                continue
-        self.state = final
+            >>> Chepy("m\\xfcnchen\\ud55c").decode_bruteforce(filter=1, workers=4)
+        """
+        self.state = _codec.results(
+            _codec.decode,
+            self._convert_to_bytes(),
+            lazy=lazy,
+            keep=filter,
+            workers=workers,
+            threads=threads,
+        )
+        return self
+
+    @ChepyDecorators.call_stack
+    def magic(
+        self,
+        depth: int = 3,
+        crib: Union[str, bytes] = None,
+        workers: int = 1,
+        top: int = 10,
+        nodes: int = 1000,
+        timeout: float = 10,
+    ) -> DataFormatT:
+        """Find the decoders that turn the state into readable text, like
+        the magic operation of CyberChef
+
+        The decoders are `from_hex`, `base32_decode`, `base58_decode`,
+        `base64_decode`, `base85_decode`, `base91_decode`, `url_decode`,
+        `from_binary`, `from_octal`, `from_charcode`, the decompress methods,
+        `rotate` and single byte `xor`. The outputs that look the most like
+        english are decoded first, and outputs that look random are not
+        decoded any further. An output that was already found is not decoded
+        again. The search stops after `nodes` outputs were decoded, after
+        `timeout` seconds, or as soon as the crib is found.
+
+        Args:
+            depth (int, optional): Max number of decoders in a recipe. Defaults to 3.
+            crib (Union[str, bytes], optional): Known plaintext. Only outputs that contain it
+                are kept. Defaults to None.
+            workers (int, optional): Number of processes to decode with. Defaults to 1.
+            top (int, optional): Number of results. Defaults to 10.
+            nodes (int, optional): Max number of outputs to decode. Defaults to 1000.
+            timeout (float, optional): Max seconds to search for. Defaults to 10.
+
+        Returns:
+            Chepy: The Chepy object. The state is a list of results, best first.
+                Each has the recipe, the output and its score.
+
+        Examples:
+            >>> c = Chepy("NjY2YzYxNjc3YjZkNjE2NzY5NjM3ZA==").magic()
+            >>> c.o[0]
+            {'recipe': [{'function': 'base64_decode', 'args': {}}, {'function': 'from_hex', 'args': {}}],
+            'output': b'flag{magic}', 'score': 3.437}
+            >>> Chepy("NjY2YzYxNjc3YjZkNjE2NzY5NjM3ZA==").run_recipe(c.o[0]["recipe"]).o
+            b'flag{magic}'
+        """
+        if isinstance(crib, str):
+            crib = crib.encode()
+        self.state = _magic.search(
+            self.__class__,
+            self.state,
+            depth=depth,
+            crib=crib,
+            workers=workers,
+            nodes=nodes,
+            timeout=timeout,
+            top=top,
+        )
         return self
 
     @ChepyDecorators.call_stack
@@ -1258,10 +1305,14 @@ class DataFormat(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
+        state = self.state
+        if isinstance(state, mmap.mmap):
+            # a view into the mapped file instead of a copy
+            state = memoryview(state)
         if end is None:
-            self.state = self.state[start:]
+            self.state = state[start:]
         else:
-            self.state = self.state[start:end]
+            self.state = state[start:end]
         return self
 
     @ChepyDecorators.call_stack
@@ -1334,7 +1385,7 @@ class DataFormat(ChepyCore):
         if isinstance(replace_with, str):
             replace_with = replace_with.encode()
         data = self._convert_to_bytes()
-        self.state = re.sub(b"[^[:print:]]", replace_with, data)
+        self.state = patterns.get("non_printable").sub(replace_with, data)
         return self
 
     @ChepyDecorators.call_stack
@@ -1347,7 +1398,7 @@ class DataFormat(ChepyCore):
         """
         data = self._convert_to_bytes()
         # check if hex
-        if not re.match(b"^[0-9a-fA-F]+$", data):  # pragma: no cover
+        if not patterns.get("hex_string").match(data):  # pragma: no cover
             raise ValueError("Data is not hex")
         self.state = hex(struct.unpack("<I", struct.pack(">I", int(data, 16)))[0])[2:]
         return self
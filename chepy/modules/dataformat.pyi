@@ -1,5 +1,5 @@
 from ..core import ChepyCore
-from typing import Any, Literal, TypeVar, Union
+from typing import Any, Callable, Literal, TypeVar, Union
 
 yaml: Any
 DataFormatT = TypeVar('DataFormatT', bound='DataFormat')
@@ -62,8 +62,9 @@ class DataFormat(ChepyCore):
     def from_html_entity(self: DataFormatT) -> DataFormatT: ...
     def to_punycode(self: DataFormatT) -> DataFormatT: ...
     def from_punycode(self: DataFormatT) -> DataFormatT: ...
-    def encode_bruteforce(self: DataFormatT) -> DataFormatT: ...
-    def decode_bruteforce(self: DataFormatT) -> DataFormatT: ...
+    def encode_bruteforce(self: DataFormatT, lazy: bool=..., filter: Union[float, Callable[[bytes], bool]]=..., workers: int=..., threads: bool=...) -> DataFormatT: ...
+    def decode_bruteforce(self: DataFormatT, lazy: bool=..., filter: Union[float, Callable[[str], bool]]=..., workers: int=..., threads: bool=...) -> DataFormatT: ...
+    def magic(self: DataFormatT, depth: int=..., crib: Union[str, bytes]=..., workers: int=..., top: int=..., nodes: int=..., timeout: float=...) -> DataFormatT: ...
     def to_braille(self: DataFormatT) -> DataFormatT: ...
     def from_braille(self: DataFormatT) -> DataFormatT: ...
     def trim(self: DataFormatT) -> DataFormatT: ...
@@ -1,9 +1,9 @@
 import base64
 import binascii
 import codecs
-import itertools
+import hmac
 import string
-from typing import Literal, TypeVar, Dict
+from typing import Literal, TypeVar, Dict, Union
 
 import lazy_import
 
@@ -27,12 +27,47 @@ Padding = lazy_import.lazy_module("Crypto.Util.Padding")
 pycipher = lazy_import.lazy_module("pycipher")
 
 from ..core import ChepyCore, ChepyDecorators
+from .internal import stream
+from .internal import xor as _xor
+from .internal.stream import ChepyStream
 from ..extras.combinatons import hex_chars
 from .internal.constants import EncryptionConsts
+from .internal.wordlist import crack
 
 EncryptionEncodingT = TypeVar("EncryptionEncodingT", bound="EncryptionEncoding")
 
 
+class _JwtSecretCheck(object):
+    """Checks words against the signature of a HMAC signed JWT token. The
+    token is parsed once, and each word costs one HMAC.
+    """
+
+    DIGESTS = {"HS256": "sha256", "HS384": "sha384", "HS512": "sha512"}
+
+    def __init__(self, token: bytes, algorithm: list, b64_encode: bool = False):
+        header, payload, signature = token.strip().split(b".")
+        alg = json.loads(self._b64decode(header)).get("alg")
+        if alg not in algorithm or alg not in self.DIGESTS:
+            raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+        self.digest = self.DIGESTS[alg]
+        self.signing_input = header + b"." + payload
+        self.signature = self._b64decode(signature)
+        self.b64_encode = b64_encode
+
+    @staticmethod
+    def _b64decode(data: bytes) -> bytes:
+        return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+    def key(self, word: bytes) -> bytes:
+        return base64.b64encode(word) if self.b64_encode else word
+
+    def __call__(self, word: bytes) -> bool:
+        return hmac.compare_digest(
+            hmac.digest(self.key(word), self.signing_input, self.digest),
+            self.signature,
+        )
+
+
 class EncryptionEncoding(ChepyCore):
     """This class handles most operations related to various encryption
     related operations. This class inherits the ChepyCore class, and all the
@@ -98,9 +133,14 @@ class EncryptionEncoding(ChepyCore):
         """
         lc = string.ascii_lowercase
         uc = string.ascii_uppercase
-        lookup = str.maketrans(
-            lc + uc, lc[rotate_by:] + lc[:rotate_by] + uc[rotate_by:] + uc[:rotate_by]
-        )
+        rotated = lc[rotate_by:] + lc[:rotate_by] + uc[rotate_by:] + uc[:rotate_by]
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(stream.Rotate, rotate_by)
+            return self
+        if isinstance(self.state, (bytes, bytearray)):
+            lookup = bytes.maketrans((lc + uc).encode(), rotated.encode())
+        else:
+            lookup = str.maketrans(lc + uc, rotated)
         self.state = self.state.translate(lookup)
         return self
 
@@ -229,26 +269,53 @@ class EncryptionEncoding(ChepyCore):
         elif key_type == "base64":
             key = binascii.hexlify(base64.b64decode(key.encode()))
         key = binascii.unhexlify(key)
-        x = bytearray(b"")
-        try:
-            for char, key_val in zip(self._convert_to_str(), itertools.cycle(key)):
-                x.append(ord(char) ^ key_val)
-        except:
-            for char, key_val in zip(self._convert_to_bytes(), itertools.cycle(key)):
-                x.append(char ^ key_val)
-
-        self.state = x
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(stream.Xor, key, self.state)
+            return self
+        self.state = bytearray(_xor.xor_bytes(self._xor_data(), key))
         return self
 
+    def _xor_data(self) -> bytes:
+        """Returns the state as the bytes that are xored. Text is xored by
+        code point when every code point fits in a byte, and as utf-8 bytes
+        otherwise. Streamed files are xored the same way.
+
+        Returns:
+            bytes: The data to xor
+        """
+        state = self.state
+        if isinstance(state, (bytes, bytearray)):
+            points = _xor.code_points(state)
+            return state if points is None else points
+        try:
+            return self._convert_to_str().encode("latin-1")
+        except (UnicodeDecodeError, UnicodeEncodeError):
+            return self._convert_to_bytes()
+
     @ChepyDecorators.call_stack
-    def xor_bruteforce(self, length: int = 100) -> EncryptionEncodingT:
+    def xor_bruteforce(
+        self,
+        length: int = 100,
+        score: bool = False,
+        crib: Union[str, bytes] = None,
+        top: int = None,
+    ) -> EncryptionEncodingT:
         """Brute force single byte xor
 
         For multibyte xor bruteforce, use chepy.extras.crypto_extras.xor_bruteforce_multi
         function
 
+        With `score`, the keys are ranked by how much their output looks like
+        english text, best first. With `crib`, only the keys whose output
+        contains the crib are kept. Only the outputs of the kept keys are
+        created.
+
         Args:
-            length (int, optional): How to bytes to bruteforce. Defaults to 100.
+            length (int, optional): How to bytes to bruteforce. Use None to bruteforce
+                all of the state. Defaults to 100.
+            score (bool, optional): Rank the keys by english letter frequency. Defaults to False.
+            crib (Union[str, bytes], optional): Known plaintext. Defaults to None.
+            top (int, optional): Only keep this many keys. Defaults to None.
 
         Returns:
             Chepy: The Chepy object.
@@ -266,16 +333,69 @@ class EncryptionEncoding(ChepyCore):
             secret
             >>> c.xor("03").bytearray_to_str()
             pf`qfw
+            >>> Chepy("pf`qfw").xor_bruteforce(crib="sec").o
+            {'03': bytearray(b'secret')}
+            >>> Chepy("7f727b7b78376078657b73").from_hex().xor_bruteforce(score=True, top=1).o
+            {'17': bytearray(b'hello world')}
         """
         original = self.state
-        found = {}
-        keys = hex_chars()
-        self.state = original[:length]
-        for key in keys:
-            self.xor(key)
-            found[key] = self.state
+        if length is not None:
             self.state = original[:length]
-        self.state = found
+        data = self._xor_data()
+        keys = list(range(256))
+        if crib is not None:
+            if isinstance(crib, str):
+                crib = crib.encode()
+            keys = _xor.crib_keys(data, crib)
+        if score:
+            scores = _xor.english_scores(_xor.byte_histogram(data))
+            keys.sort(key=lambda k: scores[k], reverse=True)
+        if top is not None:
+            keys = keys[:top]
+        hex_keys = hex_chars()
+        self.state = {
+            hex_keys[key]: bytearray(data.translate(_xor.single_byte_table(key)))
+            for key in keys
+        }
+        return self
+
+    @ChepyDecorators.call_stack
+    def xor_repeating_key_bruteforce(
+        self,
+        min_length: int = 1,
+        max_length: int = 40,
+        candidates: int = 5,
+        workers: int = 1,
+    ) -> EncryptionEncodingT:
+        """Recover the key of repeating key xor
+
+        The key length is guessed from the hamming distance between the state
+        and itself shifted by each length. Every byte of the key is then
+        solved as a single byte xor that looks the most like english text.
+        Works best on english plaintext that is a few times longer than the key.
+
+        Args:
+            min_length (int, optional): Shortest key length. Defaults to 1.
+            max_length (int, optional): Longest key length. Defaults to 40.
+            candidates (int, optional): Number of key lengths to try. Defaults to 5.
+            workers (int, optional): Number of processes to solve key lengths with. Defaults to 1.
+
+        Returns:
+            Chepy: The Chepy object. The state is a dict of hex keys and
+                xored data, most likely key first.
+
+        Examples:
+            >>> c = Chepy("Burning 'em, if you ain't quick and nimble").xor("ICE", "utf")
+            >>> c.xor_repeating_key_bruteforce(max_length=5).o
+            {'494345': bytearray(b"Burning 'em, if you ain't quick and nimble"), ...}
+        """
+        data = self._xor_data()
+        self.state = {
+            key.hex(): bytearray(_xor.xor_bytes(data, key))
+            for key, _ in _xor.solve_repeating_key(
+                data, min_length, max_length, candidates, workers
+            )
+        }
         return self
 
     @ChepyDecorators.call_stack
@@ -329,38 +449,62 @@ class EncryptionEncoding(ChepyCore):
 
     @ChepyDecorators.call_stack
     def jwt_bruteforce(
-        self, wordlist: str, b64_encode: bool = False, algorithm: list = ["HS256"]
+        self,
+        wordlist: str,
+        b64_encode: bool = False,
+        algorithm: list = ["HS256"],
+        workers: int = 1,
+        offset: int = 0,
+        progress: bool = False,
     ) -> EncryptionEncodingT:
         """Brute force JWT token secret
 
         This method will use the provided wordlist to try and bruteforce the
-        verification.
+        verification. The token is parsed once and each word is checked with a
+        single HMAC, so only HS256, HS384 and HS512 tokens are supported.
+
+        The wordlist can be split across `workers` processes. With `progress`,
+        the number of words tried, the words per second and the byte offset
+        reached in the wordlist are logged. Pass that offset as `offset` to
+        resume an interrupted run.
 
         Args:
             wordlist (str): Required. Path to a wordlist
             b64_encode (bool, optional): Encoded the words in base64. Defaults to False.
             algorithm (list, optional): Array of valid algorithms. Defaults to ["HS256"].
+            workers (int, optional): Number of worker processes. Defaults to 1.
+            offset (int, optional): Byte offset in the wordlist to start from. Defaults to 0.
+            progress (bool, optional): Log progress. Defaults to False.
 
         Returns:
             Chepy: The Chepy object.
+
+        Examples:
+            >>> Chepy(token).jwt_bruteforce("/path/to/rockyou.txt", workers=8, progress=True)
         """
-        with open(pathlib.Path(wordlist).expanduser().absolute()) as words:
-            for word in words:
-                try:
-                    word = word.strip()
-                    if b64_encode:  # pragma: no cover
-                        word = base64.b64encode(word)
-                    j = jwt.decode(self._convert_to_str(), word, algorithms=algorithm)
-                    self.state = {
-                        "paylod": j,
-                        "header": jwt.get_unverified_header(self._convert_to_str()),
-                        "secret": word,
-                    }
-                    return self
-                except jwt.InvalidSignatureError:
-                    continue
-            else:  # pragma: no cover
-                return self
+        token = self._convert_to_bytes()
+        check = _JwtSecretCheck(token, algorithm, b64_encode)
+        word, _ = crack(
+            check,
+            str(pathlib.Path(wordlist).expanduser().absolute()),
+            workers=workers,
+            offset=offset,
+            progress=progress,
+        )
+        if word is None:  # pragma: no cover
+            return self
+        secret = check.key(word)
+        if not b64_encode:
+            try:
+                secret = secret.decode()
+            except UnicodeDecodeError:  # pragma: no cover
+                pass
+        self.state = {
+            "paylod": jwt.decode(token, secret, algorithms=algorithm),
+            "header": jwt.get_unverified_header(token),
+            "secret": secret,
+        }
+        return self
 
     @ChepyDecorators.call_stack
     def rc4_encrypt(self, key: str, key_format: str = "hex") -> EncryptionEncodingT:
@@ -1,5 +1,5 @@
 from ..core import ChepyCore
-from typing import Any, TypeVar, Literal, Dict
+from typing import Any, TypeVar, Literal, Dict, Union
 
 jwt: Any
 AES: Any
@@ -20,11 +20,12 @@ class EncryptionEncoding(ChepyCore):
     def rot_47(self: EncryptionEncodingT, amount: int=...) -> EncryptionEncodingT: ...
     def rot_47_bruteforce(self: EncryptionEncodingT) -> EncryptionEncodingT: ...
     def xor(self: EncryptionEncodingT, key: str, key_type: Literal['hex', 'utf', 'base64']=..., ascii: bool=...) -> EncryptionEncodingT: ...
-    def xor_bruteforce(self: EncryptionEncodingT, length: int=...) -> EncryptionEncodingT: ...
+    def xor_bruteforce(self: EncryptionEncodingT, length: int=..., score: bool=..., crib: Union[str, bytes]=..., top: int=...) -> EncryptionEncodingT: ...
+    def xor_repeating_key_bruteforce(self: EncryptionEncodingT, min_length: int=..., max_length: int=..., candidates: int=..., workers: int=...) -> EncryptionEncodingT: ...
     def jwt_decode(self: EncryptionEncodingT) -> EncryptionEncodingT: ...
     def jwt_verify(self: EncryptionEncodingT, secret: str, algorithm: list=...) -> EncryptionEncodingT: ...
     def jwt_sign(self: EncryptionEncodingT, secret: str, algorithms: str=...) -> EncryptionEncodingT: ...
-    def jwt_bruteforce(self: EncryptionEncodingT, wordlist: str, b64_encode: bool=..., algorithm: list=...) -> EncryptionEncodingT: ...
+    def jwt_bruteforce(self: EncryptionEncodingT, wordlist: str, b64_encode: bool=..., algorithm: list=..., workers: int=..., offset: int=..., progress: bool=...) -> EncryptionEncodingT: ...
     def rc4_encrypt(self: EncryptionEncodingT, key: str, key_format: RC4_FORMAT=...) -> EncryptionEncodingT: ...
     def rc4_decrypt(self: EncryptionEncodingT, key: str, key_format: RC4_FORMAT=...) -> EncryptionEncodingT: ...
     def des_encrypt(self: EncryptionEncodingT, key: str, iv: str=..., mode: Literal["CBC", "OFB", "CTR", "ECB"]=..., key_format: FORMAT=..., iv_format: FORMAT=...) -> EncryptionEncodingT: ...
@@ -6,3 +6,13 @@ class StateNotList(Exception):  # pragma: no cover
 class StateNotDict(Exception):  # pragma: no cover
     def __init__(self, msg="State is not a dict", *args, **kwargs):
         super().__init__(msg, *args, **kwargs)
+
+
+class StateIsStream(Exception):  # pragma: no cover
+    def __init__(
+        self,
+        msg="State is a stream. Only chunk safe methods can be used on a streamed file",
+        *args,
+        **kwargs
+    ):
+        super().__init__(msg, *args, **kwargs)
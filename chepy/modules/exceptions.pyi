@@ -5,3 +5,6 @@ class StateNotList(Exception):
 
 class StateNotDict(Exception):
     def __init__(self, msg: str = ..., *args: Any, **kwargs: Any) -> None: ...
+
+class StateIsStream(Exception):
+    def __init__(self, msg: str = ..., *args: Any, **kwargs: Any) -> None: ...
@@ -8,6 +8,7 @@ class Extractors(ChepyCore):
     state: Any = ...
     def extract_hashes(self: ExtractorsT) -> ExtractorsT: ...
     def extract_strings(self: ExtractorsT, length: int=..., join_by: str=...) -> ExtractorsT: ...
+    def extract_strings_with_offsets(self: ExtractorsT, length: int=..., encodings: list=..., output: str=..., chunk_size: int=...) -> ExtractorsT: ...
     def extract_ips(self: ExtractorsT, is_binary: bool=...) -> ExtractorsT: ...
     def extract_email(self: ExtractorsT, is_binary: bool=...) -> ExtractorsT: ...
     def extract_mac_address(self: ExtractorsT, is_binary: bool=...) -> ExtractorsT: ...
@@ -33,6 +34,8 @@ class Extractors(ChepyCore):
     def extract_rsa_private(self: ExtractorsT) -> ExtractorsT: ...
     def extract_dsa_private(self: ExtractorsT) -> ExtractorsT: ...
     def extract_jwt_token(self: ExtractorsT) -> ExtractorsT: ...
+    def extract_all(self: ExtractorsT, kinds: list=...) -> ExtractorsT: ...
+    def scan_secrets(self: ExtractorsT) -> ExtractorsT: ...
     def extract_base64(self: ExtractorsT, min: int=...) -> ExtractorsT: ...
-    def find_continuous_patterns(self: ExtractorsT, str2: Union[str, bytes], min_value: int=...) -> ExtractorsT: ...
+    def find_continuous_patterns(self: ExtractorsT, str2: Union[str, bytes], min_value: int=..., max_results: int=...) -> ExtractorsT: ...
     def find_longest_continious_pattern(self: ExtractorsT, str2: Union[str, bytes]) -> ExtractorsT: ...
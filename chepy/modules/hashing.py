@@ -5,12 +5,12 @@ import lazy_import
 
 from typing import TypeVar, Union
 
-from crccheck.crc import Crc8, Crc32, CrcArc
 from typing_extensions import Literal
 
 HashingT = TypeVar("HashingT", bound="Hashing")
 
 hmac = lazy_import.lazy_module("hmac")
+crc = lazy_import.lazy_module("crccheck.crc")
 MD2 = lazy_import.lazy_module("Crypto.Hash.MD2")
 MD4 = lazy_import.lazy_module("Crypto.Hash.MD4")
 MD5 = lazy_import.lazy_module("Crypto.Hash.MD5")
@@ -31,12 +31,30 @@ KDF = lazy_import.lazy_module("Crypto.Protocol.KDF")
 # from Crypto.Protocol.KDF import scrypt as _crypto_scrypt
 
 from ..core import ChepyCore, ChepyDecorators
+from .internal.stream import ChepyStream
 
 
 class Hashing(ChepyCore):
     def __init__(self, *data):
         super().__init__(*data)
 
+    def _update_hash(self, h):
+        """Feed the state into a hash object. A streamed file is fed
+        one chunk at a time.
+
+        Args:
+            h (object): Any hash object with an update method
+
+        Returns:
+            object: The hash object
+        """
+        if isinstance(self.state, ChepyStream):
+            for chunk in self.state:
+                h.update(chunk)
+        else:
+            h.update(self._convert_to_buffer())
+        return h
+
     @ChepyDecorators.call_stack
     def sha1(self) -> HashingT:
         """Get SHA1 hash
@@ -53,7 +71,7 @@ class Hashing(ChepyCore):
             >>> Chepy("A").sha1().out
             "6dcd4ce23d88e2ee9568ba546c007c63d9131c1b"
         """
-        self.state = hashlib.sha1(self._convert_to_bytes()).hexdigest()
+        self.state = self._update_hash(hashlib.sha1()).hexdigest()
         return self
 
     @ChepyDecorators.call_stack
@@ -67,7 +85,7 @@ class Hashing(ChepyCore):
             >>> Chepy("A").sha2_256().out
             "559aead08264d5795d3909718cdd05abd49572e84fe55590eef31a88a08fdffd"
         """
-        self.state = hashlib.sha256(self._convert_to_bytes()).hexdigest()
+        self.state = self._update_hash(hashlib.sha256()).hexdigest()
         return self
 
     @ChepyDecorators.call_stack
@@ -81,7 +99,7 @@ class Hashing(ChepyCore):
             >>> Chepy("A").sha2_512().out
             21b4f4bd9e64ed355c3eb676a28ebedaf6d8f17bdc365995b319097153044080516bd083bfcce66121a3072646994c8430cc382b8dc543e84880183bf856cff5
         """
-        self.state = hashlib.sha512(self._convert_to_bytes()).hexdigest()
+        self.state = self._update_hash(hashlib.sha512()).hexdigest()
         return self
 
     @ChepyDecorators.call_stack
@@ -106,7 +124,7 @@ class Hashing(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = hashlib.sha384(self._convert_to_bytes()).hexdigest()
+        self.state = self._update_hash(hashlib.sha384()).hexdigest()
         return self
 
     @ChepyDecorators.call_stack
@@ -120,7 +138,7 @@ class Hashing(ChepyCore):
             >>> Chepy("A").sha2_224().out
             "5cfe2cddbb9940fb4d8505e25ea77e763a0077693dbb01b1a6aa94f2"
         """
-        self.state = hashlib.sha224(self._convert_to_bytes()).hexdigest()
+        self.state = self._update_hash(hashlib.sha224()).hexdigest()
         return self
 
     @ChepyDecorators.call_stack
@@ -130,7 +148,7 @@ class Hashing(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = hashlib.sha3_512(self._convert_to_bytes()).hexdigest()
+        self.state = self._update_hash(hashlib.sha3_512()).hexdigest()
         return self
 
     @ChepyDecorators.call_stack
@@ -140,7 +158,7 @@ class Hashing(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = hashlib.sha3_256(self._convert_to_bytes()).hexdigest()
+        self.state = self._update_hash(hashlib.sha3_256()).hexdigest()
         return self
 
     @ChepyDecorators.call_stack
@@ -150,7 +168,7 @@ class Hashing(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = hashlib.sha3_384(self._convert_to_bytes()).hexdigest()
+        self.state = self._update_hash(hashlib.sha3_384()).hexdigest()
         return self
 
     @ChepyDecorators.call_stack
@@ -160,7 +178,7 @@ class Hashing(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = hashlib.sha3_224(self._convert_to_bytes()).hexdigest()
+        self.state = self._update_hash(hashlib.sha3_224()).hexdigest()
         return self
 
     @ChepyDecorators.call_stack
@@ -171,7 +189,7 @@ class Hashing(ChepyCore):
             Chepy: The Chepy object.
         """
         h = MD2.new()
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = h.hexdigest()
         return self
 
@@ -183,7 +201,7 @@ class Hashing(ChepyCore):
             Chepy: The Chepy object.
         """
         h = MD4.new()
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = h.hexdigest()
         return self
 
@@ -199,7 +217,7 @@ class Hashing(ChepyCore):
             "7fc56270e7a70fa81a5935b72eacbe29"
         """
         h = MD5.new()
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = h.hexdigest()
         return self
 
@@ -211,7 +229,7 @@ class Hashing(ChepyCore):
             Chepy: The Chepy object.
         """
         h = keccak.new(digest_bits=512)
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = h.hexdigest()
         return self
 
@@ -223,7 +241,7 @@ class Hashing(ChepyCore):
             Chepy: The Chepy object.
         """
         h = keccak.new(digest_bits=384)
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = h.hexdigest()
         return self
 
@@ -235,7 +253,7 @@ class Hashing(ChepyCore):
             Chepy: The Chepy object.
         """
         h = keccak.new(digest_bits=256)
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = h.hexdigest()
         return self
 
@@ -247,7 +265,7 @@ class Hashing(ChepyCore):
             Chepy: The Chepy object.
         """
         h = keccak.new(digest_bits=224)
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = h.hexdigest()
         return self
 
@@ -265,7 +283,7 @@ class Hashing(ChepyCore):
             Chepy: The Chepy object.
         """
         h = SHAKE256.new()
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = binascii.hexlify(h.read(size))
         return self
 
@@ -283,7 +301,7 @@ class Hashing(ChepyCore):
             Chepy: The Chepy object.
         """
         h = SHAKE128.new()
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = binascii.hexlify(h.read(size))
         return self
 
@@ -295,7 +313,7 @@ class Hashing(ChepyCore):
             Chepy: The Chepy object.
         """
         h = RIPEMD.new()
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = h.hexdigest()
         return self
 
@@ -322,7 +340,7 @@ class Hashing(ChepyCore):
             128,
         ], "Valid bits are 512, 384, 256, 160, 128"
         h = BLAKE2b.new(digest_bits=bits, key=key.encode())
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = h.hexdigest()
         return self
 
@@ -343,7 +361,7 @@ class Hashing(ChepyCore):
         """
         assert bits in [256, 160, 128], "Valid bits are 256, 160, 128"
         h = BLAKE2s.new(digest_bits=bits, key=key.encode())
-        h.update(self._convert_to_bytes())
+        self._update_hash(h)
         self.state = h.hexdigest()
         return self
 
@@ -354,7 +372,7 @@ class Hashing(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = Crc8().process(self._convert_to_bytes()).finalhex()
+        self.state = crc.Crc8().process(self._convert_to_bytes()).finalhex()
         return self
 
     @ChepyDecorators.call_stack
@@ -364,7 +382,7 @@ class Hashing(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = CrcArc().process(self._convert_to_bytes()).finalhex()
+        self.state = crc.CrcArc().process(self._convert_to_bytes()).finalhex()
         return self
 
     @ChepyDecorators.call_stack
@@ -378,7 +396,7 @@ class Hashing(ChepyCore):
             >>> Chepy("a").crc32_checksum().out
             "e8b7be43"
         """
-        self.state = Crc32().process(self._convert_to_bytes()).finalhex()
+        self.state = crc.Crc32().process(self._convert_to_bytes()).finalhex()
         return self
 
     @ChepyDecorators.call_stack
@@ -0,0 +1,93 @@
+from typing import List
+
+
+class SuffixAutomaton(object):
+    """Suffix automaton of a string. It is built in linear time, and
+    recognizes every substring of the string.
+
+    Args:
+        data (bytes): The string
+    """
+
+    def __init__(self, data: bytes):
+        self.next = [{}]  # type: List[dict]
+        self.link = [-1]
+        self.length = [0]
+        last = 0
+        for c in data:
+            last = self._extend(last, c)
+
+    def _extend(self, last: int, c: int) -> int:
+        nxt, link, length = self.next, self.link, self.length
+        cur = len(length)
+        nxt.append({})
+        length.append(length[last] + 1)
+        link.append(0)
+        p = last
+        while p != -1 and c not in nxt[p]:
+            nxt[p][c] = cur
+            p = link[p]
+        if p != -1:
+            q = nxt[p][c]
+            if length[p] + 1 == length[q]:
+                link[cur] = q
+            else:
+                clone = len(length)
+                nxt.append(dict(nxt[q]))
+                length.append(length[p] + 1)
+                link.append(link[q])
+                while p != -1 and nxt[p].get(c) == q:
+                    nxt[p][c] = clone
+                    p = link[p]
+                link[q] = clone
+                link[cur] = clone
+        return cur
+
+    def matching_lengths(self, text: bytes) -> List[int]:
+        """For every position in text, the length of the longest substring
+        of the automaton's string that ends there.
+
+        Args:
+            text (bytes): Text to match
+
+        Returns:
+            List[int]: One length for every position in text
+        """
+        nxt, link, length = self.next, self.link, self.length
+        state = 0
+        matched = 0
+        out = []
+        for c in text:
+            while state and c not in nxt[state]:
+                state = link[state]
+                matched = length[state]
+            if c in nxt[state]:
+                state = nxt[state][c]
+                matched += 1
+            else:
+                matched = 0
+            out.append(matched)
+        return out
+
+
+def common_prefix_lengths(text: bytes, *strings: bytes) -> List[int]:
+    """For every position in text, the length of the longest string that
+    starts there and is a substring of all of `strings`.
+
+    A prefix of a substring is also a substring, so this is the smallest of
+    the longest match against each string. Each match is found by running
+    the reversed text through a suffix automaton of the reversed string.
+
+    Args:
+        text (bytes): Text to match
+        *strings (bytes): Strings to match against
+
+    Returns:
+        List[int]: One length for every position in text
+    """
+    lengths = [len(text) - i for i in range(len(text))]
+    for string in strings:
+        matched = SuffixAutomaton(string[::-1]).matching_lengths(text[::-1])
+        matched.reverse()
+        lengths = [min(a, b) for a, b in zip(lengths, matched)]
+    return lengths
@@ -0,0 +1,10 @@
+from typing import List
+
+class SuffixAutomaton:
+    next: List[dict] = ...
+    link: List[int] = ...
+    length: List[int] = ...
+    def __init__(self, data: bytes) -> None: ...
+    def matching_lengths(self, text: bytes) -> List[int]: ...
+
+def common_prefix_lengths(text: bytes, *strings: bytes) -> List[int]: ...
@@ -0,0 +1,294 @@
+import sys
+from functools import lru_cache
+from typing import List, Tuple
+
+import regex as re
+
+from .constants import Encoding
+
+#: The alphabet as bytes
+ALPHABET = "".join(Encoding.BASE91_ALPHABET).encode()
+
+#: Values the encoder moves between bit stream and 16 bit lanes at a time
+BLOCK = 64
+
+#: Values the decoder moves between 16 bit lanes and bit stream at a time
+WINDOW = 1024
+
+#: Values encoded one at a time when 13 and 14 bit values keep taking
+#: turns, so that such data does not cost a block per value
+SCALAR_STEPS = 16
+
+# a 16 bit lane holds a 14 bit value when its low 13 bits are 88 or less,
+# so its high byte is 0 or 0x20 and its low byte is 88 or less
+_HIGH14 = bytes(int(c in (0, 0x20)) for c in range(256))
+_LOW = bytes(int(c <= 88) for c in range(256))
+_INDEX = bytes(ALPHABET.index(c) if c in ALPHABET else 0 for c in range(256))
+_INVALID = bytes(c for c in range(256) if c not in ALPHABET)
+_RUNS = re.compile(b"\x01+")
+
+
+@lru_cache(maxsize=None)
+def lane_rounds(width: int, count: int, spread: bool) -> Tuple[Tuple[int, int], ...]:
+    """Masks and shifts that move `count` values from every `width` bits to
+    every 16 bits, or back when `spread` is False. Each round moves half of
+    the values of every group, so there are log2(count) rounds of a few
+    operations on big ints, instead of one step for every value.
+
+    Args:
+        width (int): Bits in a value, 13 or 14
+        count (int): Number of values, a power of 2
+        spread (bool): Move to 16 bit lanes
+
+    Returns:
+        Tuple[Tuple[int, int], ...]: Mask and shift of each round
+    """
+    step = 16 - width
+    position = [(width if spread else 16) * i for i in range(count)]
+    bits = list(range(count.bit_length() - 1))
+    rounds = []
+    for k in reversed(bits) if spread else bits:
+        mask = 0
+        for i in range(count):
+            if i >> k & 1:
+                mask |= ((1 << width) - 1) << position[i]
+                position[i] += (step << k) if spread else -(step << k)
+        rounds.append((mask, step << k))
+    return tuple(rounds)
+
+
+@lru_cache(maxsize=None)
+def encode_table() -> List[bytes]:
+    """The two characters for every 13 or 14 bit value
+
+    Returns:
+        List[bytes]: The characters for each value
+    """
+    return [bytes((ALPHABET[v % 91], ALPHABET[v // 91])) for v in range(91 * 91)]
+
+
+@lru_cache(maxsize=None)
+def _lane_mask(width: int, count: int) -> int:
+    return int.from_bytes(((1 << width) - 1).to_bytes(2, "little") * count, "little")
+
+
+def _flags(lanes: bytes, high: bytes) -> bytes:
+    """1 for each 16 bit lane that is a 14 bit value, 0 otherwise"""
+    flags = int.from_bytes(lanes[1::2].translate(high), "little") & int.from_bytes(
+        lanes[0::2].translate(_LOW), "little"
+    )
+    return flags.to_bytes(len(lanes) // 2, "little")
+
+
+def _words(values: bytes) -> memoryview:
+    if sys.byteorder == "big":  # pragma: no cover
+        swapped = bytearray(len(values))
+        swapped[0::2], swapped[1::2] = values[1::2], values[0::2]
+        values = swapped
+    return memoryview(values).cast("H")
+
+
+class Base91Encoder(object):
+    """Base91 encoder that takes data a chunk at a time
+
+    The data is read as one bit stream. Every 13 bits become a value, unless
+    those 13 bits are 88 or less, in which case 14 bits are used. Each value
+    becomes two characters.
+    """
+
+    def __init__(self):
+        self.table = encode_table()
+        self.bits = 0
+        self.n = 0
+
+    def _scalar(self, b: int, n: int, out: bytearray, steps: int) -> Tuple[int, int]:
+        for _ in range(steps):
+            if n <= 13:
+                break
+            v = b & 8191
+            if v > 88:
+                b >>= 13
+                n -= 13
+            else:
+                v = b & 16383
+                b >>= 14
+                n -= 14
+            out.append(v & 255)
+            out.append(v >> 8)
+        return b, n
+
+    def _values(self, data: bytes, final: bool) -> bytearray:
+        rounds13 = lane_rounds(13, BLOCK, True)
+        rounds14 = lane_rounds(14, BLOCK, True)
+        mask13 = (1 << 13 * BLOCK) - 1
+        mask14 = (1 << 14 * BLOCK) - 1
+        b, n = self.bits, self.n
+        out = bytearray()
+        for start in range(0, len(data), 2 * BLOCK):
+            # bits are added a little at a time to keep shifting b cheap
+            piece = data[start : start + 2 * BLOCK]
+            b |= int.from_bytes(piece, "little") << n
+            n += 8 * len(piece)
+            while n > 14 * BLOCK:
+                y = b & mask13
+                for mask, shift in rounds13:
+                    t = y & mask
+                    y = (y ^ t) | (t << shift)
+                lanes = y.to_bytes(2 * BLOCK, "little")
+                # a 14 bit value moves all of the values after it
+                high = lanes[1::2]
+                j = high.find(0)
+                while j != -1 and lanes[2 * j] > 88:
+                    j = high.find(0, j + 1)
+                if j == -1:
+                    out += lanes
+                    b >>= 13 * BLOCK
+                    n -= 13 * BLOCK
+                    continue
+                if j:
+                    out += lanes[: 2 * j]
+                    b >>= 13 * j
+                    v = b & 16383
+                    out.append(v & 255)
+                    out.append(v >> 8)
+                    b >>= 14
+                    n -= 13 * j + 14
+                    continue
+                # starts with 14 bit values, like a run of null bytes
+                y = b & mask14
+                for mask, shift in rounds14:
+                    t = y & mask
+                    y = (y ^ t) | (t << shift)
+                lanes = y.to_bytes(2 * BLOCK, "little")
+                k = _flags(lanes, _HIGH14).find(0)
+                if k == -1:
+                    k = BLOCK
+                if k == 1:
+                    b, n = self._scalar(b, n, out, SCALAR_STEPS)
+                    continue
+                out += lanes[: 2 * k]
+                b >>= 14 * k
+                n -= 14 * k
+        if final:
+            b, n = self._scalar(b, n, out, n)
+        self.bits, self.n = b, n
+        return out
+
+    def _chars(self, values: bytearray) -> bytes:
+        return b"".join(map(self.table.__getitem__, _words(values)))
+
+    def update(self, chunk: bytes) -> bytes:
+        return self._chars(self._values(bytes(chunk), False))
+
+    def flush(self) -> bytes:
+        out = self._chars(self._values(b"", True))
+        b, n = self.bits, self.n
+        if n:
+            out += ALPHABET[b % 91 : b % 91 + 1]
+            if n > 7 or b > 90:
+                out += ALPHABET[b // 91 : b // 91 + 1]
+        self.bits = self.n = 0
+        return out
+
+
+class Base91Decoder(object):
+    """Base91 decoder that takes data a chunk at a time. Characters that are
+    not in the alphabet are skipped.
+    """
+
+    def __init__(self):
+        self.bits = 0
+        self.n = 0
+        self.carry = b""
+
+    def _lanes(self, data: bytes) -> bytes:
+        # every pair of characters is the value first + 91 * second. Both
+        # are put in 16 bit lanes of a big int, so one multiply and one add
+        # decode all of the pairs.
+        lanes = bytearray(len(data))
+        lanes[0::2] = data[0::2].translate(_INDEX)
+        first = int.from_bytes(lanes, "little")
+        lanes[0::2] = data[1::2].translate(_INDEX)
+        second = int.from_bytes(lanes, "little")
+        return (first + 91 * second).to_bytes(len(data), "little")
+
+    def update(self, chunk: bytes) -> bytes:
+        data = self.carry + bytes(chunk).translate(None, _INVALID)
+        end = len(data) & ~1
+        self.carry = data[end:]
+        lanes = self._lanes(data[:end])
+        flags = _flags(lanes, _HIGH14)
+        rounds13 = lane_rounds(13, WINDOW, False)
+        rounds14 = lane_rounds(14, WINDOW, False)
+        b, n = self.bits, self.n
+        out = []
+        for w0 in range(0, end // 2, WINDOW):
+            window = lanes[2 * w0 : 2 * (w0 + WINDOW)]
+            count = len(window) // 2
+            y13 = int.from_bytes(window, "little") & _lane_mask(13, WINDOW)
+            for mask, shift in rounds13:
+                t = y13 & mask
+                y13 = (y13 ^ t) | (t >> shift)
+            y14 = None
+            s = 0
+            for run in _RUNS.finditer(flags, w0, w0 + count):
+                j, k = run.start() - w0, run.end() - w0
+                # the 13 bit values before a run of 14 bit values
+                b |= ((y13 >> 13 * s) & ((1 << 13 * (j - s)) - 1)) << n
+                n += 13 * (j - s)
+                if k - j == 1:
+                    b |= (window[2 * j] | window[2 * j + 1] << 8) << n
+                else:
+                    if y14 is None:
+                        y14 = int.from_bytes(window, "little") & _lane_mask(
+                            14, WINDOW
+                        )
+                        for mask, shift in rounds14:
+                            t = y14 & mask
+                            y14 = (y14 ^ t) | (t >> shift)
+                    b |= ((y14 >> 14 * j) & ((1 << 14 * (k - j)) - 1)) << n
+                n += 14 * (k - j)
+                s = k
+            b |= (y13 >> 13 * s) << n
+            n += 13 * (count - s)
+            size = n >> 3
+            out.append((b & ((1 << 8 * size) - 1)).to_bytes(size, "little"))
+            b >>= 8 * size
+            n -= 8 * size
+        self.bits, self.n = b, n
+        return b"".join(out)
+
+    def flush(self) -> bytes:
+        out = b""
+        if self.carry:
+            v = ALPHABET.index(self.carry)
+            out = bytes(((self.bits | v << self.n) & 255,))
+        self.bits = self.n = 0
+        self.carry = b""
+        return out
+
+
+def encode(data: bytes) -> bytes:
+    """Base91 encode
+
+    Args:
+        data (bytes): Data to encode
+
+    Returns:
+        bytes: The encoded data
+    """
+    encoder = Base91Encoder()
+    return encoder.update(data) + encoder.flush()
+
+
+def decode(data: bytes) -> bytes:
+    """Base91 decode. Characters that are not in the alphabet are skipped.
+
+    Args:
+        data (bytes): Data to decode
+
+    Returns:
+        bytes: The decoded data
+    """
+    decoder = Base91Decoder()
+    return decoder.update(data) + decoder.flush()
@@ -0,0 +1,28 @@
+from typing import List, Tuple
+
+ALPHABET: bytes
+BLOCK: int
+WINDOW: int
+SCALAR_STEPS: int
+
+def lane_rounds(width: int, count: int, spread: bool) -> Tuple[Tuple[int, int], ...]: ...
+def encode_table() -> List[bytes]: ...
+
+class Base91Encoder:
+    table: List[bytes] = ...
+    bits: int = ...
+    n: int = ...
+    def __init__(self) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class Base91Decoder:
+    bits: int = ...
+    n: int = ...
+    carry: bytes = ...
+    def __init__(self) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+def encode(data: bytes) -> bytes: ...
+def decode(data: bytes) -> bytes: ...
@@ -0,0 +1,168 @@
+import json
+import sys
+from collections import deque
+from typing import Any, BinaryIO, Iterator, List, Tuple, Union
+
+from .parallel import ordered_map
+
+#: Record separator of each batch format
+SEPARATORS = {"lines": b"\n", "ndjson": b"\n", "null": b"\0"}
+
+#: Records sent to a worker process at a time
+CHUNKSIZE = 256
+
+#: Seconds a batch that is not full waits for more records before it is sent
+LINGER = 0.05
+
+#: Bytes read at a time for formats that are not split on newlines
+READ_SIZE = 1 << 16
+
+
+def read_records(stream: BinaryIO, separator: bytes) -> Iterator[bytes]:
+    """Split a stream into records as it is read, so that records are
+    handled while the stream is still being written. A separator at the
+    end of the stream does not start an empty record.
+
+    Args:
+        stream (BinaryIO): The stream
+        separator (bytes): Record separator
+
+    Yields:
+        Iterator[bytes]: The records without their separator
+    """
+    if separator == b"\n":
+        for line in stream:
+            yield line[:-1] if line.endswith(b"\n") else line
+        return
+    # read1 returns what is available instead of waiting for a full read
+    read = getattr(stream, "read1", stream.read)
+    rest = b""
+    while True:
+        chunk = read(READ_SIZE)
+        if not chunk:
+            break
+        records = (rest + chunk).split(separator)
+        rest = records.pop()
+        yield from records
+    if rest:
+        yield rest
+
+
+def parse_record(record: bytes, fmt: str) -> Any:
+    """The input of the recipe for a record
+
+    Args:
+        record (bytes): The record
+        fmt (str): lines, ndjson or null
+
+    Returns:
+        Any: The record, or its JSON value for ndjson
+    """
+    if fmt == "ndjson":
+        return json.loads(record)
+    return record
+
+
+def format_output(value: Any, fmt: str) -> bytes:
+    """The output record for the result of the recipe. For ndjson, bytes
+    are decoded as utf-8, and bytes that are not valid are escaped.
+
+    Args:
+        value (Any): The result of the recipe
+        fmt (str): lines, ndjson or null
+
+    Returns:
+        bytes: The output record without a separator
+    """
+    if fmt == "ndjson":
+        if isinstance(value, (bytes, bytearray)):
+            value = bytes(value).decode(errors="backslashreplace")
+        return json.dumps(value, default=str).encode()
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return str(value).encode()
+
+
+#: The compiled recipe and format of a worker
+_worker_recipe = None
+_worker_format = None
+
+
+def _init_worker(recipes: List[dict], fmt: str) -> None:
+    global _worker_recipe, _worker_format
+    from chepy import Chepy
+
+    _worker_recipe = Chepy.compile_recipe(recipes)
+    _worker_format = fmt
+
+
+def _run_worker(record: bytes) -> Tuple[Union[bytes, None], Union[str, None]]:
+    try:
+        value = _worker_recipe(parse_record(record, _worker_format))
+        return format_output(value, _worker_format), None
+    except Exception as e:
+        return None, "{}: {}".format(type(e).__name__, e)
+
+
+def run(
+    recipes: List[dict],
+    fmt: str = "lines",
+    workers: int = 1,
+    stdin: BinaryIO = None,
+    stdout: BinaryIO = None,
+    stderr=None,
+) -> int:
+    """Run a recipe on every record of stdin, and write each output as soon
+    as it is ready. Outputs are written in input order, also with more
+    than one worker.
+
+    A record that fails writes an empty record, or null for ndjson, so
+    outputs stay in line with inputs, and the error goes to stderr with
+    the number of the record in the input. Blank ndjson lines are skipped,
+    but still counted.
+
+    Args:
+        recipes (List[dict]): The recipe
+        fmt (str, optional): lines, ndjson or null. Defaults to "lines".
+        workers (int, optional): Number of worker processes. 0 uses the cpu
+            count. Defaults to 1.
+        stdin (BinaryIO, optional): Input stream. Defaults to stdin.
+        stdout (BinaryIO, optional): Output stream. Defaults to stdout.
+        stderr (optional): Text stream for errors. Defaults to stderr.
+
+    Returns:
+        int: 0 if every record succeeded, 1 otherwise
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    stderr = stderr or sys.stderr
+    separator = SEPARATORS[fmt]
+    # numbers of the records that are run, in the order of their results
+    numbers = deque()
+
+    def records() -> Iterator[bytes]:
+        for number, record in enumerate(read_records(stdin, separator), 1):
+            if fmt == "ndjson" and not record.strip():
+                continue
+            numbers.append(number)
+            yield record
+
+    results = ordered_map(
+        _run_worker,
+        records(),
+        workers=workers or None,
+        chunksize=1 if workers == 1 else CHUNKSIZE,
+        initializer=_init_worker,
+        initargs=(recipes, fmt),
+        linger=LINGER,
+    )
+    failed = 0
+    for output, error in results:
+        number = numbers.popleft()
+        if error is not None:
+            failed += 1
+            stderr.write("record {}: {}\n".format(number, error))
+            output = b"null" if fmt == "ndjson" else b""
+        stdout.write(output + separator)
+        stdout.flush()
+    return 1 if failed else 0
@@ -0,0 +1,11 @@
+from typing import Any, BinaryIO, Dict, Iterator, List
+
+SEPARATORS: Dict[str, bytes]
+CHUNKSIZE: int
+LINGER: float
+READ_SIZE: int
+
+def read_records(stream: BinaryIO, separator: bytes) -> Iterator[bytes]: ...
+def parse_record(record: bytes, fmt: str) -> Any: ...
+def format_output(value: Any, fmt: str) -> bytes: ...
+def run(recipes: List[dict], fmt: str = ..., workers: int = ..., stdin: BinaryIO = ..., stdout: BinaryIO = ..., stderr: Any = ...) -> int: ...
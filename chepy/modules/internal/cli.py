@@ -2,9 +2,12 @@ import sys
 import inspect
 import regex as re
 import pprint
+from functools import lru_cache
 
 import editor
-from docstring_parser import parse as _parse_doc
+import lazy_import
+
+_docstring_parser = lazy_import.lazy_module("docstring_parser")
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit import print_formatted_text
 from prompt_toolkit.styles import Style
@@ -80,15 +83,43 @@ def get_doc(method: str):
         print(red(pprint.pformat("Could not find docs...")))
 
 
-def cli_edit_state(fire: object, args: list):
+def take_snapshot(fire: object) -> object:
+    """Checkpoint the fire object before a command, so that the cli can go
+    back without running the earlier commands again
+
+    Args:
+        fire (object): The fire object
+
+    Returns:
+        object: The fire object to go back to
+    """
+    if isinstance(fire, Chepy):
+        fire.checkpoint()
+    return fire
+
+
+def restore_snapshot(fire: object) -> object:
+    """Go back to a fire object from `take_snapshot`
+
+    Args:
+        fire (object): The fire object from `take_snapshot`
+
+    Returns:
+        object: The fire object
+    """
+    if isinstance(fire, Chepy):
+        fire.undo()
+    return fire
+
+
+def cli_edit_state(fire: object):
     """Edit the current state
 
     Args:
-        args (object): Cli args
+        fire (object): The fire object
     """
-    current_index = fire._current_index
-    hold = editor.edit(contents=str(fire.states[current_index])).decode()
-    args[current_index] = hold
+    hold = editor.edit(contents=str(fire.state)).decode()
+    fire.state = hold
 
 
 def cli_highlight(fire: object, highlight: str):
@@ -116,6 +147,7 @@ def cli_highlight(fire: object, highlight: str):
         print(type(fire))
 
 
+@lru_cache(maxsize=None)
 def get_cli_options():
     options = dict()
     for method in functions_cli():
@@ -123,7 +155,7 @@ def get_cli_options():
             attributes = getattr(module, method)
             if not method.startswith("_"):
                 args = inspect.getfullargspec(attributes).args
-                parsed_doc = _parse_doc(attributes.__doc__)
+                parsed_doc = _docstring_parser.parse(attributes.__doc__)
                 if len(args) == 1:
                     options[method] = {
                         "options": list(
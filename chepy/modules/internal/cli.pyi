@@ -10,7 +10,9 @@ class CliCompleter(Completer):
 
 def functions_cli(): ...
 def get_doc(method: str) -> Any: ...
-def cli_edit_state(fire: object, args: list) -> Any: ...
+def take_snapshot(fire: object) -> object: ...
+def restore_snapshot(fire: object) -> object: ...
+def cli_edit_state(fire: object) -> Any: ...
 def cli_highlight(fire: object, highlight: str) -> Any: ...
 def get_cli_options(): ...
 def print_in_colors(out: Any) -> None: ...
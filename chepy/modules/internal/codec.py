@@ -0,0 +1,222 @@
+import codecs
+import string
+from collections.abc import Mapping
+from typing import Any, Callable, Iterator, Tuple, Union
+
+from .constants import Encoding
+from .parallel import ordered_map
+
+#: Every codec that `encode_bruteforce` and `decode_bruteforce` try
+NAMES = Encoding.py_encodings + Encoding.py_text_encodings
+
+Keep = Union[float, Callable[[Any], bool], None]
+
+_DROP_PRINTABLE = dict.fromkeys(map(ord, string.printable))
+_PRINTABLE_BYTES = string.printable.encode()
+
+
+def encode(data: str, name: str) -> bytes:
+    """Encode a string with one codec. Characters that the codec cannot
+    encode are escaped, and empty bytes are returned when the string is not
+    valid for the codec at all, like a long label for idna.
+
+    Args:
+        data (str): The string
+        name (str): Codec name
+
+    Returns:
+        bytes: The encoded string
+    """
+    if name in Encoding.py_encodings:
+        return data.encode(name, errors="backslashreplace")
+    try:
+        return codecs.encode(data, name)
+    except TypeError:
+        return codecs.encode(data.encode(), name)
+    except UnicodeEncodeError:
+        try:
+            return codecs.encode(data, name, errors="backslashreplace")
+        except TypeError:  # pragma: no cover
+            return codecs.encode(data.encode(), name, errors="backslashreplace")
+    except UnicodeError:
+        return b""
+
+
+def decode(data: bytes, name: str) -> str:
+    """Decode bytes with one codec. Bytes that the codec cannot decode are
+    escaped, and an empty string is returned when the data is not valid
+    for the codec at all.
+
+    Args:
+        data (bytes): The bytes
+        name (str): Codec name
+
+    Returns:
+        str: The decoded string
+    """
+    if name in Encoding.py_encodings:
+        return data.decode(name, errors="backslashreplace")
+    try:
+        return codecs.decode(data, name, errors="backslashreplace")
+    except UnicodeDecodeError:  # pragma: no cover
+        return codecs.decode(data.decode(), name, errors="backslashreplace")
+    except (AssertionError, UnicodeError, TypeError):
+        return ""
+
+
+def printable_ratio(value: Union[str, bytes]) -> float:
+    """Share of printable characters or bytes in a value
+
+    Args:
+        value (Union[str, bytes]): The value
+
+    Returns:
+        float: From 0 to 1. Empty values are 0.
+    """
+    if not value:
+        return 0.0
+    if isinstance(value, str):
+        return 1 - len(value.translate(_DROP_PRINTABLE)) / len(value)
+    return 1 - len(bytes(value).translate(None, _PRINTABLE_BYTES)) / len(value)
+
+
+def keeper(keep: Keep) -> Callable[[Any], bool]:
+    """Predicate that tells which outputs to keep. A number is the min
+    printable ratio of an output.
+
+    Args:
+        keep (Keep): A predicate, a min printable ratio, or None to keep everything
+
+    Returns:
+        Callable[[Any], bool]: The predicate
+    """
+    if keep is None:
+        return lambda value: True
+    if callable(keep):
+        return keep
+    ratio = float(keep)
+    return lambda value: printable_ratio(value) >= ratio
+
+
+class LazyResults(Mapping):
+    """Outputs of each codec, worked out when they are read instead of all
+    at once. Outputs are not kept, so only one is in memory at a time,
+    and reading an output again runs the codec again. Only the codecs
+    whose output the predicate rejected are remembered.
+
+    Args:
+        func (Callable[[Any, str], Any]): `encode` or `decode`
+        data (Any): The input
+        keep (Keep, optional): Which outputs to keep. Defaults to None.
+    """
+
+    def __init__(self, func: Callable[[Any, str], Any], data: Any, keep: Keep = None):
+        self.func = func
+        self.data = data
+        self.keep = keeper(keep)
+        self.rejected = set()
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in NAMES or name in self.rejected:
+            raise KeyError(name)
+        value = self.func(self.data, name)
+        if not self.keep(value):
+            self.rejected.add(name)
+            raise KeyError(name)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for name in NAMES:
+            if name in self.rejected:
+                continue
+            try:
+                self[name]
+            except KeyError:
+                continue
+            yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+#: The input and codec function of a worker
+_worker_data = None
+_worker_func = None
+
+
+def _init_worker(func: Callable[[Any, str], Any], data: Any) -> None:
+    global _worker_data, _worker_func
+    _worker_func = func
+    _worker_data = data
+
+
+def _run_worker(name: str) -> Tuple[str, Any]:
+    return name, _worker_func(_worker_data, name)
+
+
+def run_all(
+    func: Callable[[Any, str], Any],
+    data: Any,
+    keep: Keep = None,
+    workers: int = 1,
+    threads: bool = False,
+) -> Iterator[Tuple[str, Any]]:
+    """Run every codec on the input, in codec order. Outputs that the
+    predicate rejects are dropped as soon as they are made.
+
+    The input is sent to each worker once, not once for every codec.
+
+    Args:
+        func (Callable[[Any, str], Any]): `encode` or `decode`
+        data (Any): The input
+        keep (Keep, optional): Which outputs to keep. Defaults to None.
+        workers (int, optional): Number of workers. Defaults to 1.
+        threads (bool, optional): Use threads instead of processes. Defaults to False.
+
+    Yields:
+        Iterator[Tuple[str, Any]]: (codec name, output) pairs
+    """
+    keep = keeper(keep)
+    if workers <= 1:
+        outputs = ((name, func(data, name)) for name in NAMES)
+    else:
+        outputs = ordered_map(
+            _run_worker,
+            NAMES,
+            workers=workers,
+            initializer=_init_worker,
+            initargs=(func, data),
+            threads=threads,
+        )
+    for name, value in outputs:
+        if keep(value):
+            yield name, value
+
+
+def results(
+    func: Callable[[Any, str], Any],
+    data: Any,
+    lazy: bool = False,
+    keep: Keep = None,
+    workers: int = 1,
+    threads: bool = False,
+) -> Union[dict, LazyResults]:
+    """Outputs of every codec as a dict, or as a `LazyResults` with `lazy`
+
+    Args:
+        func (Callable[[Any, str], Any]): `encode` or `decode`
+        data (Any): The input
+        lazy (bool, optional): Work out each output when it is read. Defaults to False.
+        keep (Keep, optional): Which outputs to keep. Defaults to None.
+        workers (int, optional): Number of workers. Defaults to 1.
+        threads (bool, optional): Use threads instead of processes. Defaults to False.
+
+    Returns:
+        Union[dict, LazyResults]: The outputs by codec name
+    """
+    if lazy:
+        return LazyResults(func, data, keep)
+    return dict(run_all(func, data, keep, workers, threads))
@@ -0,0 +1,23 @@
+from collections.abc import Mapping
+from typing import Any, Callable, Iterator, List, Set, Tuple, Union
+
+NAMES: List[str]
+Keep = Union[float, Callable[[Any], bool], None]
+
+def encode(data: str, name: str) -> bytes: ...
+def decode(data: bytes, name: str) -> str: ...
+def printable_ratio(value: Union[str, bytes]) -> float: ...
+def keeper(keep: Keep) -> Callable[[Any], bool]: ...
+
+class LazyResults(Mapping):
+    func: Callable[[Any, str], Any] = ...
+    data: Any = ...
+    keep: Callable[[Any], bool] = ...
+    rejected: Set[str] = ...
+    def __init__(self, func: Callable[[Any, str], Any], data: Any, keep: Keep = ...) -> None: ...
+    def __getitem__(self, name: str) -> Any: ...
+    def __iter__(self) -> Iterator[str]: ...
+    def __len__(self) -> int: ...
+
+def run_all(func: Callable[[Any, str], Any], data: Any, keep: Keep = ..., workers: int = ..., threads: bool = ...) -> Iterator[Tuple[str, Any]]: ...
+def results(func: Callable[[Any, str], Any], data: Any, lazy: bool = ..., keep: Keep = ..., workers: int = ..., threads: bool = ...) -> Union[dict, LazyResults]: ...
@@ -0,0 +1,121 @@
+import inspect
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import lazy_import
+
+_docstring_parser = lazy_import.lazy_module("docstring_parser")
+
+from ...__version__ import __version__
+
+#: Name of the completion index file in the chepy dir
+INDEX_NAME = "completions.json"
+
+Options = Dict[str, Dict[str, Any]]
+
+
+def build_options(klass: type) -> Tuple[Options, List[List[str]]]:
+    """The options, description and return type of every public method of
+    a class, for the cli completer
+
+    Args:
+        klass (type): The Chepy class
+
+    Returns:
+        Tuple[Options, List[List[str]]]: The options by method name, and the
+            methods whose docs could not be parsed
+    """
+    options = dict()
+    errors = []
+    for method in dir(klass):
+        try:
+            attributes = getattr(klass, method)
+            if not method.startswith("_") and not isinstance(attributes, property):
+                args = inspect.getfullargspec(attributes).args
+                parsed_doc = _docstring_parser.parse(attributes.__doc__)
+                if len(args) == 1:
+                    options[method] = {
+                        "options": list(
+                            map(lambda d: {"flag": d, "meta": ""}, args[1:])
+                        ),
+                        "meta": parsed_doc.short_description,
+                        "returns": parsed_doc.returns.type_name,
+                    }
+                else:
+                    options[method] = {
+                        "options": list(
+                            map(
+                                lambda d: {
+                                    "flag": d[1],
+                                    "meta": parsed_doc.params[d[0]].description,
+                                },
+                                enumerate(args[1:]),
+                            )
+                        ),
+                        "meta": parsed_doc.short_description,
+                        "returns": parsed_doc.returns.type_name,
+                    }
+        except:
+            e_type, e_msg, e_traceback = sys.exc_info()
+            errors.append([e_type.__name__, "Error parsing options in:", method])
+            continue
+    return options, errors
+
+
+def index_key(klass: type) -> Dict[str, Any]:
+    """What the completion index depends on: the chepy version, the classes
+    that make up Chepy, which include the plugins, and the last change to
+    their source files
+
+    Args:
+        klass (type): The Chepy class
+
+    Returns:
+        Dict[str, Any]: The key
+    """
+    classes = [c for c in klass.__mro__ if c is not object]
+    mtime = 0
+    for module in {c.__module__ for c in classes}:
+        path = getattr(sys.modules.get(module), "__file__", None)
+        if path:
+            try:
+                mtime = max(mtime, os.stat(path).st_mtime_ns)
+            except OSError:  # pragma: no cover
+                pass
+    return {
+        "version": __version__,
+        "classes": ["{}.{}".format(c.__module__, c.__qualname__) for c in classes],
+        "mtime": mtime,
+    }
+
+
+def load_options(klass: type, index_path: Path) -> Tuple[Options, List[List[str]]]:
+    """The options of `build_options`, read from the index file when its key
+    still matches, or built and saved to it otherwise
+
+    Args:
+        klass (type): The Chepy class
+        index_path (Path): The index file
+
+    Returns:
+        Tuple[Options, List[List[str]]]: The options by method name, and the
+            methods whose docs could not be parsed
+    """
+    key = index_key(klass)
+    try:
+        with open(str(index_path)) as f:
+            index = json.load(f)
+        if index["key"] == key:
+            return index["options"], index["errors"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    options, errors = build_options(klass)
+    try:
+        with open(str(index_path), "w") as f:
+            json.dump({"key": key, "options": options, "errors": errors}, f)
+    except OSError:  # pragma: no cover
+        pass
+    return options, errors
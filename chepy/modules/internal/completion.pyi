@@ -0,0 +1,9 @@
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+INDEX_NAME: str
+Options = Dict[str, Dict[str, Any]]
+
+def build_options(klass: type) -> Tuple[Options, List[List[str]]]: ...
+def index_key(klass: type) -> Dict[str, Any]: ...
+def load_options(klass: type, index_path: Path) -> Tuple[Options, List[List[str]]]: ...
@@ -11,6 +11,7 @@ class Encoding:
 
 class EncryptionConsts:
     MORSE_CODE_DICT: Any = ...
+    ENGLISH_FREQUENCY: Dict[str, float] = ...
 
 class PcapUSB:
     qwerty_map: Any = ...
@@ -0,0 +1,151 @@
+import mmap
+import struct
+from functools import singledispatch
+from typing import Any, Union
+
+from ..exceptions import StateIsStream
+from .stream import ChepyStream
+
+#: States whose conversions can be cached. They cannot change in place,
+#: so a conversion stays valid for as long as the same object is the state.
+CACHEABLE = (bytes, str, int)
+
+
+@singledispatch
+def to_bytes(state: Any) -> Union[bytes, bytearray]:  # pragma: no cover
+    """Coerce a state into bytes. Dispatches on the type of the state.
+
+    Args:
+        state (Any): The state
+
+    Raises:
+        NotImplementedError: If type coercian isnt available
+            for the type of the state.
+        StateIsStream: If the state is a streamed file.
+
+    Returns:
+        Union[bytes, bytearray]: The state as bytes
+    """
+    # todo check more types here
+    raise NotImplementedError
+
+
+@to_bytes.register(bytes)
+def _bytes_to_bytes(state: bytes) -> bytes:
+    return state
+
+
+@to_bytes.register(str)
+def _str_to_bytes(state: str) -> bytes:
+    return state.encode()
+
+
+@to_bytes.register(int)
+@to_bytes.register(dict)
+@to_bytes.register(list)
+def _repr_to_bytes(state: Any) -> bytes:
+    return str(state).encode()
+
+
+@to_bytes.register(bytearray)
+@to_bytes.register(mmap.mmap)
+@to_bytes.register(memoryview)
+def _buffer_to_bytes(state: Any) -> bytes:
+    return bytes(state)
+
+
+@to_bytes.register(float)
+def _float_to_bytes(state: float) -> bytearray:
+    return bytearray(struct.pack("f", state))
+
+
+@to_bytes.register(ChepyStream)
+def _stream_to_bytes(state: ChepyStream) -> bytes:
+    raise StateIsStream()
+
+
+@singledispatch
+def to_str(state: Any) -> str:  # pragma: no cover
+    """Coerce a state into a str. Dispatches on the type of the state.
+
+    Args:
+        state (Any): The state
+
+    Raises:
+        NotImplementedError: If type coercian isnt available
+            for the type of the state.
+        StateIsStream: If the state is a streamed file.
+
+    Returns:
+        str: The state as a str
+    """
+    # todo check more types here
+    raise NotImplementedError
+
+
+@to_str.register(bytes)
+@to_str.register(bytearray)
+def _bytes_to_str(state: Union[bytes, bytearray]) -> str:
+    return state.decode()
+
+
+@to_str.register(mmap.mmap)
+@to_str.register(memoryview)
+def _buffer_to_str(state: Any) -> str:
+    return bytes(state).decode()
+
+
+@to_str.register(str)
+def _str_to_str(state: str) -> str:
+    return state
+
+
+@to_str.register(int)
+@to_str.register(dict)
+@to_str.register(list)
+def _repr_to_str(state: Any) -> str:
+    return str(state)
+
+
+@to_str.register(float)
+def _float_to_str(state: float) -> str:  # pragma: no cover
+    return format(state, "f")
+
+
+@to_str.register(ChepyStream)
+def _stream_to_str(state: ChepyStream) -> str:
+    raise StateIsStream()
+
+
+@singledispatch
+def to_int(state: Any) -> int:  # pragma: no cover
+    """Coerce a state into an int. Dispatches on the type of the state.
+
+    Args:
+        state (Any): The state
+
+    Raises:
+        NotImplementedError: If type coercian isnt available
+            for the type of the state.
+        StateIsStream: If the state is a streamed file.
+
+    Returns:
+        int: The state as an int
+    """
+    raise NotImplementedError
+
+
+@to_int.register(int)
+def _int_to_int(state: int) -> int:
+    return state
+
+
+@to_int.register(str)
+@to_int.register(bytes)
+def _text_to_int(state: Union[str, bytes]) -> int:
+    return int(state)
+
+
+@to_int.register(ChepyStream)
+def _stream_to_int(state: ChepyStream) -> int:
+    raise StateIsStream()
@@ -0,0 +1,7 @@
+from typing import Any, Tuple, Union
+
+CACHEABLE: Tuple[type, ...]
+
+def to_bytes(state: Any) -> Union[bytes, bytearray]: ...
+def to_str(state: Any) -> str: ...
+def to_int(state: Any) -> int: ...
@@ -0,0 +1,437 @@
+import hashlib
+import heapq
+import itertools
+import math
+import string
+import time
+from collections import deque
+from concurrent import futures
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from ...extras.misc import shannon_entropy
+from . import convert, patterns
+from . import xor as _xor
+from .constants import EncryptionConsts
+from .parallel import ordered_map
+
+#: Bytes of each buffer that are scored
+SAMPLE = 4096
+
+#: Buffers with a higher entropy than this that do not look like text or
+#: compressed data are random or encrypted, and are not decoded any further
+MAX_ENTROPY = 7.0
+
+#: Share of printable bytes above which a buffer is treated as text
+TEXT_RATIO = 0.9
+
+#: How much closer to english the letters must be after a rotation for the
+#: rotation to be tried
+ROTATE_MARGIN = 0.1
+
+#: Subtracted from the score of a result that looks encoded when the
+#: results are ranked
+ENCODED_PENALTY = 3.0
+
+#: Max rotations tried on a buffer
+ROTATIONS = 3
+
+#: Min letters in a buffer to guess a rotation from letter frequencies
+ROTATE_LETTERS = 20
+
+#: Max single byte xor keys tried on a buffer
+XOR_KEYS = 2
+
+Step = Tuple[str, Dict[str, Any]]
+
+_TEXT = (string.printable).encode()
+_LOWERCASE = string.ascii_lowercase.encode()
+_FREQUENCY = [EncryptionConsts.ENGLISH_FREQUENCY[c] for c in string.ascii_lowercase]
+_FREQUENCY_NORM = math.sqrt(sum(x * x for x in _FREQUENCY))
+
+
+def _charset(chars: bytes) -> Callable[[bytes], bool]:
+    def test(data: bytes) -> bool:
+        return not data.translate(None, chars)
+
+    return test
+
+
+_is_hex = _charset(string.hexdigits.encode())
+_is_base32 = _charset(string.ascii_uppercase.encode() + b"234567=")
+_is_base58 = _charset(
+    b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+)
+_is_base64 = _charset(string.ascii_letters.encode() + string.digits.encode() + b"+/=")
+_is_base85 = _charset(bytes(range(0x21, 0x76)) + b"z")
+_is_base91 = _charset(
+    (string.ascii_letters + string.digits + "!#$%&()*+,./:;<=>?@[]^_`{|}~\"").encode()
+)
+_is_binary = _charset(b"01 ")
+_is_octal = _charset(b"01234567 ")
+_is_charcode = _charset(string.hexdigits.encode() + b" ")
+
+#: Decoders the search tries as (method, args, test). A decoder is only
+#: run on a buffer that passes its test, which is much cheaper than
+#: running it and catching the error.
+DECODERS = [
+    ("from_hex", {}, lambda d: len(d) % 2 == 0 and _is_hex(d)),
+    ("base32_decode", {}, lambda d: len(d) % 8 == 0 and _is_base32(d)),
+    ("base58_decode", {}, lambda d: len(d) > 1 and _is_base58(d)),
+    (
+        "base64_decode",
+        {},
+        lambda d: len(d) % 4 != 1 and _is_base64(d) and b"=" not in d.rstrip(b"="),
+    ),
+    ("base85_decode", {}, lambda d: len(d) > 4 and _is_base85(d)),
+    ("base91_decode", {}, lambda d: len(d) > 1 and _is_base91(d)),
+    ("url_decode", {}, lambda d: patterns.get("url_encoded").search(d) is not None),
+    (
+        "from_binary",
+        {},
+        lambda d: _is_binary(d) and len(d.replace(b" ", b"")) % 8 == 0 and b"1" in d,
+    ),
+    ("from_octal", {}, lambda d: b" " in d.strip() and _is_octal(d)),
+    ("from_charcode", {}, lambda d: b" " in d.strip() and _is_charcode(d)),
+    ("gzip_decompress", {}, lambda d: d.startswith(b"\x1f\x8b")),
+    ("zlib_decompress", {}, lambda d: d[:2] in (b"\x78\x01", b"\x78\x5e", b"\x78\x9c", b"\x78\xda")),
+    ("bzip_decompress", {}, lambda d: d.startswith(b"BZh")),
+    ("lzma_decompress", {}, lambda d: d.startswith((b"\xfd7zXZ\x00", b"\x5d\x00\x00"))),
+]
+
+_ENCODED = [
+    test
+    for name, _, test in DECODERS
+    if name
+    in (
+        "from_hex",
+        "base32_decode",
+        "base64_decode",
+        "from_binary",
+        "from_octal",
+        "from_charcode",
+    )
+]
+
+_COMPRESSED = ("gzip_decompress", "zlib_decompress", "bzip_decompress", "lzma_decompress")
+
+
+def digest(data: bytes) -> bytes:
+    """Key of a buffer in the table of buffers that were already seen
+
+    Args:
+        data (bytes): The buffer
+
+    Returns:
+        bytes: The digest
+    """
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def text_ratio(sample: bytes) -> float:
+    """Share of printable bytes in a sample
+
+    Args:
+        sample (bytes): The sample
+
+    Returns:
+        float: From 0 to 1
+    """
+    if not sample:
+        return 0.0
+    return 1 - len(sample.translate(None, _TEXT)) / len(sample)
+
+
+def _letter_counts(histogram: List[int]) -> List[int]:
+    return [histogram[c] + histogram[c - 32] for c in _LOWERCASE]
+
+
+def _similarity(counts: List[int]) -> float:
+    """Cosine similarity of letter counts and english letter frequencies"""
+    norm = math.sqrt(sum(x * x for x in counts))
+    if not norm:
+        return 0.0
+    return sum(x * y for x, y in zip(counts, _FREQUENCY)) / (norm * _FREQUENCY_NORM)
+
+
+def score(data: bytes) -> float:
+    """How much a buffer looks like plain english text, from -10 to 10.
+    Higher is better. The letter counts are compared with english letter
+    frequencies, and scaled by the share of letters and spaces. Bytes that
+    are not printable are penalized.
+
+    Args:
+        data (bytes): The buffer
+
+    Returns:
+        float: The score
+    """
+    sample = data[:SAMPLE]
+    if not sample:
+        return -10.0
+    histogram = _xor.byte_histogram(sample)
+    counts = _letter_counts(histogram)
+    share = (sum(counts) + histogram[32]) / len(sample)
+    return 10 * (_similarity(counts) * share - (1 - text_ratio(sample)))
+
+
+def looks_encoded(data: bytes) -> bool:
+    """Whether a buffer can be read as hex, base32, base64, binary, octal or
+    char codes. Such a buffer is more likely a step on the way than the
+    plain text, even when its letters look like english.
+
+    Args:
+        data (bytes): The buffer
+
+    Returns:
+        bool: True if the buffer looks encoded
+    """
+    data = data[:SAMPLE].strip()
+    return len(data) >= 8 and any(test(data) for test in _ENCODED)
+
+
+def worth_decoding(data: bytes) -> bool:
+    """Whether the search should try to decode a buffer any further.
+    Buffers that look random, like encrypted data or the output of a wrong
+    decoder, are dropped.
+
+    Args:
+        data (bytes): The buffer
+
+    Returns:
+        bool: True if the buffer should be decoded further
+    """
+    sample = data[:SAMPLE]
+    if not sample:
+        return False
+    if any(test(sample[:8]) for name, _, test in DECODERS if name in _COMPRESSED):
+        return True
+    if text_ratio(sample) >= TEXT_RATIO:
+        return True
+    return shannon_entropy(sample) <= MAX_ENTROPY
+
+
+def _rotate_table(by: int) -> bytes:
+    lc = string.ascii_lowercase
+    uc = string.ascii_uppercase
+    return bytes.maketrans(
+        (lc + uc).encode(), (lc[by:] + lc[:by] + uc[by:] + uc[:by]).encode()
+    )
+
+
+def _rotations(histogram: List[int], data: bytes, crib: bytes = None) -> List[int]:
+    """Rotations that make the letters look the most like english, best
+    first. A rotation is only kept when it is clearly closer to english than
+    the letters as they are. Letter frequencies mean little in short text,
+    so there the rotations are only found from the crib."""
+    if crib:
+        # data rotated by n contains the crib when data contains the crib
+        # rotated back by n
+        return [by for by in range(1, 26) if crib.translate(_rotate_table(-by % 26)) in data]
+    counts = _letter_counts(histogram)
+    if sum(counts) < ROTATE_LETTERS:
+        return []
+    # rotating by n moves the count of each letter n places up
+    similarity = [_similarity(counts[-by:] + counts[:-by]) for by in range(26)]
+    ranked = sorted(range(1, 26), key=lambda by: -similarity[by])[:ROTATIONS]
+    return [by for by in ranked if similarity[by] - similarity[0] >= ROTATE_MARGIN]
+
+
+def _guesses(data: bytes, crib: bytes = None) -> List[Step]:
+    """Rotate and single byte xor steps that are worth trying on a buffer.
+    Only the best keys are tried, instead of every key. Text xored with a
+    small key is often still text, so the xor key of text is only found
+    from the crib."""
+    sample = data[:SAMPLE]
+    histogram = _xor.byte_histogram(sample)
+    steps = []
+    if text_ratio(sample) >= TEXT_RATIO:
+        steps += [
+            ("rotate", {"rotate_by": by}) for by in _rotations(histogram, data, crib)
+        ]
+        keys = _xor.crib_keys(data, crib)[:XOR_KEYS] if crib else []
+    else:
+        scores = _xor.english_scores(histogram)
+        keys = sorted(range(256), key=lambda k: -scores[k])[:XOR_KEYS]
+        keys = [
+            k
+            for k in keys
+            if text_ratio(sample.translate(_xor.single_byte_table(k))) >= TEXT_RATIO
+        ]
+    steps += [("xor", {"key": "{:02x}".format(k)}) for k in keys if k]
+    return steps
+
+
+class Expander(object):
+    """Runs the decoders on a buffer
+
+    Args:
+        klass (type): The Chepy class whose methods are run
+        crib (bytes, optional): Known plaintext. Defaults to None.
+    """
+
+    def __init__(self, klass: type, crib: bytes = None):
+        self.klass = klass
+        self.crib = crib
+        self.recipes = {}
+
+    def _run(self, step: Step, state: Any) -> Any:
+        name, args = step
+        key = (name, tuple(sorted(args.items())))
+        recipe = self.recipes.get(key)
+        if recipe is None:
+            recipe = self.recipes[key] = self.klass.compile_recipe(
+                [{"function": name, "args": args}]
+            )
+        return recipe(state)
+
+    def expand(self, state: Any) -> List[Tuple[Step, Any]]:
+        """Run every decoder that can apply to a state
+
+        Args:
+            state (Any): The state
+
+        Returns:
+            List[Tuple[Step, Any]]: (step, output) of each decoder that worked
+        """
+        data = bytes(convert.to_bytes(state))
+        stripped = data.strip()
+        steps = [(name, args) for name, args, test in DECODERS if test(stripped)]
+        steps += _guesses(data, self.crib)
+        children = []
+        for step in steps:
+            try:
+                out = self._run(step, state)
+            except Exception:
+                continue
+            if isinstance(out, (bytes, bytearray, str)) and out and out != state:
+                children.append((step, out))
+        return children
+
+
+#: The expander of a worker process
+_worker_expander = None
+
+
+def _init_worker(klass: type, crib: bytes) -> None:
+    global _worker_expander
+    _worker_expander = Expander(klass, crib)
+
+
+def _expand_worker(state: Any) -> List[Tuple[Step, Any]]:
+    return _worker_expander.expand(state)
+
+
+def search(
+    klass: type,
+    state: Any,
+    depth: int = 3,
+    crib: bytes = None,
+    workers: int = 1,
+    nodes: int = 1000,
+    timeout: float = 10.0,
+    top: int = 10,
+) -> List[Dict[str, Any]]:
+    """Best first search for the decoders that turn a state into text
+
+    The buffers that look the most like text are decoded first. Every
+    buffer is hashed, and a buffer that was already reached in as many
+    steps or fewer is not decoded again, so branches that end up with the
+    same data are only explored once. The search stops when `nodes`
+    buffers were decoded, after `timeout` seconds, or as soon as the crib
+    is found.
+
+    Args:
+        klass (type): The Chepy class whose methods are run
+        state (Any): The data to decode
+        depth (int, optional): Max steps in a recipe. Defaults to 3.
+        crib (bytes, optional): Known plaintext. Defaults to None.
+        workers (int, optional): Number of processes to decode with. Defaults to 1.
+        nodes (int, optional): Max buffers to decode. Defaults to 1000.
+        timeout (float, optional): Max seconds to search for. Defaults to 10.
+        top (int, optional): Number of results. Defaults to 10.
+
+    Returns:
+        List[Dict[str, Any]]: The recipe, output and score of each result, best first
+    """
+    deadline = time.monotonic() + timeout
+    order = itertools.count()
+    data = bytes(convert.to_bytes(state))
+    seen = {digest(data): 0}
+    heap = [(-score(data), next(order), (), state)]
+    results = []
+    found = False
+    expanded = 0
+
+    def searching() -> bool:
+        if not heap or found or expanded >= nodes:
+            return False
+        return time.monotonic() < deadline
+
+    def frontier(popped: deque) -> Iterator[Any]:
+        # popped lazily, so that each node is the best one once a worker is free
+        nonlocal expanded
+        while searching():
+            node = heapq.heappop(heap)
+            popped.append(node)
+            expanded += 1
+            yield node[3]
+
+    def visit(steps: Tuple[Step, ...], children: List[Tuple[Step, Any]]) -> None:
+        nonlocal found
+        for step, out in children:
+            data = bytes(convert.to_bytes(out))
+            key = digest(data)
+            if seen.get(key, depth + 1) <= len(steps) + 1:
+                continue
+            seen[key] = len(steps) + 1
+            recipe = steps + (step,)
+            value = score(data)
+            if crib is None or crib in data:
+                found = crib is not None
+                rank = value - (ENCODED_PENALTY if looks_encoded(data) else 0)
+                results.append((rank, next(order), recipe, out, value))
+            if len(recipe) < depth and worth_decoding(data):
+                heapq.heappush(heap, (-value, next(order), recipe, out))
+
+    # the compiled recipes of the expander and the workers are reused by
+    # every round. the root is expanded in process, as it is the only node
+    expander = Expander(klass, crib)
+    if searching():
+        node = heapq.heappop(heap)
+        expanded += 1
+        visit(node[2], expander.expand(node[3]))
+    executor = None
+    if workers > 1 and searching():
+        executor = futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(klass, crib)
+        )
+    try:
+        # a round ends when the heap runs dry while nodes are still being
+        # decoded
+        while searching():
+            popped = deque()
+            expanded_states = ordered_map(
+                expander.expand if executor is None else _expand_worker,
+                frontier(popped),
+                workers=workers,
+                window=workers,
+                executor=executor,
+            )
+            for children in expanded_states:
+                visit(popped.popleft()[2], children)
+                if found:
+                    expanded_states.close()
+                    break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    # best score first, then the shortest recipe, then the first one found
+    results.sort(key=lambda r: (-r[0], len(r[2]), r[1]))
+    return [
+        {
+            "recipe": [{"function": name, "args": dict(args)} for name, args in recipe],
+            "output": out,
+            "score": round(value, 3),
+        }
+        for _, _, recipe, out, value in results[:top]
+    ]
@@ -0,0 +1,27 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+SAMPLE: int
+MAX_ENTROPY: float
+TEXT_RATIO: float
+ROTATE_MARGIN: float
+ENCODED_PENALTY: float
+ROTATIONS: int
+ROTATE_LETTERS: int
+XOR_KEYS: int
+Step = Tuple[str, Dict[str, Any]]
+DECODERS: List[Tuple[str, Dict[str, Any], Callable[[bytes], bool]]]
+
+def digest(data: bytes) -> bytes: ...
+def text_ratio(sample: bytes) -> float: ...
+def score(data: bytes) -> float: ...
+def looks_encoded(data: bytes) -> bool: ...
+def worth_decoding(data: bytes) -> bool: ...
+
+class Expander:
+    klass: type = ...
+    crib: bytes = ...
+    recipes: Dict[Any, Any] = ...
+    def __init__(self, klass: type, crib: bytes = ...) -> None: ...
+    def expand(self, state: Any) -> List[Tuple[Step, Any]]: ...
+
+def search(klass: type, state: Any, depth: int = ..., crib: bytes = ..., workers: int = ..., nodes: int = ..., timeout: float = ..., top: int = ...) -> List[Dict[str, Any]]: ...
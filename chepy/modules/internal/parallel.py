@@ -0,0 +1,208 @@
+import contextlib
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent import futures
+from typing import Any, Callable, Iterable, Iterator, List
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of `size` items
+
+    Args:
+        iterable (Iterable[Any]): Any iterable
+        size (int): Size of each batch
+
+    Yields:
+        Iterator[List[Any]]: Lists of at most `size` items
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, max(int(size), 1)))
+        if not batch:
+            return
+        yield batch
+
+
+def _run_batch(func: Callable, batch: List[Any]) -> List[Any]:
+    return [func(item) for item in batch]
+
+
+def forkserver_context() -> multiprocessing.context.BaseContext:
+    """A context that starts worker processes from a forkserver with chepy
+    imported, where there is one. Workers are then not forked from the
+    current process, so they hold none of its threads' locks or open files.
+
+    Returns:
+        multiprocessing.context.BaseContext: The context
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()  # pragma: no cover
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["chepy"])
+    return context
+
+
+#: Markers the reader thread of `_lingering` puts on its queue
+_END = object()
+_IDLE = object()
+
+
+class _ReadError(object):
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _read_into(iterable: Iterable[Any], items: queue.Queue) -> None:
+    try:
+        for item in iterable:
+            items.put(item)
+    except BaseException as e:
+        items.put(_ReadError(e))
+    items.put(_END)
+
+
+def _lingering(
+    executor: futures.Executor,
+    func: Callable,
+    iterable: Iterable[Any],
+    chunksize: int,
+    window: int,
+    linger: float,
+    pending: deque,
+) -> Iterator[Any]:
+    # the iterable is read in a thread, so that waiting for the next item
+    # does not hold back batches that are not full, or results that are ready
+    items = queue.Queue(max(int(chunksize), 1) * window)
+    threading.Thread(target=_read_into, args=(iterable, items), daemon=True).start()
+    batch = []
+    started = None
+    while True:
+        while pending and pending[0].done():
+            yield from pending.popleft().result()
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+            continue
+        try:
+            item = items.get(timeout=linger)
+        except queue.Empty:
+            item = _IDLE
+        if item is _END:
+            break
+        if isinstance(item, _ReadError):
+            raise item.error
+        if item is not _IDLE:
+            batch.append(item)
+            started = started or time.monotonic()
+        if batch and (
+            len(batch) >= chunksize or time.monotonic() - started >= linger
+        ):
+            pending.append(executor.submit(_run_batch, func, batch))
+            batch = []
+            started = None
+    if batch:
+        pending.append(executor.submit(_run_batch, func, batch))
+    while pending:
+        yield from pending.popleft().result()
+
+
+def ordered_map(
+    func: Callable,
+    iterable: Iterable[Any],
+    workers: int = None,
+    chunksize: int = 1,
+    initializer: Callable = None,
+    initargs: tuple = (),
+    window: int = None,
+    threads: bool = False,
+    linger: float = None,
+    executor: futures.Executor = None,
+) -> Iterator[Any]:
+    """Map a function over an iterable with a pool of worker processes, and
+    yield the results in input order as they complete.
+
+    Items are sent to the workers in batches of `chunksize`, and only
+    `window` batches are in flight at a time, so the iterable is consumed
+    lazily and very large inputs are never held in memory at once. With one
+    worker, everything runs in the current process.
+
+    `func` and `initializer` must be module level functions so that they can
+    be sent to the workers. With `threads`, the workers are threads of the
+    current process instead, which suits functions that spend their time
+    in C code that releases the GIL.
+
+    With `linger`, a batch that is not full is sent anyway once its first
+    item has waited `linger` seconds, and results are yielded as soon as
+    they are ready. This suits iterables that produce items slowly, like
+    a pipe, where waiting for full batches would hold results back. The
+    iterable is then read on a thread, and worker processes are started from
+    a forkserver, so a script that uses it must do so under
+    `if __name__ == "__main__":`.
+
+    With `executor`, the batches run on that executor instead of a new pool,
+    and it is left running, so that a caller that maps many times can reuse
+    its workers. `workers` should then be its number of workers, and
+    `initializer` and `threads` are not used.
+
+    Args:
+        func (Callable): Function that takes one item
+        iterable (Iterable[Any]): Items to map over
+        workers (int, optional): Number of worker processes. Defaults to the cpu count.
+        chunksize (int, optional): Number of items per batch. Defaults to 1.
+        initializer (Callable, optional): Called once in each worker. Defaults to None.
+        initargs (tuple, optional): Args for the initializer. Defaults to ().
+        window (int, optional): Max batches in flight. Defaults to 4 per worker.
+        threads (bool, optional): Use a pool of threads. Defaults to False.
+        linger (float, optional): Max seconds to wait for a batch to fill. Defaults to None.
+        executor (futures.Executor, optional): Executor to run on. Defaults to None.
+
+    Yields:
+        Iterator[Any]: The results in input order
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if executor is None and workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in iterable:
+            yield func(item)
+        return
+
+    window = window or workers * 4
+    if executor is not None:
+        pool = contextlib.nullcontext(executor)
+    elif threads:
+        pool = futures.ThreadPoolExecutor(
+            max_workers=workers, initializer=initializer, initargs=initargs
+        )
+    else:
+        # a worker forked while the reader thread waits on the iterable could
+        # block on a lock the thread holds, like the one of stdin
+        pool = futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=forkserver_context() if linger is not None else None,
+            initializer=initializer,
+            initargs=initargs,
+        )
+    with pool as executor:
+        pending = deque()
+        try:
+            if linger is not None:
+                yield from _lingering(
+                    executor, func, iterable, chunksize, window, linger, pending
+                )
+                return
+            for batch in batched(iterable, chunksize):
+                pending.append(executor.submit(_run_batch, func, batch))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # stop queued work if the consumer stops early
+            for future in pending:
+                future.cancel()
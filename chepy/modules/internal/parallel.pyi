@@ -0,0 +1,7 @@
+import multiprocessing
+from concurrent import futures
+from typing import Any, Callable, Iterable, Iterator, List
+
+def forkserver_context() -> multiprocessing.context.BaseContext: ...
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]: ...
+def ordered_map(func: Callable, iterable: Iterable[Any], workers: int=..., chunksize: int=..., initializer: Callable=..., initargs: tuple=..., window: int=..., threads: bool=..., linger: float=..., executor: futures.Executor=...) -> Iterator[Any]: ...
@@ -0,0 +1,14 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+DETECTORS: Dict[str, Tuple[Optional[Tuple[str, ...]], str]]
+HASHES: Dict[str, int]
+KINDS: Tuple[str, ...]
+REGEXES: Dict[str, Tuple[Union[str, bytes], int]]
+
+def get(name: str) -> Any: ...
+def strings(length: int) -> Any: ...
+def wide_strings(length: int) -> Any: ...
+def warm(names: Iterable[str] = ...) -> int: ...
+def findall(kind: str, data: str) -> list: ...
+def find_hashes(data: Union[bytes, bytearray], kinds: Iterable[str] = ...) -> Dict[str, List[bytes]]: ...
+def scan(data: Union[bytes, bytearray], kinds: Iterable[str] = ..., text: str = ...) -> Dict[str, list]: ...
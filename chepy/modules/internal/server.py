@@ -0,0 +1,468 @@
+import asyncio
+import base64
+import json
+import math
+import os
+import signal
+import socket
+import stat
+import struct
+import threading
+import time
+from concurrent import futures
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, List, Sequence, Tuple, Union
+
+import lazy_import
+
+from .parallel import forkserver_context
+
+msgpack = lazy_import.lazy_module("msgpack")
+
+#: Length of the payload that comes before every frame, big endian
+HEADER = struct.Struct(">I")
+
+#: Default max size of a request frame
+MAX_FRAME = 64 * 1024 * 1024
+
+#: Requests of one connection that are worked on at a time. Reading from
+#: the connection waits while this many responses are pending.
+PIPELINE_DEPTH = 64
+
+#: Compiled recipes kept by each worker
+RECIPE_CACHE = 128
+
+#: First bytes of a msgpack map or array
+_MSGPACK_START = set(range(0x80, 0xA0)) | {0xDC, 0xDD, 0xDE, 0xDF}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode(errors="backslashreplace")
+    return str(value)
+
+
+def decode_frame(payload: bytes) -> Tuple[Any, str]:
+    """Parse the payload of a frame. JSON and msgpack are told apart by
+    their first byte, as a msgpack map or array never starts like JSON.
+
+    Args:
+        payload (bytes): The payload without its header
+
+    Returns:
+        Tuple[Any, str]: The value, and json or msgpack
+    """
+    if payload[:1] and payload[0] in _MSGPACK_START:
+        return msgpack.unpackb(payload, raw=False), "msgpack"
+    return json.loads(payload), "json"
+
+
+def encode_frame(value: Any, fmt: str = "json") -> bytes:
+    """A frame with its header. Values that JSON or msgpack cannot hold
+    are written as strings.
+
+    Args:
+        value (Any): The value
+        fmt (str, optional): json or msgpack. Defaults to "json".
+
+    Returns:
+        bytes: The frame
+    """
+    if fmt == "msgpack":
+        payload = msgpack.packb(value, default=str, use_bin_type=True)
+    else:
+        payload = json.dumps(
+            value, default=_json_default, separators=(",", ":")
+        ).encode()
+    return HEADER.pack(len(payload)) + payload
+
+
+def plain(value: Any) -> Any:
+    """The output of a recipe as a value that can be sent back to the
+    server process and written as JSON or msgpack
+
+    Args:
+        value (Any): The output of a recipe
+
+    Returns:
+        Any: The value, or its string for types that cannot be sent
+    """
+    if isinstance(value, (bytes, str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, bytearray):
+        return bytes(value)
+    if isinstance(value, (list, tuple)):
+        return [plain(v) for v in value]
+    if isinstance(value, dict):
+        return {
+            k if isinstance(k, (str, int)) else str(k): plain(v)
+            for k, v in value.items()
+        }
+    return str(value)
+
+
+#: The Chepy class of a worker
+_worker_class = None
+
+
+def _init_worker(recipes: Sequence[str]) -> None:
+    global _worker_class
+    from chepy import Chepy
+
+    _worker_class = Chepy
+    for recipe in recipes:
+        _recipe(recipe)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+@lru_cache(maxsize=RECIPE_CACHE)
+def _compile(recipe: str, mtime: Union[int, None]) -> Any:
+    # recipe is a file path with its mtime, or a recipe as JSON text
+    if mtime is None:
+        recipe = json.loads(recipe)
+    return _worker_class.compile_recipe(recipe)
+
+
+def _recipe(recipe: Union[str, List[dict]]) -> Any:
+    """The compiled recipe for a recipe or the path to a recipe file. A
+    file is compiled again when it changes."""
+    if isinstance(recipe, str):
+        path = str(Path(recipe).expanduser().absolute())
+        return _compile(path, os.stat(path).st_mtime_ns)
+    return _compile(json.dumps(recipe, sort_keys=True), None)
+
+
+def run_request(request: Any) -> dict:
+    """Run one request in a worker
+
+    Args:
+        request (Any): The request
+
+    Returns:
+        dict: The response, with the seconds spent in the recipe as `run`
+    """
+    start = time.perf_counter()
+    response = {"id": request.get("id") if isinstance(request, dict) else None}
+    try:
+        if not isinstance(request, dict):
+            raise TypeError("A request must be a map")
+        data = request.get("data", "")
+        if request.get("encoding") == "base64":
+            data = base64.b64decode(data)
+        response["output"] = plain(_recipe(request["recipe"])(data))
+    except Exception as e:
+        response["error"] = "{}: {}".format(type(e).__name__, e)
+    response["run"] = time.perf_counter() - start
+    return response
+
+
+def run_requests(requests: List[Any]) -> List[dict]:
+    return [run_request(request) for request in requests]
+
+
+def _bytes_as_text(response: dict) -> dict:
+    # JSON has no bytes, so send text when it is utf-8 and base64 otherwise
+    output = response.get("output")
+    if isinstance(output, bytes):
+        try:
+            response["output"] = output.decode()
+        except UnicodeDecodeError:
+            response["output"] = base64.b64encode(output).decode()
+            response["encoding"] = "base64"
+    return response
+
+
+class Server(object):
+    """Runs recipes for clients of a Unix socket, on a pool of worker processes that have chepy and its plugins imported,
+    and that keep the recipes they compiled.
+
+    Every frame is a 4 byte big endian length followed by a JSON or msgpack
+    payload. A request is a map with a `recipe`, which is a recipe list as
+    used by `run_recipe` or the path to a recipe file as used by
+    `load_recipe`, and the `data` to run it on. JSON requests can send
+    binary data as base64 with `"encoding": "base64"`. An optional `id` is
+    sent back with the response. A list of requests is a batch, and gets a
+    list of responses.
+
+    A response has the `output` or the `error` of the recipe, the seconds
+    spent in the recipe as `run`, and the seconds from reading the request
+    to sending the response as `latency`. Responses use the format of their
+    request. JSON responses send bytes as text, or as base64 with
+    `"encoding": "base64"` when they are not utf-8.
+
+    Clients can send requests without waiting for responses. Responses are
+    always sent in request order.
+
+    Recipes can call any Chepy method, including the ones that read and
+    write files, so anyone who can connect can act as the user that runs
+    the server. The socket is created so that only that user can connect,
+    and there is no network listener for this reason.
+
+    Where they can, workers are started from a forkserver, so a script that
+    runs a server must do so under `if __name__ == "__main__":`.
+
+    Args:
+        workers (int, optional): Number of worker processes. Defaults to the cpu count.
+        recipes (Sequence[str], optional): Recipe files that workers compile
+            when they start. Defaults to ().
+        max_frame (int, optional): Max size of a request frame. Defaults to 64MiB.
+        depth (int, optional): Requests of a connection that are worked on
+            at a time. Defaults to 64.
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        recipes: Sequence[str] = (),
+        max_frame: int = MAX_FRAME,
+        depth: int = PIPELINE_DEPTH,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.recipes = tuple(str(Path(r).expanduser().absolute()) for r in recipes)
+        self.max_frame = max_frame
+        self.depth = depth
+        #: The socket path that the server listens on
+        self.address = None
+        #: Set once the workers are up and the server is listening
+        self.ready = threading.Event()
+        self._executor = None
+        self._loop = None
+        self._stopped = None
+        #: Task and writer of every open connection
+        self._connections = {}
+
+    def _new_executor(self) -> futures.ProcessPoolExecutor:
+        return futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            # workers forked from the server would hold on to the sockets of
+            # its connections
+            mp_context=forkserver_context(),
+            initializer=_init_worker,
+            initargs=(self.recipes,),
+        )
+
+    async def _run(self, requests: List[Any]) -> List[dict]:
+        # split batches over the workers
+        size = math.ceil(len(requests) / self.workers) or 1
+        chunks = [requests[i : i + size] for i in range(0, len(requests), size)]
+        executor = self._executor
+        try:
+            results = await asyncio.gather(
+                *(
+                    self._loop.run_in_executor(executor, run_requests, chunk)
+                    for chunk in chunks
+                )
+            )
+        except BrokenProcessPool:
+            # a recipe took its worker down, so the pool is replaced once
+            # for all the requests that were in it
+            if executor is self._executor:
+                self._executor = self._new_executor()
+                executor.shutdown(wait=False)
+            raise
+        return [response for result in results for response in result]
+
+    async def _respond(self, payload: bytes) -> bytes:
+        start = time.perf_counter()
+        fmt = "json"
+        try:
+            request, fmt = decode_frame(payload)
+            batch = isinstance(request, list)
+            responses = await self._run(request if batch else [request])
+        except Exception as e:
+            batch = False
+            responses = [{"id": None, "error": "{}: {}".format(type(e).__name__, e)}]
+        latency = time.perf_counter() - start
+        for response in responses:
+            response["latency"] = latency
+            if fmt == "json":
+                _bytes_as_text(response)
+        return encode_frame(responses if batch else responses[0], fmt)
+
+    async def _send(
+        self, pending: "asyncio.Queue[Awaitable[bytes]]", writer: asyncio.StreamWriter
+    ) -> None:
+        closed = False
+        while True:
+            response = await pending.get()
+            if response is None:
+                return
+            frame = await response
+            if closed or writer.is_closing():
+                # keep taking responses so that the reader never waits on
+                # a full queue
+                continue
+            try:
+                writer.write(frame)
+                await writer.drain()
+            except ConnectionError:
+                closed = True
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one connection until the client closes it"""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        pending = asyncio.Queue(self.depth)
+        sender = asyncio.ensure_future(self._send(pending, writer))
+        try:
+            while True:
+                (size,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+                if size > self.max_frame:
+                    error = "ValueError: Frame of {} bytes is over the limit of {}"
+                    error = error.format(size, self.max_frame)
+                    frame = encode_frame({"id": None, "error": error})
+                    await pending.put(_done(frame))
+                    break
+                payload = await reader.readexactly(size)
+                # waits while the connection has too many pending requests
+                await pending.put(asyncio.ensure_future(self._respond(payload)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            await pending.put(None)
+            await sender
+            writer.close()
+            del self._connections[task]
+
+    async def _serve(self, socket_path: str) -> None:
+        self._loop = asyncio.get_event_loop()
+        self._stopped = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(sig, self._stopped.set)
+            except (ValueError, RuntimeError, NotImplementedError):
+                # not the main thread, or not supported
+                pass
+        _remove_socket(socket_path)
+        # only the user that runs the server can connect
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.handle, path=socket_path)
+        finally:
+            os.umask(umask)
+        self.address = socket_path
+        self.ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            server.close()
+            # closing a connection ends its reads, and the requests that
+            # were read still get their responses
+            connections = list(self._connections.items())
+            for task, writer in connections:
+                writer.close()
+            await asyncio.gather(*(task for task, _ in connections))
+            await server.wait_closed()
+            _remove_socket(socket_path)
+
+    def serve(self, socket_path: str) -> None:
+        """Start the workers and serve until `stop` is called, or until the
+        process gets SIGINT or SIGTERM
+
+        Args:
+            socket_path (str): Unix socket to listen on
+        """
+        from chepy import Chepy
+
+        for recipe in self.recipes:
+            Chepy.compile_recipe(recipe)
+        self._executor = self._new_executor()
+        # start every worker now, so that the first requests do not wait
+        futures.wait([self._executor.submit(_ping) for _ in range(self.workers)])
+        try:
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self._serve(socket_path))
+            finally:
+                loop.close()
+        finally:
+            self._executor.shutdown()
+
+    def stop(self) -> None:
+        """Stop a server that is serving in another thread"""
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+
+def _done(value: Any) -> "asyncio.Future[Any]":
+    future = asyncio.get_event_loop().create_future()
+    future.set_result(value)
+    return future
+
+
+def _remove_socket(path: str) -> None:
+    # remove the socket of a server that is gone, but never other files
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class Client(object):
+    """A blocking client for `Server`. Requests can be sent with `send`
+    without reading their responses first, and the responses are then read
+    in the same order with `recv`.
+
+    Args:
+        socket_path (str): Unix socket of the server
+        fmt (str, optional): json or msgpack. Defaults to "json".
+    """
+
+    def __init__(self, socket_path: str, fmt: str = "json"):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.fmt = fmt
+        self._file = self.sock.makefile("rb")
+
+    def _read(self, size: int) -> bytes:
+        data = self._file.read(size)
+        if len(data) < size:
+            raise ConnectionError("Connection closed by the server")
+        return data
+
+    def send(self, request: Union[dict, List[dict]]) -> None:
+        """Send a request, or a list of requests as a batch
+
+        Args:
+            request (Union[dict, List[dict]]): The request
+        """
+        self.sock.sendall(encode_frame(request, self.fmt))
+
+    def recv(self) -> Union[dict, List[dict]]:
+        """Read the response to the oldest request that has no response yet
+
+        Returns:
+            Union[dict, List[dict]]: The response, or a list for a batch
+        """
+        (size,) = HEADER.unpack(self._read(HEADER.size))
+        return decode_frame(self._read(size))[0]
+
+    def call(self, request: Union[dict, List[dict]]) -> Union[dict, List[dict]]:
+        """Send a request and wait for its response
+
+        Args:
+            request (Union[dict, List[dict]]): The request
+
+        Returns:
+            Union[dict, List[dict]]: The response
+        """
+        self.send(request)
+        return self.recv()
+
+    def close(self) -> None:
+        self._file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
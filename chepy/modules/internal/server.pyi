@@ -0,0 +1,37 @@
+import asyncio
+import struct
+import threading
+from typing import Any, List, Sequence, Tuple, Union
+
+HEADER: struct.Struct
+MAX_FRAME: int
+PIPELINE_DEPTH: int
+RECIPE_CACHE: int
+
+def decode_frame(payload: bytes) -> Tuple[Any, str]: ...
+def encode_frame(value: Any, fmt: str = ...) -> bytes: ...
+def plain(value: Any) -> Any: ...
+def run_request(request: Any) -> dict: ...
+def run_requests(requests: List[Any]) -> List[dict]: ...
+
+class Server:
+    workers: int = ...
+    recipes: Tuple[str, ...] = ...
+    max_frame: int = ...
+    depth: int = ...
+    address: Union[str, None] = ...
+    ready: threading.Event = ...
+    def __init__(self, workers: int = ..., recipes: Sequence[str] = ..., max_frame: int = ..., depth: int = ...) -> None: ...
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None: ...
+    def serve(self, socket_path: str) -> None: ...
+    def stop(self) -> None: ...
+
+class Client:
+    fmt: str = ...
+    def __init__(self, socket_path: str, fmt: str = ...) -> None: ...
+    def send(self, request: Union[dict, List[dict]]) -> None: ...
+    def recv(self) -> Union[dict, List[dict]]: ...
+    def call(self, request: Union[dict, List[dict]]) -> Union[dict, List[dict]]: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> Client: ...
+    def __exit__(self, *exc: Any) -> None: ...
@@ -0,0 +1,192 @@
+import sys
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+#: Default max number of snapshots of a Chepy object
+SNAPSHOT_LIMIT = 100
+
+#: Default max bytes held by the snapshots of a Chepy object
+SNAPSHOT_MEMORY = 256 * 1024 * 1024
+
+#: Types that are kept by reference, as they cannot change
+IMMUTABLE = (bytes, str, int, float, complex, bool, type(None), frozenset)
+
+
+def freeze(value: Any) -> Any:
+    """The value to keep in a snapshot. Immutable values are shared with the
+    live object. Lists and dicts are copied shallowly, so their items are
+    shared, and bytearrays are copied. Other values, like streams and
+    memory maps, are shared as they cannot be copied.
+
+    Args:
+        value (Any): A state or buffer
+
+    Returns:
+        Any: The value to keep
+    """
+    if isinstance(value, IMMUTABLE):
+        return value
+    if isinstance(value, (list, dict, bytearray)):
+        return value.copy()
+    return value
+
+
+def size_of(value: Any) -> int:
+    """Rough size of a value in bytes. Only the value itself is counted,
+    not the items of a list or dict.
+
+    Args:
+        value (Any): The value
+
+    Returns:
+        int: Its size
+    """
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    try:
+        return sys.getsizeof(value)
+    except TypeError:  # pragma: no cover
+        return 0
+
+
+class Snapshot(object):
+    """The states, buffers, state index and recipe length of a Chepy object
+    at one point. `stack_tail` holds the recipe steps that were undone, so
+    that a redo can put them back. Without `copy`, the snapshot takes the
+    dicts of states and buffers as they are, for an object that is about
+    to be restored from another snapshot and gives up its values.
+    """
+
+    __slots__ = ("states", "buffers", "index", "stack_len", "stack_tail")
+
+    def __init__(
+        self,
+        states: Dict[int, Any],
+        buffers: Dict[int, Any],
+        index: int,
+        stack_len: int,
+        stack_tail: Tuple[dict, ...] = (),
+        copy: bool = True,
+    ):
+        if copy:
+            states = {k: freeze(v) for k, v in states.items()}
+            buffers = {k: freeze(v) for k, v in buffers.items()}
+        self.states = states
+        self.buffers = buffers
+        self.index = index
+        self.stack_len = stack_len
+        self.stack_tail = stack_tail
+
+    def values(self) -> List[Any]:
+        return list(self.states.values()) + list(self.buffers.values())
+
+    def restore(self, chepy: Any) -> None:
+        """Put a Chepy object back the way it was. The snapshot must not be
+        used again afterwards, as the object now owns its values.
+
+        Args:
+            chepy (Any): The Chepy object
+        """
+        chepy.states = self.states
+        chepy.buffers = self.buffers
+        chepy._current_index = self.index
+        del chepy._stack[self.stack_len - len(self.stack_tail) :]
+        chepy._stack.extend(self.stack_tail)
+        chepy._conversions.clear()
+
+
+class SnapshotStore(object):
+    """Undo and redo stacks of snapshots, bounded by a number of snapshots
+    and by the memory they hold. The oldest snapshots are dropped first.
+
+    Values that are shared between snapshots are counted once, so a
+    checkpoint that only changed one state costs the size of that state.
+    The last snapshot pushed is always kept, even when it is larger than
+    the memory cap.
+
+    Args:
+        limit (int): Max number of snapshots
+        max_bytes (int): Max bytes held by the snapshots
+    """
+
+    def __init__(self, limit: int, max_bytes: int):
+        self.limit = limit
+        self.max_bytes = max_bytes
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.size = 0
+        #: id of each value held -> [size, number of snapshots holding it]
+        self._refs = {}
+
+    def _hold(self, snapshot: Snapshot) -> None:
+        for value in snapshot.values():
+            ref = self._refs.get(id(value))
+            if ref is None:
+                ref = self._refs[id(value)] = [size_of(value), 0]
+                self.size += ref[0]
+            ref[1] += 1
+
+    def _release(self, snapshot: Snapshot) -> Snapshot:
+        for value in snapshot.values():
+            ref = self._refs[id(value)]
+            ref[1] -= 1
+            if not ref[1]:
+                del self._refs[id(value)]
+                self.size -= ref[0]
+        return snapshot
+
+    def _trim(self) -> None:
+        # the newest snapshot of each stack is never dropped, even when it
+        # is over the caps on its own, so that the checkpoint that was just
+        # taken can always be gone back to
+        while len(self.undo_stack) > 1 and (
+            len(self.undo_stack) + len(self.redo_stack) > self.limit
+            or self.size > self.max_bytes
+        ):
+            self._release(self.undo_stack.popleft())
+        while len(self.redo_stack) > 1 and (
+            len(self.redo_stack) > self.limit or self.size > self.max_bytes
+        ):
+            self._release(self.redo_stack.pop(0))
+
+    def push(self, snapshot: Snapshot) -> None:
+        """Add a snapshot to undo to, and forget the snapshots to redo
+
+        Args:
+            snapshot (Snapshot): The snapshot
+        """
+        while self.redo_stack:
+            self._release(self.redo_stack.pop())
+        self._hold(snapshot)
+        self.undo_stack.append(snapshot)
+        self._trim()
+
+    def undo(self, current: Snapshot) -> Snapshot:
+        """Swap the current snapshot for the last one that was pushed
+
+        Args:
+            current (Snapshot): Snapshot of the object now, for redo
+
+        Returns:
+            Snapshot: The snapshot to restore
+        """
+        snapshot = self._release(self.undo_stack.pop())
+        self._hold(current)
+        self.redo_stack.append(current)
+        self._trim()
+        return snapshot
+
+    def redo(self, current: Snapshot) -> Snapshot:
+        """Swap the current snapshot for the last one that was undone
+
+        Args:
+            current (Snapshot): Snapshot of the object now, for undo
+
+        Returns:
+            Snapshot: The snapshot to restore
+        """
+        snapshot = self._release(self.redo_stack.pop())
+        self._hold(current)
+        self.undo_stack.append(current)
+        self._trim()
+        return snapshot
@@ -0,0 +1,29 @@
+from typing import Any, Dict, List, Tuple
+
+SNAPSHOT_LIMIT: int
+SNAPSHOT_MEMORY: int
+IMMUTABLE: tuple
+
+def freeze(value: Any) -> Any: ...
+def size_of(value: Any) -> int: ...
+
+class Snapshot:
+    states: Dict[int, Any] = ...
+    buffers: Dict[int, Any] = ...
+    index: int = ...
+    stack_len: int = ...
+    stack_tail: Tuple[dict, ...] = ...
+    def __init__(self, states: Dict[int, Any], buffers: Dict[int, Any], index: int, stack_len: int, stack_tail: Tuple[dict, ...]=..., copy: bool=...) -> None: ...
+    def values(self) -> List[Any]: ...
+    def restore(self, chepy: Any) -> None: ...
+
+class SnapshotStore:
+    limit: int = ...
+    max_bytes: int = ...
+    undo_stack: Any = ...
+    redo_stack: List[Snapshot] = ...
+    size: int = ...
+    def __init__(self, limit: int, max_bytes: int) -> None: ...
+    def push(self, snapshot: Snapshot) -> None: ...
+    def undo(self, current: Snapshot) -> Snapshot: ...
+    def redo(self, current: Snapshot) -> Snapshot: ...
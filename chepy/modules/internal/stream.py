@@ -0,0 +1,319 @@
+import binascii
+import gzip
+import io
+import string
+import zlib
+from functools import partial
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Tuple, Union
+
+from . import patterns
+from .strings import StringScanner
+from .xor import CodePoints, chunks_are_code_points, xor_bytes
+
+#: Bytes that `extract_strings` considers printable
+PRINTABLE = bytes(range(0x20, 0x7F))
+
+
+class ChepyStream(object):
+    """A file that is read in chunks instead of being loaded into memory.
+    Created by `stream_file`.
+
+    Chunk safe methods do not read the file. They return a new stream with
+    one more transform on it, and the file is only read, one chunk at a
+    time, when the stream is consumed by `write_binary` or by a hash method.
+    A stream can be consumed more than once.
+
+    Args:
+        path (Union[str, Path]): Path to the file
+        chunk_size (int, optional): Bytes to read at a time. Defaults to 1MB.
+        transforms (tuple, optional): Transforms as (class, args) tuples.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        chunk_size: int = 1024 * 1024,
+        transforms: Tuple[Tuple[type, tuple], ...] = (),
+    ):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.transforms = transforms
+
+    def __repr__(self) -> str:
+        names = ", ".join(t.__name__ for t, _ in self.transforms)
+        return "ChepyStream({}, [{}])".format(self.path, names)
+
+    def pipe(self, transform: type, *args: Any) -> "ChepyStream":
+        """Returns a new stream with a transform added to it
+
+        Args:
+            transform (type): Class with `update` and `flush` methods
+            *args (Any): Args to create the transform with
+
+        Returns:
+            ChepyStream: The new stream
+        """
+        return ChepyStream(
+            self.path, self.chunk_size, self.transforms + ((transform, args),)
+        )
+
+    def __iter__(self) -> Iterator[bytes]:
+        transforms = [transform(*args) for transform, args in self.transforms]
+        with open(str(self.path), "rb") as f:
+            for chunk in iter(partial(f.read, self.chunk_size), b""):
+                for transform in transforms:
+                    chunk = transform.update(chunk)
+                if chunk:
+                    yield chunk
+        # whatever a transform holds back is passed on to the rest of the chain
+        pending = b""
+        for transform in transforms:
+            if pending:
+                pending = transform.update(pending)
+            pending += transform.flush()
+        if pending:
+            yield pending
+
+
+class Xor(object):
+    # Text is xored by code point like `xor` does in memory. ascii is the
+    # same either way, so `source`, the stream before this transform, is
+    # only read to tell whether the data is text once a chunk that is not
+    # ascii comes in.
+    def __init__(self, key: bytes, source: Iterable[bytes] = None):
+        self.key = key
+        self.source = source
+        self.offset = 0
+        self.points = None
+        self.checked = source is None
+
+    def update(self, chunk: bytes) -> bytes:
+        if not self.checked and not chunk.isascii():
+            self.checked = True
+            if chunks_are_code_points(self.source):
+                self.points = CodePoints()
+        if self.points is not None:
+            chunk = self.points.update(chunk)
+        return self._xor(chunk)
+
+    def flush(self) -> bytes:
+        if self.points is None:
+            return b""
+        return self._xor(self.points.flush())
+
+    def _xor(self, data: bytes) -> bytes:
+        out = xor_bytes(data, self.key, self.offset)
+        self.offset += len(data)
+        return out
+
+
+class Hexlify(object):
+    def __init__(self, delimiter: str = ""):
+        self.delimiter = delimiter.encode() if isinstance(delimiter, str) else delimiter
+        self.first = True
+
+    def update(self, chunk: bytes) -> bytes:
+        if not chunk:
+            return b""
+        if self.delimiter:
+            out = binascii.hexlify(chunk, sep=self.delimiter)
+            if not self.first:
+                out = self.delimiter + out
+        else:
+            out = binascii.hexlify(chunk)
+        self.first = False
+        return out
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class Unhexlify(object):
+    def __init__(self, delimiter: str = None, join_by: str = " "):
+        if isinstance(delimiter, str):
+            delimiter = delimiter.encode()
+        self.delimiter = delimiter
+        self.join_by = join_by.encode()
+        self.carry = b""
+        self.first = True
+
+    def update(self, chunk: bytes) -> bytes:
+        data = self.carry + chunk
+        if self.delimiter is None:
+            end = len(data) & ~1
+            self.carry = data[end:]
+            return binascii.unhexlify(data[:end])
+        parts = data.split(self.delimiter)
+        self.carry = parts.pop()
+        return self._join(parts)
+
+    def flush(self) -> bytes:
+        if self.delimiter is None:
+            # raises on an odd number of hex chars just like from_hex
+            return binascii.unhexlify(self.carry)
+        return self._join([self.carry])
+
+    def _join(self, parts: list) -> bytes:
+        if not parts:
+            return b""
+        out = self.join_by.join(binascii.unhexlify(x) for x in parts)
+        if not self.first:
+            out = self.join_by + out
+        self.first = False
+        return out
+
+
+class Rotate(object):
+    def __init__(self, rotate_by: int):
+        lc = string.ascii_lowercase.encode()
+        uc = string.ascii_uppercase.encode()
+        self.table = bytes.maketrans(
+            lc + uc, lc[rotate_by:] + lc[:rotate_by] + uc[rotate_by:] + uc[:rotate_by]
+        )
+
+    def update(self, chunk: bytes) -> bytes:
+        return chunk.translate(self.table)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class RemoveNullbytes(object):
+    def update(self, chunk: bytes) -> bytes:
+        return chunk.replace(b"\x00", b"")
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class ExtractStrings(object):
+    """Strings that run over a chunk boundary are carried over to the next
+    chunk. A string that grows past `limit` bytes is written out as it is
+    found instead of being held in memory.
+    """
+
+    def __init__(self, length: int = 4, join_by: str = "\n", limit: int = 1024 * 1024):
+        self.length = length
+        self.join_by = join_by.encode()
+        self.limit = max(limit, length)
+        self.pattern = patterns.strings(length)
+        self.carry = b""
+        self.in_string = False
+        self.first = True
+
+    def _emit(self, out: list, data: bytes) -> None:
+        if not self.first:
+            out.append(self.join_by)
+        self.first = False
+        out.append(data)
+
+    def update(self, chunk: bytes) -> bytes:
+        out = []
+        if self.in_string:
+            rest = chunk.lstrip(PRINTABLE)
+            out.append(chunk[: len(chunk) - len(rest)])
+            if not rest:
+                return b"".join(out)
+            self.in_string = False
+            chunk = rest
+        data = self.carry + chunk
+        body = data.rstrip(PRINTABLE)
+        self.carry = data[len(body) :]
+        for matched in self.pattern.findall(body):
+            self._emit(out, matched)
+        if len(self.carry) >= self.limit:
+            self._emit(out, self.carry)
+            self.carry = b""
+            self.in_string = True
+        return b"".join(out)
+
+    def flush(self) -> bytes:
+        out = []
+        if len(self.carry) >= self.length:
+            self._emit(out, self.carry)
+        self.carry = b""
+        return b"".join(out)
+
+
+class StringRecords(object):
+    """Writes one `offset<TAB>encoding<TAB>string` line for each string,
+    where offset is the position of the string in the stream.
+    """
+
+    def __init__(self, length: int = 4, encodings: tuple = ("ascii", "utf-16le")):
+        self.scanner = StringScanner(length, encodings)
+
+    def _format(self, records: list) -> bytes:
+        return "".join("{}\t{}\t{}\n".format(*r) for r in records).encode()
+
+    def update(self, chunk: bytes) -> bytes:
+        return self._format(self.scanner.update(chunk))
+
+    def flush(self) -> bytes:
+        return self._format(self.scanner.flush())
+
+
+class GzipCompress(object):
+    def __init__(self, file_name: str = None):
+        self.buffer = io.BytesIO()
+        self.gzip = gzip.GzipFile(filename=file_name, mode="w", fileobj=self.buffer)
+
+    def _drain(self) -> bytes:
+        out = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return out
+
+    def update(self, chunk: bytes) -> bytes:
+        self.gzip.write(chunk)
+        return self._drain()
+
+    def flush(self) -> bytes:
+        self.gzip.close()
+        return self._drain()
+
+
+class GzipDecompress(object):
+    def __init__(self):
+        self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def update(self, chunk: bytes) -> bytes:
+        out = self.decompressor.decompress(chunk)
+        # a gzip file can have more than one member
+        while self.decompressor.eof and self.decompressor.unused_data:
+            data = self.decompressor.unused_data
+            self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            out += self.decompressor.decompress(data)
+        return out
+
+    def flush(self) -> bytes:
+        if not self.decompressor.eof:
+            raise EOFError(
+                "Compressed file ended before the end-of-stream marker was reached"
+            )
+        return self.decompressor.flush()
+
+
+class ZlibCompress(object):
+    def __init__(self, level: int = 9):
+        self.compressor = zlib.compressobj(level)
+
+    def update(self, chunk: bytes) -> bytes:
+        return self.compressor.compress(chunk)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush()
+
+
+class ZlibDecompress(object):
+    def __init__(self):
+        self.decompressor = zlib.decompressobj()
+
+    def update(self, chunk: bytes) -> bytes:
+        return self.decompressor.decompress(chunk)
+
+    def flush(self) -> bytes:
+        if not self.decompressor.eof:
+            raise zlib.error("Error -5 while decompressing data: incomplete or truncated stream")
+        return self.decompressor.flush()
@@ -0,0 +1,64 @@
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Tuple, Union
+
+PRINTABLE: bytes
+
+class ChepyStream:
+    path: Path = ...
+    chunk_size: int = ...
+    transforms: Tuple[Tuple[type, tuple], ...] = ...
+    def __init__(self, path: Union[str, Path], chunk_size: int=..., transforms: Tuple[Tuple[type, tuple], ...]=...) -> None: ...
+    def pipe(self, transform: type, *args: Any) -> ChepyStream: ...
+    def __iter__(self) -> Iterator[bytes]: ...
+
+class Xor:
+    def __init__(self, key: bytes, source: Iterable[bytes]=...) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class Hexlify:
+    def __init__(self, delimiter: str=...) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class Unhexlify:
+    def __init__(self, delimiter: str=..., join_by: str=...) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class Rotate:
+    def __init__(self, rotate_by: int) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class RemoveNullbytes:
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class ExtractStrings:
+    def __init__(self, length: int=..., join_by: str=..., limit: int=...) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class StringRecords:
+    def __init__(self, length: int=..., encodings: tuple=...) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class GzipCompress:
+    def __init__(self, file_name: str=...) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class GzipDecompress:
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class ZlibCompress:
+    def __init__(self, level: int=...) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+class ZlibDecompress:
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
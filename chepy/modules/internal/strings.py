@@ -0,0 +1,155 @@
+from typing import Iterable, Iterator, List, Tuple
+
+from . import patterns
+
+#: Bytes that are part of a string
+PRINTABLE = bytes(range(0x20, 0x7F))
+
+#: Encodings `StringScanner` can find, and the width of a character in each
+ENCODINGS = {"ascii": 1, "utf-16le": 2}
+
+StringRecord = Tuple[int, str, str]
+
+
+def _tail(data: bytes, encoding: str) -> int:
+    """Start of the run of string characters at the end of data. The run
+    may continue in the next chunk, so it cannot be matched yet.
+    """
+    if encoding == "ascii":
+        return len(data.rstrip(PRINTABLE))
+    i = len(data)
+    # a printable byte at the very end may be the first half of a character
+    if i and data[i - 1] in PRINTABLE:
+        i -= 1
+    while i >= 2 and data[i - 1] == 0 and data[i - 2] in PRINTABLE:
+        i -= 2
+    return i
+
+
+class StringScanner(object):
+    """Finds strings in data that is read a chunk at a time, like
+    `strings -a` and `strings -el`, and keeps the offset of each string.
+
+    Strings are only reported when they are known to be complete, so a
+    string that runs over the end of a chunk is held back and matched again
+    together with the next chunk. A string that grows past `limit` bytes is
+    reported in pieces instead of being held in memory.
+
+    Args:
+        length (int, optional): Min length of a string in characters. Defaults to 4.
+        encodings (Iterable[str], optional): Encodings to find. Defaults to ascii and utf-16le.
+        limit (int, optional): Max bytes to hold back. Defaults to 1MB.
+    """
+
+    def __init__(
+        self,
+        length: int = 4,
+        encodings: Iterable[str] = ("ascii", "utf-16le"),
+        limit: int = 1024 * 1024,
+    ):
+        self.encodings = tuple(encodings)
+        for encoding in self.encodings:
+            if encoding not in ENCODINGS:
+                raise ValueError(
+                    "{} is not a valid encoding. Valid encodings are {}".format(
+                        encoding, ", ".join(ENCODINGS)
+                    )
+                )
+        self.patterns = [
+            patterns.strings(length)
+            if encoding == "ascii"
+            else patterns.wide_strings(length)
+            for encoding in self.encodings
+        ]
+        self.limit = max(limit, length * 2)
+        self.carry = b""
+        self.offset = 0
+        # end of the last string reported for each encoding. Held back data
+        # is matched again, so this stops a string from being reported twice.
+        self.done = [0] * len(self.encodings)
+
+    def _scan(self, data: bytes, end: int) -> List[StringRecord]:
+        found = []
+        for i, (encoding, pattern) in enumerate(zip(self.encodings, self.patterns)):
+            for matched in pattern.finditer(data):
+                start = self.offset + matched.start()
+                if matched.start() >= end:
+                    break
+                if start < self.done[i]:
+                    continue
+                found.append((start, i, matched.group().decode(encoding)))
+                self.done[i] = self.offset + matched.end()
+        found.sort()
+        return [(start, self.encodings[i], string) for start, i, string in found]
+
+    def update(self, chunk: bytes) -> List[StringRecord]:
+        """Find the strings in the next chunk
+
+        Args:
+            chunk (bytes): The next chunk of data
+
+        Returns:
+            List[StringRecord]: (offset, encoding, string) of each string found
+        """
+        data = self.carry + chunk
+        end = min(_tail(data, encoding) for encoding in self.encodings)
+        if len(data) - end > self.limit:
+            end = len(data)
+        found = self._scan(data, end)
+        self.carry = data[end:]
+        self.offset += end
+        return found
+
+    def flush(self) -> List[StringRecord]:
+        """Find the strings in the data that was held back
+
+        Returns:
+            List[StringRecord]: (offset, encoding, string) of each string found
+        """
+        found = self._scan(self.carry, len(self.carry))
+        self.offset += len(self.carry)
+        self.carry = b""
+        return found
+
+
+def iter_strings(
+    chunks: Iterable[bytes],
+    length: int = 4,
+    encodings: Iterable[str] = ("ascii", "utf-16le"),
+    limit: int = 1024 * 1024,
+) -> Iterator[StringRecord]:
+    """Find strings in chunks of data. Memory use does not depend on the
+    size of the data.
+
+    Args:
+        chunks (Iterable[bytes]): The data
+        length (int, optional): Min length of a string in characters. Defaults to 4.
+        encodings (Iterable[str], optional): Encodings to find. Defaults to ascii and utf-16le.
+        limit (int, optional): Max bytes to hold back. Defaults to 1MB.
+
+    Yields:
+        Iterator[StringRecord]: (offset, encoding, string) ordered by offset
+    """
+    scanner = StringScanner(length, encodings, limit)
+    for chunk in chunks:
+        yield from scanner.update(chunk)
+    yield from scanner.flush()
+
+
+def buffer_chunks(data, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Split a buffer, like bytes or a memory mapped file, into chunks
+    without copying all of it at once.
+
+    Args:
+        data: The buffer
+        chunk_size (int, optional): Bytes in a chunk. Defaults to 1MB.
+
+    Yields:
+        Iterator[bytes]: The chunks
+    """
+    view = memoryview(data)
+    try:
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start : start + chunk_size])
+    finally:
+        view.release()
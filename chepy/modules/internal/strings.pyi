@@ -0,0 +1,19 @@
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+PRINTABLE: bytes
+ENCODINGS: Dict[str, int]
+StringRecord = Tuple[int, str, str]
+
+class StringScanner:
+    encodings: Tuple[str, ...] = ...
+    patterns: List[Any] = ...
+    limit: int = ...
+    carry: bytes = ...
+    offset: int = ...
+    done: List[int] = ...
+    def __init__(self, length: int = ..., encodings: Iterable[str] = ..., limit: int = ...) -> None: ...
+    def update(self, chunk: bytes) -> List[StringRecord]: ...
+    def flush(self) -> List[StringRecord]: ...
+
+def iter_strings(chunks: Iterable[bytes], length: int = ..., encodings: Iterable[str] = ..., limit: int = ...) -> Iterator[StringRecord]: ...
+def buffer_chunks(data: Any, chunk_size: int = ...) -> Iterator[bytes]: ...
@@ -0,0 +1,141 @@
+import logging
+import os
+import time
+from typing import Callable, Iterator, Optional, Tuple
+
+from .parallel import ordered_map
+
+#: Bytes of wordlist given to a worker at a time
+CHUNK_SIZE = 1024 * 256
+#: Seconds between progress messages
+PROGRESS_INTERVAL = 5
+
+
+def wordlist_chunks(
+    path: str, offset: int = 0, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[int, int]]:
+    """Split a wordlist into byte ranges that start and end on a line
+
+    Args:
+        path (str): Path to the wordlist
+        offset (int, optional): Byte offset to start from. Defaults to 0.
+        chunk_size (int, optional): Approximate bytes in each range. Defaults to 256KB.
+
+    Yields:
+        Iterator[Tuple[int, int]]: (start, end) byte offsets
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        start = offset
+        while start < size:
+            f.seek(start + chunk_size)
+            # finish the line the range ends in
+            f.readline()
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+
+def read_words(path: str, start: int, end: int) -> Iterator[bytes]:
+    """Read the words in a byte range of a wordlist
+
+    Args:
+        path (str): Path to the wordlist
+        start (int): Start offset
+        end (int): End offset
+
+    Yields:
+        Iterator[bytes]: Words with whitespace stripped
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    for word in data.splitlines():
+        yield word.strip()
+
+
+def _check_chunk(
+    check: Callable[[bytes], bool], path: str, chunk: Tuple[int, int]
+) -> Tuple[int, int, Optional[bytes]]:
+    tried = 0
+    for word in read_words(path, *chunk):
+        tried += 1
+        if check(word):
+            return chunk[1], tried, word
+    return chunk[1], tried, None
+
+
+_worker_check = None
+_worker_path = None
+
+
+def _init_worker(check: Callable[[bytes], bool], path: str) -> None:
+    global _worker_check, _worker_path
+    _worker_check = check
+    _worker_path = path
+
+
+def _worker_check_chunk(chunk: Tuple[int, int]) -> Tuple[int, int, Optional[bytes]]:
+    return _check_chunk(_worker_check, _worker_path, chunk)
+
+
+def crack(
+    check: Callable[[bytes], bool],
+    path: str,
+    workers: int = 1,
+    offset: int = 0,
+    progress: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> Tuple[Optional[bytes], int]:
+    """Try every word in a wordlist until `check` returns True
+
+    The wordlist is split into byte ranges that are checked by `workers`
+    processes. `check` is sent to each worker once, so it should do any
+    parsing up front, and it must be picklable, like an instance of a
+    module level class.
+
+    The offset returned, and logged with `progress`, is the byte offset in
+    the wordlist up to which every word has been tried. Pass it as `offset`
+    to resume an interrupted run.
+
+    Args:
+        check (Callable[[bytes], bool]): Returns True for the right word
+        path (str): Path to the wordlist
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        offset (int, optional): Byte offset in the wordlist to start from. Defaults to 0.
+        progress (bool, optional): Log progress and words per second. Defaults to False.
+        chunk_size (int, optional): Bytes of wordlist per task. Defaults to 256KB.
+
+    Returns:
+        Tuple[Optional[bytes], int]: The word or None, and the offset reached
+    """
+    chunks = wordlist_chunks(path, offset, chunk_size)
+    if workers is not None and workers <= 1:
+        results = (_check_chunk(check, path, chunk) for chunk in chunks)
+    else:
+        results = ordered_map(
+            _worker_check_chunk,
+            chunks,
+            workers=workers,
+            initializer=_init_worker,
+            initargs=(check, path),
+        )
+    started = last = time.time()
+    total = 0
+    try:
+        for end, tried, word in results:
+            total += tried
+            offset = end
+            if word is not None:
+                return word, offset
+            now = time.time()
+            if progress and now - last >= PROGRESS_INTERVAL:
+                last = now
+                logging.info(
+                    "Tried {} words, {:.0f} words/s, offset {}".format(
+                        total, total / (now - started), offset
+                    )
+                )
+    finally:
+        results.close()
+    return None, offset
@@ -0,0 +1,8 @@
+from typing import Callable, Iterator, Optional, Tuple
+
+CHUNK_SIZE: int
+PROGRESS_INTERVAL: int
+
+def wordlist_chunks(path: str, offset: int=..., chunk_size: int=...) -> Iterator[Tuple[int, int]]: ...
+def read_words(path: str, start: int, end: int) -> Iterator[bytes]: ...
+def crack(check: Callable[[bytes], bool], path: str, workers: int=..., offset: int=..., progress: bool=..., chunk_size: int=...) -> Tuple[Optional[bytes], int]: ...
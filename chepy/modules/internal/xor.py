@@ -0,0 +1,361 @@
+import codecs
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, List, Tuple, Union
+
+from .constants import EncryptionConsts
+from .parallel import ordered_map
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+#: Bytes of data used to guess the key length
+KEY_LENGTH_SAMPLE = 1024 * 64
+#: Keys that score this close to the best key are ranked in length order
+KEY_SCORE_TOLERANCE = 0.1
+
+
+def _english_weights() -> List[float]:
+    weights = [-10.0] * 256
+    for c in range(0x20, 0x7F):
+        weights[c] = 0.0
+    for c in b"\t\n\r":
+        weights[c] = 0.0
+    for char, freq in EncryptionConsts.ENGLISH_FREQUENCY.items():
+        weights[ord(char)] = freq
+        # capitals are far less common, which also tells apart keys that
+        # only differ by the case bit
+        if char.isalpha():
+            weights[ord(char.upper())] = freq / 4
+    return weights
+
+
+#: Score of each byte in english text. Printable bytes that are not
+#: letters score 0, and bytes that are not printable are penalized.
+ENGLISH_WEIGHTS = _english_weights()
+
+
+@lru_cache(maxsize=256)
+def single_byte_table(key: int) -> bytes:
+    """Translation table that xors every byte with `key`
+
+    Args:
+        key (int): Key byte
+
+    Returns:
+        bytes: Table for `bytes.translate`
+    """
+    return bytes(i ^ key for i in range(256))
+
+
+def keystream(key: bytes, length: int, offset: int = 0) -> bytes:
+    """Repeat a key to `length` bytes, starting `offset` bytes into the key
+
+    Args:
+        key (bytes): The key
+        length (int): Length of the keystream
+        offset (int, optional): Position in the key to start at. Defaults to 0.
+
+    Returns:
+        bytes: The keystream
+    """
+    start = offset % len(key)
+    key = key[start:] + key[:start]
+    return (key * (length // len(key) + 1))[:length]
+
+
+def xor_bytes(data: Buffer, key: bytes, offset: int = 0) -> bytes:
+    """Xor data with a repeating key
+
+    A single byte key is one `bytes.translate`. Longer keys are repeated
+    to the length of the data and the two are xored as big ints, so both
+    run in C instead of looping over the data in Python.
+
+    Args:
+        data (Buffer): Data to xor
+        key (bytes): Key to xor with. An empty key returns empty data.
+        offset (int, optional): Position in the key of the first byte of data. Defaults to 0.
+
+    Returns:
+        bytes: The xored data
+
+    Examples:
+        >>> xor_bytes(b"secret", b"secret")
+        b'\\x00\\x00\\x00\\x00\\x00\\x00'
+    """
+    if not key or not data:
+        return b""
+    if not isinstance(data, (bytes, bytearray)):
+        data = bytes(data)
+    if len(set(key)) == 1:
+        return bytes(data.translate(single_byte_table(key[0])))
+    length = len(data)
+    out = int.from_bytes(data, "big") ^ int.from_bytes(
+        keystream(key, length, offset), "big"
+    )
+    return out.to_bytes(length, "big")
+
+
+def code_points(data: Union[bytes, bytearray]) -> Union[bytes, None]:
+    """The bytes that `xor` works on for data that is text. utf-8 text is
+    xored by code point when every code point fits in a byte, so that text
+    and the same text as bytes give the same output.
+
+    Args:
+        data (Union[bytes, bytearray]): The data
+
+    Returns:
+        Union[bytes, None]: The code points as bytes, or None when the data
+            is not utf-8 or has a code point over 255, and the bytes
+            themselves are xored
+    """
+    if data.isascii():
+        return data
+    try:
+        return bytes(data).decode().encode("latin-1")
+    except (UnicodeDecodeError, UnicodeEncodeError):
+        return None
+
+
+class CodePoints(object):
+    """`code_points` of data that comes in chunks. Raises UnicodeError as
+    soon as the data turns out not to be text with small code points.
+    """
+
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def update(self, chunk: bytes) -> bytes:
+        return self.decoder.decode(chunk).encode("latin-1")
+
+    def flush(self) -> bytes:
+        return self.decoder.decode(b"", final=True).encode("latin-1")
+
+
+def chunks_are_code_points(chunks: Iterable[bytes]) -> bool:
+    """Whether `code_points` of the chunks joined together would not be
+    None, without joining them. Stops reading at the first chunk that rules
+    it out.
+
+    Args:
+        chunks (Iterable[bytes]): The data in chunks
+
+    Returns:
+        bool: True if the data is xored by code point
+    """
+    points = CodePoints()
+    try:
+        for chunk in chunks:
+            points.update(chunk)
+        points.flush()
+    except UnicodeError:
+        return False
+    return True
+
+
+def byte_histogram(data: Buffer) -> List[int]:
+    """Count how many times each byte value is in data
+
+    Args:
+        data (Buffer): The data
+
+    Returns:
+        List[int]: The count of each byte value from 0 to 255
+    """
+    histogram = [0] * 256
+    for byte, count in Counter(data).items():
+        histogram[byte] = count
+    return histogram
+
+
+def english_scores(histogram: List[int]) -> List[float]:
+    """Score how much the data xored with each single byte key looks like
+    english text. Higher is better.
+
+    Xoring with a key only moves the counts in the histogram around, so
+    every key is scored from the one histogram instead of from 256 xored
+    copies of the data.
+
+    Args:
+        histogram (List[int]): Byte histogram from `byte_histogram`
+
+    Returns:
+        List[float]: The score of each key from 0 to 255
+    """
+    total = sum(histogram) or 1
+    counts = [(byte, count) for byte, count in enumerate(histogram) if count]
+    return [
+        sum(count * ENGLISH_WEIGHTS[byte ^ key] for byte, count in counts) / total
+        for key in range(256)
+    ]
+
+
+def crib_keys(data: Buffer, crib: bytes) -> List[int]:
+    """Find the single byte keys that xor data into something that
+    contains the crib. The crib is xored with each key and searched for
+    in data, so data is never xored.
+
+    Args:
+        data (Buffer): The xored data
+        crib (bytes): Known plaintext
+
+    Returns:
+        List[int]: The keys from 0 to 255 that reveal the crib
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        data = bytes(data)
+    return [key for key in range(256) if crib.translate(single_byte_table(key)) in data]
+
+
+def hamming_distance(a: bytes, b: bytes) -> int:
+    """Number of bits that are different between two equal length strings
+
+    Args:
+        a (bytes): First string
+        b (bytes): Second string
+
+    Returns:
+        int: The number of different bits
+    """
+    return bin(int.from_bytes(a, "big") ^ int.from_bytes(b, "big")).count("1")
+
+
+def key_lengths(
+    data: Buffer, min_length: int = 1, max_length: int = 40
+) -> List[Tuple[int, float]]:
+    """Rank the likely lengths of a repeating xor key
+
+    For each length, the data is compared with itself shifted by that
+    length. When the length is a multiple of the key length, both sides are
+    xored with the same key bytes, so the key cancels out and the average
+    hamming distance per byte drops.
+
+    Args:
+        data (Buffer): The xored data
+        min_length (int, optional): Shortest key length. Defaults to 1.
+        max_length (int, optional): Longest key length. Defaults to 40.
+
+    Returns:
+        List[Tuple[int, float]]: (length, distance) tuples, most likely first
+    """
+    data = bytes(data[:KEY_LENGTH_SAMPLE])
+    ranked = []
+    for length in range(max(min_length, 1), max_length + 1):
+        # at least two blocks are needed to compare
+        if len(data) < length * 2:
+            break
+        end = len(data) - len(data) % length
+        distance = hamming_distance(data[: end - length], data[length:end])
+        ranked.append((length, distance / (end - length)))
+    ranked.sort(key=lambda x: x[1])
+    return ranked
+
+
+def solve_key(data: Buffer, length: int) -> Tuple[bytes, float]:
+    """Find the repeating xor key of a known length. Each byte of the key
+    is solved on its own as a single byte xor of every `length` th byte.
+
+    Args:
+        data (Buffer): The xored data
+        length (int): Key length
+
+    Returns:
+        Tuple[bytes, float]: The key, and the english score of the data xored with it
+    """
+    key = bytearray()
+    total = 0.0
+    for i in range(length):
+        column = data[i::length]
+        scores = english_scores(byte_histogram(column))
+        best = max(range(256), key=scores.__getitem__)
+        key.append(best)
+        total += scores[best] * len(column)
+    return bytes(key), total / max(len(data), 1)
+
+
+def smallest_period(key: bytes) -> bytes:
+    """Shortest key that repeats into `key`. A key of `abab` is `ab`.
+
+    Args:
+        key (bytes): The key
+
+    Returns:
+        bytes: The shortest key
+    """
+    i = (key + key).find(key, 1, -1)
+    return key if i == -1 else key[:i]
+
+
+_worker_data = None
+
+
+def _init_solve_worker(data: bytes) -> None:
+    global _worker_data
+    _worker_data = data
+
+
+def _solve_worker(length: int) -> Tuple[bytes, float]:
+    return solve_key(_worker_data, length)
+
+
+def solve_repeating_key(
+    data: Buffer,
+    min_length: int = 1,
+    max_length: int = 40,
+    candidates: int = 5,
+    workers: int = 1,
+) -> List[Tuple[bytes, float]]:
+    """Recover the key of repeating key xor
+
+    The `candidates` most likely key lengths are found with `key_lengths`.
+    A multiple of the key length looks as likely as the key length itself,
+    so their divisors are tried too. A key is solved for each length, in
+    parallel with `workers` processes, and the keys are ranked by how much
+    the data xored with them looks like english text.
+
+    Args:
+        data (Buffer): The xored data
+        min_length (int, optional): Shortest key length. Defaults to 1.
+        max_length (int, optional): Longest key length. Defaults to 40.
+        candidates (int, optional): Number of key lengths to solve. Defaults to 5.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+
+    Returns:
+        List[Tuple[bytes, float]]: (key, score) tuples, most likely first
+    """
+    data = bytes(data)
+    ranked = key_lengths(data, min_length, max_length)[:candidates]
+    lengths = sorted(
+        {
+            d
+            for length, _ in ranked
+            for d in range(max(min_length, 1), length + 1)
+            if length % d == 0
+        }
+    )
+    if workers is not None and workers <= 1:
+        solved = [solve_key(data, length) for length in lengths]
+    else:
+        solved = ordered_map(
+            _solve_worker,
+            lengths,
+            workers=workers,
+            initializer=_init_solve_worker,
+            initargs=(data,),
+        )
+    found = {}
+    for key, score in solved:
+        # a multiple of the key length can solve to the key repeated
+        key = smallest_period(key)
+        if key not in found:
+            found[key] = score
+    # longer keys always fit a little better, so the first key in length
+    # order that scores close to the best one wins
+    remaining = list(found.items())
+    ranked_keys = []
+    while remaining:
+        best = max(score for _, score in remaining)
+        cutoff = best - abs(best) * KEY_SCORE_TOLERANCE
+        pick = next(x for x in remaining if x[1] >= cutoff)
+        ranked_keys.append(pick)
+        remaining.remove(pick)
+    return ranked_keys
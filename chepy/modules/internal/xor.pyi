@@ -0,0 +1,26 @@
+from typing import Iterable, List, Tuple, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+ENGLISH_WEIGHTS: List[float]
+KEY_LENGTH_SAMPLE: int
+KEY_SCORE_TOLERANCE: float
+
+def single_byte_table(key: int) -> bytes: ...
+def keystream(key: bytes, length: int, offset: int=...) -> bytes: ...
+def xor_bytes(data: Buffer, key: bytes, offset: int=...) -> bytes: ...
+def code_points(data: Union[bytes, bytearray]) -> Union[bytes, None]: ...
+
+class CodePoints:
+    def __init__(self) -> None: ...
+    def update(self, chunk: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+def chunks_are_code_points(chunks: Iterable[bytes]) -> bool: ...
+def byte_histogram(data: Buffer) -> List[int]: ...
+def english_scores(histogram: List[int]) -> List[float]: ...
+def crib_keys(data: Buffer, crib: bytes) -> List[int]: ...
+def hamming_distance(a: bytes, b: bytes) -> int: ...
+def key_lengths(data: Buffer, min_length: int=..., max_length: int=...) -> List[Tuple[int, float]]: ...
+def solve_key(data: Buffer, length: int) -> Tuple[bytes, float]: ...
+def smallest_period(key: bytes) -> bytes: ...
+def solve_repeating_key(data: Buffer, min_length: int=..., max_length: int=..., candidates: int=..., workers: int=...) -> List[Tuple[bytes, float]]: ...
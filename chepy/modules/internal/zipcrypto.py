@@ -0,0 +1,119 @@
+import io
+import struct
+import zipfile
+from typing import List, Tuple
+
+
+def _crc_table() -> List[int]:
+    table = []
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+        table.append(c)
+    return table
+
+
+CRC_TABLE = _crc_table()
+
+#: Compression method of AES encrypted files
+AES_METHOD = 99
+
+
+def check_header(password: bytes, header: bytes, check_byte: int) -> bool:
+    """Decrypt the 12 byte ZipCrypto header of a file with a password, and
+    compare its last byte with the check byte. A wrong password passes this
+    check about once in 256 tries.
+
+    Args:
+        password (bytes): The password
+        header (bytes): The encryption header of the file
+        check_byte (int): The expected last byte of the decrypted header
+
+    Returns:
+        bool: True if the password could be right
+    """
+    crc = CRC_TABLE
+    k0, k1, k2 = 305419896, 591751049, 878082192
+    for c in password:
+        k0 = (k0 >> 8) ^ crc[(k0 ^ c) & 0xFF]
+        k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        k2 = (k2 >> 8) ^ crc[(k2 ^ (k1 >> 24)) & 0xFF]
+    for c in header:
+        k = k2 | 2
+        c ^= ((k * (k ^ 1)) >> 8) & 0xFF
+        k0 = (k0 >> 8) ^ crc[(k0 ^ c) & 0xFF]
+        k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        k2 = (k2 >> 8) ^ crc[(k2 ^ (k1 >> 24)) & 0xFF]
+    return c == check_byte
+
+
+class ZipPasswordCheck(object):
+    """Checks passwords for a ZipCrypto encrypted zip file
+
+    The encryption headers of the encrypted files are read once. A password
+    is only used to decrypt a file when it passes the header check of every
+    encrypted file, which rules out almost all wrong passwords without
+    decompressing anything. A password that passes is then confirmed by
+    the crc of every file that is not empty, smallest first, so a wrong
+    password is never accepted. When every file is empty, only the header
+    checks are possible.
+
+    AES encrypted files are skipped, as only ZipCrypto is supported.
+
+    Args:
+        data (bytes): The zip file
+
+    Raises:
+        ValueError: If every encrypted file is AES encrypted
+    """
+
+    def __init__(self, data: bytes):
+        self.data = bytes(data)
+        self.headers = []  # type: List[Tuple[bytes, int]]
+        with zipfile.ZipFile(io.BytesIO(self.data)) as z:
+            infos = z.infolist()
+        encrypted = [i for i in infos if i.flag_bits & 0x1]
+        files = [i for i in encrypted if i.compress_type != AES_METHOD]
+        if encrypted and not files:
+            raise ValueError(
+                "AES encrypted zip files are not supported, only ZipCrypto"
+            )
+        for info in files:
+            self.headers.append(self._read_header(info))
+        if not encrypted:
+            files = infos
+        # an empty file decrypts with any password that passes its header
+        # check, so it confirms nothing
+        files = sorted((i for i in files if i.file_size), key=lambda i: i.compress_size)
+        self.verify_files = [i.filename for i in files]  # type: List[str]
+
+    def _read_header(self, info: zipfile.ZipInfo) -> Tuple[bytes, int]:
+        start = info.header_offset
+        (mod_time,) = struct.unpack("<H", self.data[start + 10 : start + 12])
+        name_length, extra_length = struct.unpack(
+            "<HH", self.data[start + 26 : start + 30]
+        )
+        start += 30 + name_length + extra_length
+        # with a data descriptor the crc is not known when the header is
+        # written, so the check byte comes from the modified time of the
+        # local header instead
+        if info.flag_bits & 0x8:
+            check_byte = (mod_time >> 8) & 0xFF
+        else:
+            check_byte = (info.CRC >> 24) & 0xFF
+        return self.data[start : start + 12], check_byte
+
+    def __call__(self, password: bytes) -> bool:
+        for header, check_byte in self.headers:
+            if not check_header(password, header, check_byte):
+                return False
+        try:
+            with zipfile.ZipFile(io.BytesIO(self.data)) as z:
+                for name in self.verify_files:
+                    z.read(name, pwd=password)
+        except Exception:
+            # a wrong password makes garbage that any decompressor can fail
+            # on, not only with a bad crc
+            return False
+        return True
@@ -0,0 +1,14 @@
+import zipfile
+from typing import List, Tuple
+
+CRC_TABLE: List[int]
+AES_METHOD: int
+
+def check_header(password: bytes, header: bytes, check_byte: int) -> bool: ...
+
+class ZipPasswordCheck:
+    data: bytes = ...
+    headers: List[Tuple[bytes, int]] = ...
+    verify_files: List[str] = ...
+    def __init__(self, data: bytes) -> None: ...
+    def __call__(self, password: bytes) -> bool: ...
@@ -1,7 +1,9 @@
 import unicodedata
 from typing import TypeVar
 
-import emoji
+import lazy_import
+
+emoji = lazy_import.lazy_module("emoji")
 import regex as re
 
 from ..core import ChepyCore, ChepyDecorators
@@ -1,9 +1,8 @@
 import base64
 from typing import TypeVar
 
-import regex as re
-
 from ..core import ChepyCore, ChepyDecorators
+from .internal import patterns
 
 LinksT = TypeVar("LinksT", bound="Links")
 
@@ -23,7 +22,9 @@ class Links(ChepyCore):
             >>> Chepy("https://pastebin.com/abCD").pastebin_to_raw()
             'https://pastebin.com/raw/abCD'
         """
-        self.state = re.sub(r"(pastebin\.com)(/)", r"\1/raw\2", self._convert_to_str())
+        self.state = patterns.get("pastebin_url").sub(
+            r"\1/raw\2", self._convert_to_str()
+        )
         return self
 
     @ChepyDecorators.call_stack
@@ -37,13 +38,10 @@ class Links(ChepyCore):
             >>> Chepy("https://github.com/securisec/chepy/blob/master/README.md").github_to_raw()
             'https://raw.githubusercontent.com/securisec/chepy/master/README.md'
         """
-        self.state = re.sub(
-            "/blob",
+        self.state = patterns.get("github_blob").sub(
             "",
-            re.sub(
-                "(github\.com)(/)",
-                r"raw.githubusercontent.com\2",
-                self._convert_to_str(),
+            patterns.get("github_url").sub(
+                r"raw.githubusercontent.com\2", self._convert_to_str()
             ),
         )
         return self
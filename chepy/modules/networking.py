@@ -1,13 +1,15 @@
 import collections
 import ipaddress
 import socket
-import ssl
 import urllib.parse as _py_urlparse
 from typing import TypeVar
 
-import regex as re
+import lazy_import
+
+ssl = lazy_import.lazy_module("ssl")
 
 from ..core import ChepyCore, ChepyDecorators
+from .internal import patterns
 
 NetworkingT = TypeVar("NetworkingT", bound="Networking")
 
@@ -32,8 +34,8 @@ class Networking(ChepyCore):
             >>> Chepy("https://app.google.com/?lol=some data&a=1").defang_url().o
             "hxxps://app[.]google[.]com/?lol=some data&a=1"
         """
-        self.state = re.sub(r"(^htt)", "hxx", self._convert_to_str())
-        self.state = re.sub(r"\.", "[.]", self._convert_to_str())
+        self.state = patterns.get("fanged_scheme").sub("hxx", self._convert_to_str())
+        self.state = patterns.get("dot").sub("[.]", self._convert_to_str())
         return self
 
     @ChepyDecorators.call_stack
@@ -47,8 +49,8 @@ class Networking(ChepyCore):
             >>> Chepy("hxxps://app[.]google[.]com/?lol=some data&a=1").refang_url().o
             "https://app.google.com/?lol=some data&a=1"
         """
-        self.state = re.sub(r"(^hxx)", "htt", self._convert_to_str())
-        self.state = re.sub(r"\[\.\]", ".", self._convert_to_str())
+        self.state = patterns.get("defanged_scheme").sub("htt", self._convert_to_str())
+        self.state = patterns.get("defanged_dot").sub(".", self._convert_to_str())
         return self
 
     @ChepyDecorators.call_stack
@@ -70,9 +72,9 @@ class Networking(ChepyCore):
             "127[.]0[.]0[.]1"
         """
         if ":" in self._convert_to_str():
-            self.state = re.sub(r":", "[:]", self._convert_to_str())
+            self.state = patterns.get("colon").sub("[:]", self._convert_to_str())
         else:
-            self.state = re.sub(r"\.|:", "[.]", self._convert_to_str())
+            self.state = patterns.get("dot_or_colon").sub("[.]", self._convert_to_str())
         return self
 
     @ChepyDecorators.call_stack
@@ -86,7 +88,9 @@ class Networking(ChepyCore):
             >>> Chepy("127[.]0[.]0[.]1").refang_ip().o
             "127.0.0.1"
         """
-        self.state = re.sub(r"\[\.\]|\[\:\]", ".", self._convert_to_str())
+        self.state = patterns.get("defanged_dot_or_colon").sub(
+            ".", self._convert_to_str()
+        )
         return self
 
     @ChepyDecorators.call_stack
@@ -179,7 +183,7 @@ class Networking(ChepyCore):
                 'crlDistributionPoints': ('http://crl.pki.goog/GTS1O1.crl',)
             }
         """
-        domain = re.sub("^\w+://", "", self._convert_to_str())
+        domain = patterns.get("url_scheme").sub("", self._convert_to_str())
         with socket.create_connection((domain, port)) as sock:
             context = ssl.create_default_context()
             context.check_hostname = False
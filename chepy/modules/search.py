@@ -1,8 +1,10 @@
+import mmap
 from typing import TypeVar
 
 import regex as re
 
 from ..core import ChepyCore, ChepyDecorators
+from .internal import patterns
 
 SearchT = TypeVar("SearchT", bound="Search")
 
@@ -30,7 +32,11 @@ class Search(ChepyCore):
             >>> Chepy("abcdefg123 and again abcdefg123").search("abc(de)fg(12)(3)").o
             [('abcdefg123', 'de', '12', '3'), ('abcdefg123', 'de', '12', '3')]
         """
-        self.state = re.findall("({})".format(pattern), self._convert_to_str())
+        if isinstance(self.state, (mmap.mmap, memoryview)):
+            # search the mapped file as is. matches are bytes
+            self.state = re.findall("({})".format(pattern).encode(), self.state)
+        else:
+            self.state = re.findall("({})".format(pattern), self._convert_to_str())
         return self
 
     @ChepyDecorators.call_stack
@@ -66,10 +72,7 @@ class Search(ChepyCore):
             >>> Chepy("tests/files/flags").read_file().search_slack_tokens().get_by_index(0)
             xoxp...859
         """
-        self.state = re.findall(
-            "(xox[p|b|o|a]-[0-9]{12}-[0-9]{12}-[0-9]{12}-[a-z0-9]{32})",
-            self._convert_to_str(),
-        )
+        self.state = patterns.findall("slack_token", self._convert_to_str())
         return self
 
     @ChepyDecorators.call_stack
@@ -79,10 +82,7 @@ class Search(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = re.findall(
-            "https://hooks\.slack\.com/services/T[a-zA-Z0-9_]{8}/B[a-zA-Z0-9_]{8}/[a-zA-Z0-9_]{24}",
-            self._convert_to_str(),
-        )
+        self.state = patterns.findall("slack_webhook", self._convert_to_str())
         return self
 
     @ChepyDecorators.call_stack
@@ -92,9 +92,7 @@ class Search(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = re.findall(
-            "-----BEGIN (RSA|OPENSSH|DSA|EC) PRIVATE KEY-----", self._convert_to_str()
-        )
+        self.state = patterns.findall("private_key", self._convert_to_str())
         return self
 
     @ChepyDecorators.call_stack
@@ -104,7 +102,7 @@ class Search(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = re.findall("SK[a-z0-9]{32}", self._convert_to_str())
+        self.state = patterns.findall("twilio_key", self._convert_to_str())
         return self
 
     @ChepyDecorators.call_stack
@@ -114,5 +112,5 @@ class Search(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
-        self.state = re.findall("AKIA[0-9A-Z]{16}", self._convert_to_str())
+        self.state = patterns.findall("aws_keyid", self._convert_to_str())
         return self
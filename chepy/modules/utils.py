@@ -1,20 +1,42 @@
 import lazy_import
 import difflib
+import mmap
 from collections import OrderedDict
 from typing import TypeVar, Union
 
 import chepy.modules.internal.colors as _int_colors
 
 exrex = lazy_import.lazy_module("exrex")
-import pydash
+pydash = lazy_import.lazy_module("pydash")
 import regex as re
 
 from ..core import ChepyCore, ChepyDecorators
+from .internal import stream
+from .internal.stream import ChepyStream
 from .exceptions import StateNotDict, StateNotList
 
 UtilsT = TypeVar("UtilsT", bound="Utils")
 
 
+def _buffer_findall(
+    buffer: Union[mmap.mmap, memoryview], pattern: str, flags: int
+) -> list:
+    # a bytes pattern matches bytes, not characters, so it only matches like
+    # a str pattern when the pattern and the data are ascii
+    text = None
+    if not pattern.isascii() or re.search(rb"[\x80-\xff]", buffer):
+        try:
+            text = str(buffer, "utf-8")
+        except UnicodeDecodeError:
+            pass
+    if text is None:
+        return re.findall(pattern.encode(), buffer, flags=flags & ~re.UNICODE)
+    return [
+        m.encode() if isinstance(m, str) else tuple(g.encode() for g in m)
+        for m in re.findall(pattern, text, flags=flags)
+    ]
+
+
 class Utils(ChepyCore):
     def __init__(self, *data):
         super().__init__(*data)
@@ -110,6 +132,9 @@ class Utils(ChepyCore):
         Returns:
             Chepy: The Chepy object.
         """
+        if isinstance(self.state, ChepyStream):
+            self.state = self.state.pipe(stream.RemoveNullbytes)
+            return self
         self.state = self._convert_to_bytes().replace(b"\x00", b"")
         return self
 
@@ -125,6 +150,10 @@ class Utils(ChepyCore):
     ) -> UtilsT:
         """Regex search on current data. State will be an array of matches.
 
+        On a memory mapped file, matches are bytes. Ascii data is searched in
+        place. Other text is decoded first, so that it matches like any other
+        state, and data that is not utf-8 is searched as bytes.
+
         Args:
             pattern (str): Required. The regex pattern to search by
             ignore_case (bool, optional): Set case insentive flag. Defaults to False.
@@ -151,7 +180,10 @@ class Utils(ChepyCore):
             flags += re.UNICODE
         if extended:
             flags += re.X
-        self.state = re.findall(pattern, self._convert_to_str(), flags=flags)
+        if isinstance(self.state, (mmap.mmap, memoryview)):
+            self.state = _buffer_findall(self.state, pattern, flags)
+        else:
+            self.state = re.findall(pattern, self._convert_to_str(), flags=flags)
         return self
 
     @ChepyDecorators.call_stack
@@ -424,7 +456,11 @@ class Utils(ChepyCore):
             >>> Chepy("some data").slice(3, 6).o
             "e d"
         """
-        self.state = self.state[start:end]
+        state = self.state
+        if isinstance(state, mmap.mmap):
+            # a view into the mapped file instead of a copy
+            state = memoryview(state)
+        self.state = state[start:end]
         return self
 
     @ChepyDecorators.call_stack
@@ -22,7 +22,7 @@ this_directory = path.abspath(path.dirname(__file__))
 with open(path.join(this_directory, "README.md"), "r", encoding='utf8') as f:
     long_description = f.read()
 
-core_extra_deps = ["requests"]
+core_extra_deps = ["requests", "msgpack"]
 
 plugin_deps = [
     "scapy",
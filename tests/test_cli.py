@@ -1,9 +1,19 @@
+import io
+import queue
+import subprocess
 import sys
 import inspect
+import threading
 import fire
+import pytest
 from docstring_parser import parse as _parse_doc
 from chepy import Chepy
-from chepy.modules.internal.cli import get_cli_options
+from chepy.modules.internal import batch, completion, server
+from chepy.modules.internal.cli import (
+    get_cli_options,
+    restore_snapshot,
+    take_snapshot,
+)
 
 chepy = dir(Chepy)
 
@@ -63,3 +73,177 @@ def test_fire3():
     fire_obj = fire.Fire(Chepy, command=["abc", "-", "hmac_hash", "--digest", "md5"])
     assert type(fire_obj) == Chepy
 
+
+
+def test_fire_incremental():
+    c = Chepy("abc")
+    snapshot = take_snapshot(c)
+    c = fire.Fire(c, command=["to_hex", "-", "create_state", "-"])
+    assert c.states == {0: b"616263", 1: {}}
+    assert len(c.recipe) == 2
+    c = restore_snapshot(snapshot)
+    assert c.states == {0: "abc"}
+    assert c.recipe == []
+    assert c.to_hex().o == b"616263"
+    value = fire.Fire(c, command=["o", "-"])
+    assert restore_snapshot(take_snapshot(value)) == b"616263"
+
+
+def test_rollback():
+    from chepy.__main__ import rollback
+
+    # a checkpoint over the memory cap can still be gone back to
+    c = Chepy("A" * 1000)
+    c.snapshot_memory = 500
+    snapshot = take_snapshot(c)
+    c.to_hex()
+    history = [(["to_hex"], snapshot)]
+    assert rollback(snapshot, history).o == "A" * 1000
+    assert len(history) == 1
+    # without a checkpoint, the object is kept and the history cleared
+    assert rollback(c, history) is c
+    assert history == []
+
+
+def test_completion_index(tmp_path):
+    index = tmp_path / "completions.json"
+    options, errors = completion.load_options(Chepy, index)
+    assert options == completion.build_options(Chepy)[0]
+    assert options["hmac_hash"]["options"][1]["flag"] == "digest"
+    assert index.exists()
+    # the saved index is used while its key matches
+    index.write_text(index.read_text().replace("hmac_hash", "cached_hash"))
+    assert "cached_hash" in completion.load_options(Chepy, index)[0]
+
+    class Plugin(Chepy):
+        def plugin_method(self):
+            """A plugin method
+
+            Returns:
+                ChepyPlugin: The Chepy object.
+            """
+            return self
+
+    options = completion.load_options(Plugin, index)[0]
+    assert options["plugin_method"]["meta"] == "A plugin method"
+    assert "cached_hash" not in options
+
+
+def test_batch():
+    recipe = [{"function": "to_hex", "args": {}}]
+
+    def run(data, fmt, workers=1):
+        out, err = io.BytesIO(), io.StringIO()
+        code = batch.run(recipe, fmt, workers, io.BytesIO(data), out, err)
+        return code, out.getvalue(), err.getvalue()
+
+    assert run(b"abc\n\nde", "lines") == (0, b"616263\n\n6465\n", "")
+    assert run(b"a\0b\0", "null") == (0, b"61\x0062\x00", "")
+    assert run(b'"a"\n\n["b"]\n', "ndjson") == (
+        0,
+        b'"61"\n"5b2762275d"\n',
+        "",
+    )
+    # a bad record keeps its place in the output
+    code, out, err = run(b'"a"\n{\n"b"\n', "ndjson")
+    assert (code, out) == (1, b'"61"\nnull\n"62"\n')
+    assert err.startswith("record 2: JSONDecodeError")
+    # blank lines are counted in the record number
+    code, out, err = run(b'"a"\n\n{\n', "ndjson")
+    assert (code, out) == (1, b'"61"\nnull\n')
+    assert err.startswith("record 3: JSONDecodeError")
+    data = b"\n".join(str(i).encode() for i in range(600))
+    assert run(data, "lines", 2) == run(data, "lines")
+
+
+def test_batch_pipe(tmp_path):
+    recipe = tmp_path / "hex.recipe"
+    recipe.write_text('[{"function": "to_hex", "args": {}}]')
+    main = "import sys; from chepy.__main__ import main; sys.argv[0] = 'chepy'; main()"
+    process = subprocess.Popen(
+        [sys.executable, "-c", main, "-r", str(recipe), "--lines", "-j", "2"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    lines = queue.Queue()
+
+    def read():
+        for line in process.stdout:
+            lines.put(line)
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    try:
+        # each output comes before the next record is written, with more
+        # than one worker too
+        for record in [b"a", b"bc", b"def"]:
+            process.stdin.write(record + b"\n")
+            process.stdin.flush()
+            assert lines.get(timeout=30) == record.hex().encode() + b"\n"
+        process.stdin.close()
+        assert process.wait(timeout=30) == 0
+        reader.join(timeout=30)
+        assert lines.empty()
+    finally:
+        process.kill()
+        process.wait()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs unix sockets")
+def test_server(tmp_path):
+    path = str(tmp_path / "chepy.sock")
+    recipe = [{"function": "to_hex", "args": {}}]
+    recipe_file = tmp_path / "hex.recipe"
+    recipe_file.write_text('[{"function": "base64_decode", "args": {}}]')
+    chepy_server = server.Server(workers=2, recipes=[str(recipe_file)], max_frame=1024)
+    errors = []
+
+    def serve():
+        try:
+            chepy_server.serve(path)
+        except BaseException as e:
+            # wake up the test instead of letting it wait for ready
+            errors.append(e)
+            chepy_server.ready.set()
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    try:
+        assert chepy_server.ready.wait(60)
+        if errors:
+            raise errors[0]
+        with server.Client(path) as client:
+            response = client.call({"id": 1, "recipe": recipe, "data": "abc"})
+            assert response["id"] == 1
+            assert response["output"] == "616263"
+            assert response["latency"] >= response["run"] > 0
+            # bytes that are not utf-8 are sent as base64
+            response = client.call({"recipe": str(recipe_file), "data": "/w=="})
+            assert (response["output"], response["encoding"]) == ("/w==", "base64")
+            response = client.call(
+                {"recipe": recipe, "data": "/w==", "encoding": "base64"}
+            )
+            assert response["output"] == "ff"
+            response = client.call({"recipe": [{"function": "nope", "args": {}}]})
+            assert response["error"].startswith("AttributeError")
+            batch_response = client.call(
+                [{"id": i, "recipe": recipe, "data": str(i)} for i in range(5)]
+            )
+            assert [r["output"] for r in batch_response] == [
+                "30",
+                "31",
+                "32",
+                "33",
+                "34",
+            ]
+            # pipelined responses come back in request order
+            for i in range(100):
+                client.send({"id": i, "recipe": recipe, "data": str(i)})
+            assert [client.recv()["id"] for _ in range(100)] == list(range(100))
+            response = client.call({"recipe": recipe, "data": "a" * 1024})
+            assert "over the limit" in response["error"]
+    finally:
+        chepy_server.stop()
+        thread.join(60)
+    assert not thread.is_alive()
+    assert not (tmp_path / "chepy.sock").exists()
@@ -1,3 +1,8 @@
+import io
+import struct
+import zipfile
+
+import pytest
 from chepy import Chepy
 
 def test_fix_zip_header():
@@ -32,6 +37,45 @@ def test_zip_extract_one():
     )
 
 
+def test_zip_password_bruteforce():
+    c = Chepy("tests/files/test.zip").load_file()
+    assert c.zip_password_bruteforce("tests/files/wordlist.txt", workers=2).o == (
+        b"password"
+    )
+    c = Chepy("tests/files/test.zip").load_file()
+    c.zip_password_bruteforce("tests/files/wordlist.txt", offset=9)
+    assert c.o[:2] == b"PK"
+
+
+def test_zip_password_bruteforce_aes():
+    mf = io.BytesIO()
+    with zipfile.ZipFile(mf, "w") as z:
+        z.writestr("flag.txt", b"secret")
+    data = bytearray(mf.getvalue())
+    # mark the file as AES encrypted in its local and central headers
+    for signature, flags in ((b"PK\x03\x04", 6), (b"PK\x01\x02", 8)):
+        start = data.index(signature)
+        data[start + flags : start + flags + 4] = struct.pack("<HH", 1, 99)
+    with pytest.raises(ValueError, match="AES"):
+        Chepy(bytes(data)).zip_password_bruteforce("tests/files/wordlist.txt")
+
+
+def test_zip_password_bruteforce_empty_file(tmp_path):
+    # these pass the header checks of both files, and decrypt the empty file
+    wordlist = tmp_path / "wordlist.txt"
+    wordlist.write_text("auzr\nbsru\nbzib\nsecret\n")
+    c = Chepy("tests/files/empty_entry.zip").load_file()
+    assert c.zip_password_bruteforce(str(wordlist)).o == b"secret"
+
+
+def test_zip_password_bruteforce_bzip2(tmp_path):
+    # these pass the header check, and then fail to decompress with bzip2
+    wordlist = tmp_path / "wordlist.txt"
+    wordlist.write_text("axn\nazd\nbax\nsecret\n")
+    c = Chepy("tests/files/bzip2.zip").load_file()
+    assert c.zip_password_bruteforce(str(wordlist), workers=2).o == b"secret"
+
+
 def test_zip_list_files():
     assert len(Chepy("tests/files/test.zip").load_file().zip_list_files().o) == 2
 
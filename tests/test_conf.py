@@ -1,5 +1,11 @@
+import os
 from pathlib import Path
-from chepy.config import ChepyConfig
+from chepy.config import (
+    ChepyConfig,
+    plugin_modules,
+    plugins_disabled,
+    startup_plugins,
+)
 
 
 def test_config():
@@ -18,3 +24,31 @@ def test_config():
     assert config.prompt_toolbar_version.startswith("#")
     assert config.prompt_char is not None
     assert len(config.prompt_colors.split()) == 3
+
+
+def test_plugin_index(tmp_path):
+    plugins = tmp_path / "plugins"
+    plugins.mkdir()
+    (plugins / "chepy_one.py").write_text("")
+    (plugins / "other.py").write_text("")
+    index = tmp_path / "plugins.json"
+    assert plugin_modules(plugins, index) == ["chepy_one"]
+    assert index.exists()
+    # a cached index is used as long as the dir does not change
+    index.write_text(index.read_text().replace("chepy_one", "chepy_cached"))
+    assert plugin_modules(plugins, index) == ["chepy_cached"]
+    (plugins / "chepy_two.py").write_text("")
+    stat = plugins.stat()
+    os.utime(str(plugins), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert plugin_modules(plugins, index) == ["chepy_one", "chepy_two"]
+    assert plugin_modules(tmp_path / "missing", index) == []
+
+
+def test_no_plugins(monkeypatch):
+    monkeypatch.delenv("CHEPY_NO_PLUGINS", raising=False)
+    assert not plugins_disabled()
+    monkeypatch.setenv("CHEPY_NO_PLUGINS", "0")
+    assert not plugins_disabled()
+    monkeypatch.setenv("CHEPY_NO_PLUGINS", "1")
+    assert plugins_disabled()
+    assert startup_plugins() == []
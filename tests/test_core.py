@@ -1,7 +1,9 @@
 import os
 import tempfile
 from pathlib import Path
+import pytest
 from chepy import Chepy
+from chepy.modules.exceptions import StateIsStream
 
 
 def test_states():
@@ -52,6 +54,11 @@ def test_fork():
         1: "c474a4a957fe2018e2bffef53887ae22",
     }
     assert c.fork([(c.to_hex,)]).states == {0: b"41", 1: b"42"}
+    for parallel in (False, True):
+        with pytest.raises(TypeError):
+            Chepy("A", "B").fork([(len,)], parallel=parallel)
+    with pytest.raises(TypeError):
+        Chepy(["41"]).for_each([(1,)])
 
 
 def test_save_buffer():
@@ -211,6 +218,50 @@ def test_reset():
     assert Chepy("41", "42").from_hex().reset().states == {0: "41", 1: "42"}
 
 
+def test_checkpoint_undo_redo():
+    c = Chepy("A").checkpoint().to_hex().checkpoint().to_hex()
+    assert c.undo(2).o == "A"
+    assert c.recipe == []
+    assert c.redo().o == b"41"
+    assert c.redo().o == b"3431"
+    assert [step["function"] for step in c.recipe] == ["to_hex", "to_hex"]
+    with pytest.raises(IndexError):
+        c.redo()
+    assert c.undo().undo().o == "A"
+    with pytest.raises(IndexError):
+        c.undo()
+    # lists are copied, so changing them in place does not change the snapshot
+    c = Chepy(["41", "42"], "x").save_buffer().checkpoint()
+    c.for_each([("from_hex",)]).change_state(1).checkpoint()
+    assert c.undo().undo().states == {0: ["41", "42"], 1: "x"}
+    assert c.buffers == {0: ["41", "42"]}
+    assert c.redo().states[0] == [b"A", b"B"]
+    # a new checkpoint forgets the redo snapshots
+    assert c.undo().checkpoint()._snapshots.redo_stack == []
+
+
+def test_checkpoint_limits():
+    c = Chepy("A")
+    c.snapshot_limit = 3
+    for _ in range(5):
+        c.checkpoint().to_hex()
+    assert len(c._snapshots.undo_stack) == 3
+    assert c.undo(3).o == b"3431"
+    c = Chepy("A" * 1000)
+    c.snapshot_memory = 2500
+    for _ in range(3):
+        c.checkpoint().create_state()
+    # the states are shared, so they are only counted once
+    assert len(c._snapshots.undo_stack) == 3
+    c.checkpoint().set_state("B" * 2000).checkpoint()
+    assert len(c._snapshots.undo_stack) == 1
+    # a checkpoint over the memory cap on its own is still kept
+    c = Chepy("A" * 1000)
+    c.snapshot_memory = 500
+    assert c.checkpoint().to_hex().undo().o == "A" * 1000
+    assert c.redo().o == b"41" * 1000
+
+
 def test_load_from_url():
     assert (
         type(
@@ -240,3 +291,150 @@ def test_subsection():
         ).o
         == b"he955a367a4c01f58118021054729c7fb54b5de94ell9cba467d60276777ce655337e060fa0aebfcc780o"
     )
+
+
+def test_compile_recipe():
+    recipe = Chepy.compile_recipe(
+        [
+            {"function": "base64_decode", "args": {"custom": None}},
+            {"function": "swap_case", "args": {}},
+        ]
+    )
+    assert recipe("bG9sCg==") == "LOL\n"
+    assert [recipe.run(x).o for x in ["bG9s", "aGk="]] == ["LOL", "HI"]
+    c = Chepy("4142")
+    assert c.from_hex().recipe == Chepy.compile_recipe(c.recipe).run("4142").recipe
+    assert Chepy.compile_recipe(c.recipe).recipe == [
+        {"function": "from_hex", "args": {"delimiter": None, "join_by": " "}}
+    ]
+
+
+def test_record():
+    c = Chepy("4142", record=False).from_hex().to_hex()
+    assert c.o == b"4142"
+    assert c.recipe == []
+    assert Chepy(["an"], record=False).loop_list("to_hex").o == [b"616e"]
+    assert Chepy("4142").from_hex(join_by="-").recipe == [
+        {"function": "from_hex", "args": {"delimiter": None, "join_by": "-"}}
+    ]
+    assert Chepy("41 42").from_hex(" ", "-").recipe == [
+        {"function": "from_hex", "args": {"delimiter": " ", "join_by": "-"}}
+    ]
+
+
+def test_map_recipe():
+    recipe = [
+        {"function": "from_hex", "args": {}},
+        {"function": "to_upper_case", "args": {}},
+    ]
+    inputs = ["61", "62", "63", "64", "65"]
+    expected = ["A", "B", "C", "D", "E"]
+    assert list(Chepy.map_recipe(inputs, recipe, workers=2, chunksize=2)) == expected
+    assert list(Chepy.map_recipe(inputs, recipe, workers=1)) == expected
+
+
+def test_fork_parallel():
+    assert Chepy("A", "B").fork(
+        [("to_hex",), ("hmac_hash", {"key": "secret", "digest": "md5"})],
+        parallel=True,
+        workers=2,
+    ).states == {
+        0: "3e90033ea5422dafd81470dde4ffb37b",
+        1: "c474a4a957fe2018e2bffef53887ae22",
+    }
+
+
+def test_stream_file():
+    temp = str(Path(tempfile.gettempdir()) / os.urandom(24).hex())
+    with open("tests/files/hello", "rb") as f:
+        data = f.read()
+
+    def streamed(*methods):
+        c = Chepy("tests/files/hello").stream_file(chunk_size=7)
+        for method in methods:
+            getattr(c, method[0])(*method[1:])
+        c.write_binary(temp)
+        with open(temp, "rb") as f:
+            return f.read()
+
+    assert streamed(("xor", "4142")) == bytes(Chepy(data).xor("4142").o)
+    assert streamed(("to_hex", ":"), ("from_hex", ":", "")) == data
+    assert streamed(("to_hex",), ("rotate", 3)) == Chepy(data).to_hex().o.translate(
+        bytes.maketrans(b"abcdef", b"defghi")
+    )
+    assert streamed(("zlib_compress",), ("zlib_decompress",)) == data
+    assert streamed(("gzip_compress",), ("gzip_decompress",)) == data
+    assert streamed(("remove_nullbytes",)) == data.replace(b"\x00", b"")
+    assert streamed(("extract_strings",)).decode() == Chepy(data).extract_strings().o
+    assert (
+        Chepy("tests/files/hello").stream_file(chunk_size=7).sha2_256().o
+        == Chepy(data).sha2_256().o
+    )
+    with pytest.raises(StateIsStream):
+        Chepy("tests/files/hello").stream_file().base64_encode()
+    Path(temp).unlink()
+
+
+def test_stream_xor_parity(tmp_path):
+    path = tmp_path / "data"
+    out = str(tmp_path / "out")
+    for data in [
+        "plain ascii " * 5 + "h\u00e9llo w\u00f6rld " * 5,
+        "euro \u20ac and \u00e9 " * 5,
+        "\u00e9".encode() * 10 + b"\xff",
+        os.urandom(100),
+    ]:
+        if isinstance(data, str):
+            data = data.encode()
+        path.write_bytes(data)
+        for key in ("41", "4142"):
+            Chepy(str(path)).stream_file(chunk_size=7).xor(key).write_binary(out)
+            with open(out, "rb") as f:
+                assert f.read() == bytes(Chepy(str(path)).load_file().xor(key).o)
+
+
+def test_load_file_memory_map():
+    with open("tests/files/hello", "rb") as f:
+        data = f.read()
+    c = Chepy("tests/files/hello").load_file(memory_map=True)
+    assert c.length().o == len(data)
+    assert (
+        Chepy("tests/files/hello").load_file(memory_map=True).extract_strings().o
+        == Chepy(data).extract_strings().o
+    )
+    assert (
+        Chepy("tests/files/hello").load_file(memory_map=True).sha2_256().o
+        == Chepy(data).sha2_256().o
+    )
+    assert Chepy("tests/files/hello").load_file(memory_map=True).search(
+        "__TEXT"
+    ).o == [b"__TEXT"] * data.count(b"__TEXT")
+    c = Chepy("tests/files/hello").load_file(memory_map=True).select(0, 32)
+    assert isinstance(c.o, memoryview)
+    assert c.to_hexdump().o == Chepy(data[:32]).to_hexdump().o
+    assert Chepy("tests/files/hello").load_file(memory_map=True).base64_encode().o == (
+        Chepy(data).base64_encode().o
+    )
+    temp = Path(tempfile.gettempdir()) / os.urandom(24).hex()
+    temp.touch()
+    assert Chepy(str(temp)).load_file(memory_map=True).o == bytearray()
+    temp.unlink()
+
+
+def test_conversion_cache():
+    c = Chepy("abc")
+    b = c._convert_to_bytes()
+    assert b == b"abc"
+    assert c._convert_to_bytes() is b
+    c.state = "def"
+    assert c._convert_to_bytes() == b"def"
+    c.states[0] = "ghi"
+    assert c._convert_to_bytes() == b"ghi"
+    c = Chepy(bytearray(b"abc"))
+    c._convert_to_str()
+    c.state.extend(b"d")
+    assert c._convert_to_str() == "abcd"
+    assert Chepy(True)._convert_to_bytes() == b"True"
+    assert Chepy("12")._convert_to_int() == 12
+    with pytest.raises(NotImplementedError):
+        Chepy(object())._convert_to_bytes()
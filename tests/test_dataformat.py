@@ -1,4 +1,6 @@
+import os
 from chepy import Chepy
+from chepy.modules.internal import magic as _magic
 
 
 def test_eval():
@@ -325,6 +327,65 @@ def test_decode_bruteforce():
         Chepy("m\xfcnchen\ud55c").decode_bruteforce().get_by_key("utf_8").o
         == "münchen한"
     )
+    data = "m\\xfcnchen\\ud55c"
+    out = Chepy(data).decode_bruteforce().o
+    assert Chepy(data).decode_bruteforce(workers=2).o == out
+    assert Chepy(data).decode_bruteforce(workers=2, threads=True).o == out
+    lazy = Chepy(data).decode_bruteforce(lazy=True).o
+    assert dict(lazy) == out
+    assert Chepy(data).decode_bruteforce(lazy=True).get_by_key("unicode_escape").o == (
+        "münchen한"
+    )
+    kept = Chepy(data).decode_bruteforce(filter=lambda s: "ü" in s).o
+    assert kept == {"unicode_escape": "münchen한"}
+    lazy = Chepy(data).decode_bruteforce(lazy=True, filter=lambda s: "ü" in s).o
+    assert list(lazy) == ["unicode_escape"] and "utf_8" not in lazy
+    out = Chepy("münchen한").encode_bruteforce(filter=1).o
+    assert "utf_8" not in out and out["base64_codec"] == b"bcO8bmNoZW7tlZw=\n"
+    assert Chepy("a" * 100).encode_bruteforce().o["idna"] == b""
+
+
+def test_magic():
+    out = Chepy("NjY2YzYxNjc3YjZkNjE2NzY5NjM3ZA==").magic().o
+    assert out[0]["output"] == b"flag{magic}"
+    assert out[0]["recipe"] == [
+        {"function": "base64_decode", "args": {}},
+        {"function": "from_hex", "args": {}},
+    ]
+    data = Chepy("some text to hide").gzip_compress().base64_encode().o
+    assert Chepy(data).magic().o[0]["output"] == b"some text to hide"
+    data = Chepy("synt{ebgngrq}").to_hex().o
+    out = Chepy(data).magic(crib="flag").o
+    assert [r["output"] for r in out] == [b"flag{rotated}"]
+    assert Chepy(data).run_recipe(out[0]["recipe"]).o == b"flag{rotated}"
+    data = Chepy("flag{xored}").xor("2a").to_hex().base64_encode().o
+    out = Chepy(data).magic(crib="flag", workers=2).o
+    assert out[0]["recipe"][-1] == {"function": "xor", "args": {"key": "2a"}}
+    assert Chepy(data).magic(depth=1, crib="flag").o == []
+    assert Chepy(data).magic(nodes=1).o == Chepy(data).magic(depth=1).o
+
+
+def test_magic_reuses_workers(monkeypatch):
+    pools, expanders = [], []
+
+    class Pool(_magic.futures.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    class Expander(_magic.Expander):
+        def __init__(self, *args):
+            expanders.append(self)
+            super().__init__(*args)
+
+    monkeypatch.setattr(_magic.futures, "ProcessPoolExecutor", Pool)
+    monkeypatch.setattr(_magic, "Expander", Expander)
+    data = Chepy("some text to hide").gzip_compress().to_hex().base64_encode().o
+    out = Chepy(data).magic(workers=2).o
+    assert out[0]["output"] == b"some text to hide"
+    assert (len(pools), len(expanders)) == (1, 1)
+    Chepy(data).magic().o
+    assert (len(pools), len(expanders)) == (1, 2)
 
 
 def test_to_braille():
@@ -416,6 +477,25 @@ def test_base91():
     out = "@iH<,{_{W$OsuxXi%]D"
     assert Chepy(data).base91_encode().o == out
     assert Chepy(out).base91_decode().o.decode() == data
+    assert Chepy("@iH<,{_{W$Os\nuxXi%]D").base91_decode().o.decode() == data
+    for data in [os.urandom(5000), bytes(5000), b"\x00\xff" * 3000, b"A"]:
+        out = Chepy(data).base91_encode().o
+        assert Chepy(out).base91_decode().o == data
+
+
+def test_base91_stream(tmp_path):
+    data = os.urandom(3000) + bytes(3000)
+    path = tmp_path / "data"
+    path.write_bytes(data)
+    out = Chepy(data).base91_encode().o
+    encoded = str(tmp_path / "encoded")
+    Chepy(str(path)).stream_file(chunk_size=333).base91_encode().write_binary(encoded)
+    with open(encoded) as f:
+        assert f.read() == out
+    decoded = str(tmp_path / "decoded")
+    Chepy(encoded).stream_file(chunk_size=77).base91_decode().write_binary(decoded)
+    with open(decoded, "rb") as f:
+        assert f.read() == data
 
 
 def test_swap_endianness():
@@ -1,4 +1,5 @@
-from chepy.extras.crypto import one_time_pad_crib
+from chepy.extras.crypto import one_time_pad_crib, xor_repeating_key_bruteforce
+from chepy.modules.internal.xor import xor_bytes
 
 
 def test_one_time_pad_crib():
@@ -10,3 +11,11 @@ def test_one_time_pad_crib():
         )[0]
         == "flag{9276cdb76a3dd6b1f523209cd9c0a11b}"
     )
+
+
+def test_xor_repeating_key_bruteforce():
+    with open("LICENSE", "rb") as f:
+        data = f.read()[1000:3000]
+    out = xor_repeating_key_bruteforce(xor_bytes(data, b"secretkey"), workers=2)
+    assert out[0]["key"] == b"secretkey".hex()
+    assert out[0]["out"] == data
@@ -50,6 +50,35 @@ def test_search():
     )
 
 
+def test_search_memory_map(tmp_path):
+    path = tmp_path / "data.txt"
+
+    def search(data, pattern, **flags):
+        path.write_bytes(data)
+        mapped = Chepy(str(path)).load_file(memory_map=True)
+        return mapped.regex_search(pattern, **flags).o
+
+    def loaded(data, pattern, **flags):
+        path.write_bytes(data)
+        matches = Chepy(str(path)).load_file().regex_search(pattern, **flags).o
+        return [m.encode() for m in matches]
+
+    for data in [b"hello world w0rld", "hello wörld WÖRLD".encode()]:
+        for pattern, flags in [
+            ("w.rld", {}),
+            ("w.rld", {"unicode": True, "ignore_case": True}),
+            ("wö", {}),
+            (r"\w+", {"unicode": True}),
+        ]:
+            assert search(data, pattern, **flags) == loaded(data, pattern, **flags)
+    assert search(b"hello world", "w(.)r(l)d", unicode=True) == [(b"o", b"l")]
+    # data that is not utf-8 is searched as bytes
+    assert search(b"\xffw\xffrld world", "w.rld", unicode=True) == [
+        b"w\xffrld",
+        b"world",
+    ]
+
+
 def test_remove_nullbytes():
     assert (
         Chepy("./tests/files/hello")